@@ -9,10 +9,17 @@ from .utils import ensure_windows
 class AdminManager:
     """Vérifie les privilèges et relance si besoin."""
 
-    @staticmethod
-    def ensure_admin() -> None:
+    # Les privilèges d'un processus ne changent pas: une vérification réussie vaut jusqu'à sa fin
+    # (l'agent vérifie au démarrage, les commandes qu'il exécute ne repassent plus par Windows).
+    verified = False
+
+    @classmethod
+    def ensure_admin(cls) -> None:
+        if cls.verified:
+            return
         ensure_windows()
         if ctypes.windll.shell32.IsUserAnAdmin():
+            cls.verified = True
             return
         raise PermissionError(
             "Privilèges administrateur requis. Relancez le programme en tant qu'administrateur."
@@ -0,0 +1,313 @@
+"""
+Affinité CPU: cœurs réservés aux jeux, processus lourds déplacés sur les autres.
+"""
+from __future__ import annotations
+
+import ctypes
+import functools
+import os
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import psutil
+
+from .config import AFFINITY_HEAVY_CPU, AFFINITY_RESERVED_CORES, GAME_PROCESS_NAMES
+from .storage import StorageManager
+
+SNAPSHOT_KEY = "cpu_affinity"
+SYSFS_CPU = Path("/sys/devices/system/cpu")
+# Indice de performance par CPU logique (hybride/big.LITTLE), par ordre de préférence
+SYSFS_PERFORMANCE = ("cpu_capacity", "acpi_cppc/highest_perf", "cpufreq/cpuinfo_max_freq")
+RELATION_PROCESSOR_CORE = 0  # LOGICAL_PROCESSOR_RELATIONSHIP
+ERROR_INSUFFICIENT_BUFFER = 122
+
+
+def _parse_cpu_list(text: str) -> List[int]:
+    """Format noyau Linux « 0-3,8,10-11 »."""
+    cpus: List[int] = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cpus.extend(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def _read_int(path: Path) -> Optional[int]:
+    try:
+        return int(path.read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def parse_processor_cores(buffer: bytes, pointer_size: int = 8) -> List[Tuple[Tuple[int, ...], int]]:
+    """
+    (CPU logiques, EfficiencyClass) de chaque cœur d'un tampon GetLogicalProcessorInformationEx
+    (RelationProcessorCore). Le CPU n d'un groupe g est numéroté g·64 + n.
+    """
+    mask_format = "<Q" if pointer_size == 8 else "<I"
+    entry_size = pointer_size + 8  # KAFFINITY Mask, WORD Group, WORD Reserved[3]
+    cores: List[Tuple[Tuple[int, ...], int]] = []
+    offset = 0
+    while offset + 8 <= len(buffer):
+        relationship, size = struct.unpack_from("<II", buffer, offset)
+        if size <= 0:
+            break
+        if relationship == RELATION_PROCESSOR_CORE:
+            efficiency = buffer[offset + 9]
+            (group_count,) = struct.unpack_from("<H", buffer, offset + 30)
+            cpus: List[int] = []
+            for index in range(group_count):
+                entry = offset + 32 + index * entry_size
+                (mask,) = struct.unpack_from(mask_format, buffer, entry)
+                (group,) = struct.unpack_from("<H", buffer, entry + pointer_size)
+                cpus.extend(group * 64 + bit for bit in range(pointer_size * 8) if mask >> bit & 1)
+            if cpus:
+                cores.append((tuple(cpus), efficiency))
+        offset += size
+    return cores
+
+
+@dataclass(frozen=True)
+class CpuTopology:
+    """
+    Cœurs physiques, chacun avec ses processeurs logiques (frères SMT), et indice de
+    performance par cœur (vide si tous les cœurs sont équivalents).
+    """
+
+    cores: Tuple[Tuple[int, ...], ...]
+    performance: Tuple[int, ...] = ()
+
+    @property
+    def logical(self) -> List[int]:
+        return sorted(cpu for core in self.cores for cpu in core)
+
+    @property
+    def physical_count(self) -> int:
+        return len(self.cores)
+
+    @property
+    def hybrid(self) -> bool:
+        return len(set(self.performance)) > 1
+
+    @classmethod
+    def _build(cls, cores: List[Tuple[Tuple[int, ...], int]]) -> Optional["CpuTopology"]:
+        cores = sorted(cores)
+        if not cores:
+            return None
+        performance = tuple(score for _, score in cores)
+        return cls(tuple(cpus for cpus, _ in cores), performance if len(set(performance)) > 1 else ())
+
+    @classmethod
+    def from_sysfs(cls, root: Path = SYSFS_CPU) -> Optional["CpuTopology"]:
+        groups = set()
+        for sibling_file in root.glob("cpu[0-9]*/topology/thread_siblings_list"):
+            try:
+                groups.add(tuple(_parse_cpu_list(sibling_file.read_text())))
+            except (OSError, ValueError):
+                return None
+
+        def score(cpu: int) -> int:
+            for name in SYSFS_PERFORMANCE:
+                value = _read_int(root / f"cpu{cpu}" / name)
+                if value is not None:
+                    return value
+            return 0
+
+        return cls._build([(group, max(score(cpu) for cpu in group)) for group in groups])
+
+    @classmethod
+    def from_windows(cls) -> Optional["CpuTopology"]:
+        """GetLogicalProcessorInformationEx: vrais groupes SMT et EfficiencyClass (cœurs P > cœurs E)."""
+        try:
+            kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)  # type: ignore[attr-defined]
+        except (AttributeError, OSError):
+            return None
+        query = kernel32.GetLogicalProcessorInformationEx
+        length = ctypes.c_ulong(0)
+        query(RELATION_PROCESSOR_CORE, None, ctypes.byref(length))
+        if ctypes.get_last_error() != ERROR_INSUFFICIENT_BUFFER:  # type: ignore[attr-defined]
+            return None
+        buffer = ctypes.create_string_buffer(length.value)
+        if not query(RELATION_PROCESSOR_CORE, buffer, ctypes.byref(length)):
+            return None
+        return cls._build(parse_processor_cores(buffer.raw[: length.value], ctypes.sizeof(ctypes.c_void_p)))
+
+    @classmethod
+    def from_counts(cls, logical: int, physical: int) -> "CpuTopology":
+        """
+        Dernier recours: frères SMT consécutifs. Avec un nombre de CPU non multiple du nombre
+        de cœurs (hybride: cœurs P avec SMT numérotés d'abord), les premiers cœurs reçoivent
+        un CPU de plus et sont tenus pour les plus performants; chaque CPU logique appartient
+        toujours à un cœur.
+        """
+        physical = max(min(physical, logical), 1)
+        base, extra = divmod(logical, physical)
+        cores = []
+        start = 0
+        for index in range(physical):
+            size = base + (1 if index < extra else 0)
+            cores.append(tuple(range(start, start + size)))
+            start += size
+        return cls(tuple(cores), tuple(len(core) for core in cores) if extra else ())
+
+    @classmethod
+    def detect(cls) -> "CpuTopology":
+        topology = cls.from_windows() if os.name == "nt" else cls.from_sysfs()
+        if topology is None:
+            logical = psutil.cpu_count() or 1
+            topology = cls.from_counts(logical, psutil.cpu_count(logical=False) or logical)
+        return topology
+
+    def split(self, reserved: Optional[int] = None) -> Tuple[List[int], List[int]]:
+        """
+        (CPU logiques réservés aux jeux, CPU laissés au reste), qui couvrent ensemble tous les CPU.
+
+        Les cœurs les plus performants sont réservés, frères SMT compris; à performance égale,
+        les derniers (le cœur 0 reçoit la plupart des interruptions). Par défaut: tous les cœurs
+        de la classe la plus rapide sur un processeur hybride, sinon la moitié des cœurs; au
+        moins un cœur de chaque côté.
+        """
+        count = self.physical_count
+        if count < 2:
+            return [], self.logical
+        performance = self.performance or (0,) * count
+        if reserved is None:
+            fastest = performance.count(max(performance))
+            reserved = fastest if self.hybrid else count // 2
+        reserved = min(max(reserved, 1), count - 1)
+        ranked = sorted(range(count), key=lambda index: (performance[index], index), reverse=True)
+        chosen = set(ranked[:reserved])
+        games = sorted(cpu for index in chosen for cpu in self.cores[index])
+        others = sorted(cpu for index in range(count) if index not in chosen for cpu in self.cores[index])
+        return games, others
+
+
+@functools.lru_cache(maxsize=1)
+def cpu_topology() -> CpuTopology:
+    """Topologie lue une seule fois par processus."""
+    return CpuTopology.detect()
+
+
+class AffinityManager:
+    """
+    Épingle les jeux sur des cœurs réservés et écarte les processus lourds de ces cœurs.
+
+    Les masques d'origine sont sauvegardés dans le StorageManager avant toute modification;
+    `restore` les réapplique aux processus encore vivants (PID + date de création).
+    """
+
+    def __init__(
+        self,
+        storage: Optional[StorageManager] = None,
+        *,
+        topology: Optional[CpuTopology] = None,
+        reserved_cores: Optional[int] = AFFINITY_RESERVED_CORES,
+        heavy_cpu: float = AFFINITY_HEAVY_CPU,
+        sample_window: float = 0.5,
+    ) -> None:
+        self.storage = storage or StorageManager()
+        self.topology = topology or cpu_topology()
+        self.reserved_cores = reserved_cores
+        self.heavy_cpu = heavy_cpu
+        self.sample_window = sample_window
+
+    @staticmethod
+    def supported() -> bool:
+        return hasattr(psutil.Process, "cpu_affinity")
+
+    def _sample_usage(self, procs: Sequence[psutil.Process]) -> Dict[int, float]:
+        """% CPU de chaque processus sur une fenêtre commune (deux lectures pour tous)."""
+        for proc in procs:
+            try:
+                proc.cpu_percent(None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        time.sleep(self.sample_window)
+        usage: Dict[int, float] = {}
+        for proc in procs:
+            try:
+                usage[proc.pid] = proc.cpu_percent(None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return usage
+
+    def _save_original(self, saved: Dict[str, Any], proc: psutil.Process) -> None:
+        created = proc.create_time()
+        previous = saved.get(str(proc.pid))
+        if previous and abs(previous.get("created", 0) - created) <= 1e-3:
+            return  # masque déjà modifié par une passe précédente: garder l'original
+        saved[str(proc.pid)] = {"name": proc.name(), "created": created, "mask": proc.cpu_affinity()}
+
+    def apply(self, processes: Optional[Sequence[str]] = None) -> str:
+        if not self.supported():
+            return "Affinité CPU non prise en charge sur cette plateforme"
+        games_cpus, other_cpus = self.topology.split(self.reserved_cores)
+        if not games_cpus:
+            return "Affinité CPU: un seul cœur physique, aucune isolation possible"
+        targets = {name.lower() for name in (processes or GAME_PROCESS_NAMES)}
+        own = os.getpid()
+        games: List[psutil.Process] = []
+        others: List[psutil.Process] = []
+        for proc in psutil.process_iter(["name"]):
+            if proc.pid in (0, own):
+                continue
+            name = (proc.info.get("name") or "").lower()
+            (games if name in targets else others).append(proc)
+        usage = self._sample_usage(others)
+        heavy = [proc for proc in others if usage.get(proc.pid, 0.0) >= self.heavy_cpu]
+        saved = dict(self.storage.get_snapshot(SNAPSHOT_KEY))
+        moves: List[Tuple[psutil.Process, bool]] = []
+        for proc, is_game in [(p, True) for p in games] + [(p, False) for p in heavy]:
+            try:
+                self._save_original(saved, proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            moves.append((proc, is_game))
+        # Sauvegarde avant la première écriture, comme les autres optimisations.
+        self.storage.snapshot(SNAPSHOT_KEY, saved)
+        pinned = moved = 0
+        for proc, is_game in moves:
+            try:
+                proc.cpu_affinity(games_cpus if is_game else other_cpus)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, OSError, ValueError):
+                continue
+            if is_game:
+                pinned += 1
+            else:
+                moved += 1
+        return (
+            f"Affinité CPU: {pinned} jeu(x) sur les CPU {_format_cpus(games_cpus)}, "
+            f"{moved} processus lourd(s) sur {_format_cpus(other_cpus)}"
+        )
+
+    @staticmethod
+    def restore(storage: StorageManager) -> str:
+        if not AffinityManager.supported():
+            return "Affinité CPU non prise en charge sur cette plateforme"
+        restored = 0
+        for pid, info in storage.get_snapshot(SNAPSHOT_KEY).items():
+            try:
+                proc = psutil.Process(int(pid))
+                if abs(proc.create_time() - info["created"]) > 1e-3:
+                    continue  # PID réutilisé par un autre processus
+                proc.cpu_affinity(info["mask"])
+                restored += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied, OSError, KeyError, ValueError):
+                continue
+        storage.snapshot(SNAPSHOT_KEY, {})
+        return f"Affinité CPU d'origine rétablie pour {restored} processus"
+
+
+def _format_cpus(cpus: Sequence[int]) -> str:
+    """[0, 1, 2, 5] -> « 0-2,5 »."""
+    ranges: List[List[int]] = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(lo) if lo == hi else f"{lo}-{hi}" for lo, hi in ranges)
@@ -0,0 +1,322 @@
+"""
+Agent résident: un GamingOptimizer chaud servi en JSON sur un socket local.
+
+Protocole: une requête JSON par connexion ({"command", "args", "token"}), puis des lignes
+JSON en réponse: {"output": texte} au fil de l'exécution et un {"done": true, "ok", "error",
+"result"} final. Socket Unix (droits 0600) quand la plateforme le permet, sinon TCP
+127.0.0.1 avec un port et un jeton publiés dans AGENT_INFO_FILE.
+
+Les privilèges sont vérifiés une fois au démarrage. Un agent qui ne les a pas (non élevé, ou
+hors Windows) ne sert que `status`/`shutdown` et répond {"local": true} au reste: le client
+exécute alors la commande lui-même.
+
+Le client n'importe que ce module: une commande relayée ne paie ni psutil ni WMI.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import secrets
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import IO, Any, Dict, Optional, Tuple
+
+from .config import AGENT_INFO_FILE, AGENT_MONITOR_IDLE, AGENT_SOCKET
+
+CONNECT_TIMEOUT = 0.5
+UNPRIVILEGED_COMMANDS = frozenset({"status", "shutdown"})
+
+
+def _use_unix_socket() -> bool:
+    return hasattr(socket, "AF_UNIX") and os.name != "nt"
+
+
+def request_from_args(args: argparse.Namespace) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """(commande, arguments) pour l'agent, None si la commande doit s'exécuter localement."""
+    command = args.command
+    if command == "analyze":
+        frametimes = getattr(args, "frametimes", None)
+        return command, {"frametimes": str(Path(frametimes).resolve()) if frametimes else None}
+    if command == "optimize":
+        if not (args.yes or getattr(args, "plan", False)):
+            return None  # confirmation interactive: seulement en local
+        frametimes = getattr(args, "frametimes", None)
+        return command, {
+            "plan": getattr(args, "plan", False),
+            "frametimes": str(Path(frametimes).resolve()) if frametimes else None,
+        }
+    if command == "network-test":
+        return command, {
+            "top_k": getattr(args, "top_k", None),
+            "explore": getattr(args, "explore", None),
+            "adaptive": getattr(args, "adaptive", False),
+        }
+    if command == "restore":
+        return command, {}
+    if command == "monitor" and getattr(args, "snapshot", False):
+        return "monitor-snapshot", {}
+    return None
+
+
+# ---------- Client ----------
+class AgentClient:
+    """Connexion à un agent en cours d'exécution; `connect()` renvoie None s'il n'y en a pas."""
+
+    def __init__(self, sock: socket.socket, token: Optional[str]) -> None:
+        self.sock = sock
+        self.token = token
+
+    @classmethod
+    def connect(cls, timeout: float = CONNECT_TIMEOUT) -> Optional["AgentClient"]:
+        try:
+            if _use_unix_socket():
+                if not AGENT_SOCKET.exists():
+                    return None
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(timeout)
+                sock.connect(str(AGENT_SOCKET))
+                token = None
+            else:
+                if not AGENT_INFO_FILE.exists():
+                    return None
+                info = json.loads(AGENT_INFO_FILE.read_text(encoding="utf-8"))
+                sock = socket.create_connection(("127.0.0.1", int(info["port"])), timeout=timeout)
+                token = info.get("token")
+        except (OSError, ValueError, KeyError):
+            return None  # socket orphelin ou agent arrêté
+        sock.settimeout(None)  # une commande (optimize) peut durer plusieurs minutes
+        return cls(sock, token)
+
+    def request(
+        self, command: str, args: Optional[Dict[str, Any]] = None, *, out: IO[str] = sys.stdout
+    ) -> Dict[str, Any]:
+        """Envoie la requête, recopie la sortie au fil de l'eau et renvoie le message final."""
+        payload = {"command": command, "args": args or {}, "token": self.token}
+        try:
+            self.sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with self.sock.makefile("r", encoding="utf-8") as stream:
+                for line in stream:
+                    message = json.loads(line)
+                    if "output" in message:
+                        out.write(message["output"])
+                        out.flush()
+                    elif message.get("done"):
+                        return message
+        finally:
+            self.sock.close()
+        return {"done": True, "ok": False, "error": "Connexion à l'agent interrompue."}
+
+
+def run_remote(args: argparse.Namespace) -> Optional[bool]:
+    """Exécute la commande via l'agent: None si elle doit tourner en local, sinon le succès."""
+    routed = request_from_args(args)
+    if routed is None:
+        return None
+    client = AgentClient.connect()
+    if client is None:
+        return None
+    response = client.request(*routed)
+    if response.get("local"):
+        return None  # agent sans privilèges: exécution locale
+    if not response.get("ok"):
+        print(response.get("error") or "Échec de la commande dans l'agent.", file=sys.stderr)
+    return bool(response.get("ok"))
+
+
+# ---------- Serveur ----------
+class _StreamWriter:
+    """
+    sys.stdout de l'agent pendant une commande: chaque écriture part vers le client.
+
+    Si le client s'est déconnecté, la suite de la sortie est abandonnée et la commande va à son terme.
+    """
+
+    def __init__(self, send) -> None:
+        self._send = send
+        self.gone = False
+
+    def write(self, text: str) -> int:
+        if text and not self.gone:
+            try:
+                self._send({"output": text})
+            except OSError:  # BrokenPipeError, ConnectionResetError...
+                self.gone = True
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+class Agent:
+    """
+    Garde un GamingOptimizer résident (stockage chargé, sous-systèmes importés, capteurs du
+    monitoring, connexion WMI) et exécute les requêtes une par une.
+    """
+
+    def __init__(self, optimizer: Any = None, *, monitor_idle: float = AGENT_MONITOR_IDLE) -> None:
+        if optimizer is None:
+            from .main import GamingOptimizer
+
+            optimizer = GamingOptimizer()
+        self.optimizer = optimizer
+        self.monitor_idle = monitor_idle
+        self.served = 0
+        self._command_lock = threading.Lock()
+        self._idle_timer: Optional[threading.Timer] = None
+        self._server: Any = None
+        self._token: Optional[str] = None
+        self.unavailable: Optional[str] = None  # raison pour laquelle seules status/shutdown sont servies
+
+    # ----- commandes -----
+    def _monitor_snapshot(self) -> Dict[str, Any]:
+        values = self.optimizer.monitor_snapshot(keep_running=True)
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+        self._idle_timer = threading.Timer(self.monitor_idle, self.optimizer.stop_live_monitor)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+        return values
+
+    def execute(self, command: str, args: Dict[str, Any]) -> Any:
+        opt = self.optimizer
+        frametimes = Path(args["frametimes"]) if args.get("frametimes") else None
+        if command == "analyze":
+            return opt.analyze(frametime_log=frametimes)
+        if command == "optimize":
+            return opt.optimize(force=True, plan_only=bool(args.get("plan")), frametime_log=frametimes)
+        if command == "network-test":
+            options = {key: args[key] for key in ("top_k", "explore", "adaptive") if args.get(key) is not None}
+            return opt.network_test(**options)
+        if command == "restore":
+            return opt.restore()
+        if command == "monitor-snapshot":
+            return self._monitor_snapshot()
+        if command == "status":
+            return {"pid": os.getpid(), "served": self.served}
+        raise ValueError(f"Commande inconnue: {command}")
+
+    def handle(self, request: Dict[str, Any], send) -> None:
+        if self._token is not None and request.get("token") != self._token:
+            send({"done": True, "ok": False, "error": "Jeton de l'agent invalide."})
+            return
+        command = request.get("command", "")
+        if command == "shutdown":
+            send({"done": True, "ok": True, "error": None, "result": None})
+            self.shutdown()
+            return
+        if self.unavailable is not None and command not in UNPRIVILEGED_COMMANDS:
+            send({"done": True, "ok": False, "error": self.unavailable, "local": True})
+            return
+        with self._command_lock:  # sys.stdout est redirigé: une commande à la fois
+            if "storage" in vars(self.optimizer):  # déjà construit (cached_property)
+                self.optimizer.storage.refresh()  # écrit entre-temps par une commande locale (watch...)
+            try:
+                with contextlib.redirect_stdout(_StreamWriter(send)):
+                    result = self.execute(command, request.get("args") or {})
+            except Exception as exc:  # l'agent survit à l'échec d'une commande
+                send({"done": True, "ok": False, "error": str(exc) or type(exc).__name__})
+                return
+            except SystemExit as exc:  # sys.exit dans une commande: répondre plutôt que tuer le thread
+                error = exc.code if isinstance(exc.code, str) else f"Commande interrompue (code {exc.code})."
+                send({"done": True, "ok": False, "error": error})
+                return
+            finally:
+                self.served += 1
+        send({"done": True, "ok": True, "error": None, "result": result})
+
+    # ----- transport -----
+    def _check_privileges(self) -> None:
+        from .admin import AdminManager
+
+        try:
+            AdminManager.ensure_admin()
+        except OSError as exc:  # hors Windows (EnvironmentError) ou non élevé (PermissionError)
+            self.unavailable = str(exc)
+
+    def serve(self) -> None:
+        """Bloque jusqu'à Ctrl+C ou une requête `shutdown`."""
+        if AgentClient.connect() is not None:
+            raise RuntimeError("Un agent est déjà en cours d'exécution.")
+        self._check_privileges()
+        AGENT_SOCKET.parent.mkdir(parents=True, exist_ok=True)
+        if _use_unix_socket():
+            if AGENT_SOCKET.exists():
+                AGENT_SOCKET.unlink()  # socket orphelin d'un agent arrêté brutalement
+            # Pas de jeton sur Unix: le socket doit naître en 0600, sans fenêtre avant un chmod.
+            previous = os.umask(0o177)
+            try:
+                self._server = _UnixAgentServer(str(AGENT_SOCKET), _AgentHandler)
+            finally:
+                os.umask(previous)
+            address = str(AGENT_SOCKET)
+        else:
+            from .utils import save_json
+
+            self._server = _TcpAgentServer(("127.0.0.1", 0), _AgentHandler)
+            self._token = secrets.token_hex(16)
+            port = self._server.server_address[1]
+            save_json(AGENT_INFO_FILE, {"port": port, "token": self._token, "pid": os.getpid()})
+            address = f"127.0.0.1:{port}"
+        self._server.agent = self
+        print(f"[AGENT] PID {os.getpid()} à l'écoute sur {address}. Ctrl+C pour arrêter.")
+        if self.unavailable is not None:
+            print(f"[AGENT] {self.unavailable} Les commandes relayées s'exécuteront en local.")
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nAgent arrêté.")
+        finally:
+            self._cleanup()
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            # serve_forever tourne dans le thread principal: arrêt depuis un autre thread.
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def _cleanup(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+        self.optimizer.stop_live_monitor()
+        if self._server is not None:
+            self._server.server_close()
+        try:
+            (AGENT_SOCKET if _use_unix_socket() else AGENT_INFO_FILE).unlink()
+        except OSError:
+            pass
+
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            self._send({"done": True, "ok": False, "error": "Requête JSON invalide."})
+            return
+        try:
+            self.server.agent.handle(request, self._send)  # type: ignore[attr-defined]
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client parti: la commande s'est tout de même exécutée
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(message, default=str).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class _TcpAgentServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    agent: Optional[Agent] = None
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _UnixAgentServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        agent: Optional[Agent] = None
@@ -0,0 +1,192 @@
+"""
+Benchmarks par composant: CPU mono/multi-cœur, mémoire (NumPy) et gigue d'ordonnancement.
+
+Chaque mesure fait un tour de chauffe puis plusieurs essais, et rapporte la moyenne avec
+un intervalle de confiance à 95 % (loi de Student).
+"""
+from __future__ import annotations
+
+import math
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None
+
+from .stats import t_critical
+
+
+def confidence_interval(samples: List[float]) -> float:
+    """Demi-largeur de l'intervalle de confiance à 95 % de la moyenne."""
+    if len(samples) < 2:
+        return 0.0
+    return t_critical(len(samples) - 1) * statistics.stdev(samples) / math.sqrt(len(samples))
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    unit: str
+    samples: List[float] = field(default_factory=list)
+    higher_is_better: bool = True
+
+    @property
+    def mean(self) -> float:
+        return statistics.mean(self.samples) if self.samples else 0.0
+
+    @property
+    def ci(self) -> float:
+        return confidence_interval(self.samples)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "unit": self.unit,
+            "mean": round(self.mean, 4),
+            "ci": round(self.ci, 4),
+            "samples": [round(s, 4) for s in self.samples],
+            "higher_is_better": self.higher_is_better,
+        }
+
+
+def available_cpus() -> int:
+    """Cœurs réellement utilisables par le processus (affinité comprise quand l'OS l'expose)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+# ---------- Noyaux (fonctions de module: sérialisables pour le pool de processus) ----------
+def integer_kernel(iterations: int) -> int:
+    acc = 0
+    for i in range(iterations):
+        acc = (acc + (i * 2654435761 ^ (i >> 3))) & 0xFFFFFFFF
+    return acc
+
+
+def float_kernel(iterations: int) -> float:
+    acc = 0.0
+    x = 1.0001
+    for _ in range(iterations):
+        acc += x * x / (1.0 + acc * 1e-9)
+        x = x * 1.0000001 + 1e-7
+    return acc
+
+
+class BenchmarkSuite:
+    """Exécute les benchmarks disponibles; ceux dont la dépendance manque sont ignorés."""
+
+    def __init__(
+        self,
+        *,
+        trials: int = 5,
+        warmup: int = 1,
+        cpu_iterations: int = 300_000,
+        memory_mb: int = 64,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.trials = max(trials, 2)
+        self.warmup = max(warmup, 0)
+        self.cpu_iterations = cpu_iterations
+        self.memory_mb = memory_mb
+        self.workers = workers or available_cpus()
+
+    def _repeat(self, measure: Callable[[], float]) -> List[float]:
+        for _ in range(self.warmup):
+            measure()
+        return [measure() for _ in range(self.trials)]
+
+    def _timed_rate(self, func: Callable[[], object], work: float) -> float:
+        start = time.perf_counter()
+        func()
+        return work / (time.perf_counter() - start)
+
+    # ---------- CPU ----------
+    def cpu_integer(self) -> BenchmarkResult:
+        n = self.cpu_iterations
+        samples = self._repeat(lambda: self._timed_rate(lambda: integer_kernel(n), n / 1e6))
+        return BenchmarkResult("cpu_int", "Mops/s", samples)
+
+    def cpu_float(self) -> BenchmarkResult:
+        n = self.cpu_iterations
+        samples = self._repeat(lambda: self._timed_rate(lambda: float_kernel(n), n / 1e6))
+        return BenchmarkResult("cpu_float", "Mops/s", samples)
+
+    def cpu_all_cores(self) -> BenchmarkResult:
+        n, workers = self.cpu_iterations, self.workers
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # La chauffe absorbe aussi le démarrage des processus.
+            samples = self._repeat(
+                lambda: self._timed_rate(lambda: list(pool.map(integer_kernel, [n] * workers)), n * workers / 1e6)
+            )
+        return BenchmarkResult("cpu_multi", "Mops/s", samples)
+
+    # ---------- Mémoire ----------
+    def memory_bandwidth(self) -> BenchmarkResult:
+        count = self.memory_mb * 1024 * 1024 // 8
+        src = np.ones(count, dtype=np.float64)
+        dst = np.empty_like(src)
+        gigabytes = 2 * src.nbytes / 1e9  # lecture + écriture
+        samples = self._repeat(lambda: self._timed_rate(lambda: np.copyto(dst, src), gigabytes))
+        return BenchmarkResult("mem_bandwidth", "GB/s", samples)
+
+    def memory_latency(self) -> BenchmarkResult:
+        """Temps moyen d'un accès aléatoire (gather) dans un tableau bien plus grand que les caches."""
+        count = self.memory_mb * 1024 * 1024 // 8
+        data = np.arange(count, dtype=np.int64)
+        index = np.random.default_rng(0).integers(0, count, size=min(count, 4_000_000))
+
+        def measure() -> float:
+            start = time.perf_counter()
+            data.take(index).sum()
+            return (time.perf_counter() - start) / index.size * 1e9
+
+        return BenchmarkResult("mem_latency", "ns", self._repeat(measure), higher_is_better=False)
+
+    # ---------- Ordonnancement ----------
+    def timer_jitter(self, sleeps: int = 50, target: float = 0.001) -> BenchmarkResult:
+        """Dépassement moyen d'un sleep de 1 ms: reflète la résolution du timer et l'ordonnanceur."""
+
+        def measure() -> float:
+            overshoot = []
+            for _ in range(sleeps):
+                start = time.perf_counter()
+                time.sleep(target)
+                overshoot.append(time.perf_counter() - start - target)
+            return statistics.mean(overshoot) * 1000
+
+        return BenchmarkResult("timer_jitter", "ms", self._repeat(measure), higher_is_better=False)
+
+    def timer_resolution(self, reads: int = 10_000) -> BenchmarkResult:
+        """Plus petit écart non nul observé entre deux lectures de perf_counter."""
+
+        def measure() -> float:
+            best = math.inf
+            last = time.perf_counter()
+            for _ in range(reads):
+                now = time.perf_counter()
+                if now != last:
+                    best = min(best, now - last)
+                    last = now
+            return best * 1e6
+
+        return BenchmarkResult("timer_resolution", "µs", self._repeat(measure), higher_is_better=False)
+
+    def run(self) -> Dict[str, BenchmarkResult]:
+        benchmarks: List[Callable[[], BenchmarkResult]] = [self.cpu_integer, self.cpu_float, self.cpu_all_cores]
+        if np is not None:
+            benchmarks += [self.memory_bandwidth, self.memory_latency]
+        benchmarks += [self.timer_resolution, self.timer_jitter]
+        results: Dict[str, BenchmarkResult] = {}
+        for bench in benchmarks:
+            try:
+                result = bench()
+            except (OSError, RuntimeError, MemoryError):
+                continue  # ex. pool de processus indisponible
+            results[result.name] = result
+        return results
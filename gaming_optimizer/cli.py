@@ -5,21 +5,16 @@ from __future__ import annotations
 
 import argparse
 import time
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from .config import MENU_OPTIONS
-from .main import GamingOptimizer
-from .ui import MenuUI
+from .config import LATENCY_MODEL_EXPLORE, MENU_OPTIONS, MONITOR_RECORD_MB, WATCHER_INTERVAL
 
-try:
-    from colorama import Fore, Style
-except ImportError:  # fallback si colorama absent
-    class _Fallback:
-        RESET_ALL = ""
+if TYPE_CHECKING:
+    from .main import GamingOptimizer
 
-        def __getattr__(self, name: str) -> str:
-            return ""
-
-    Fore = Style = _Fallback()
+# Les sous-systèmes (psutil, WMI, colorama...) ne sont importés qu'une fois la
+# commande connue: `--help` ou un raccourci vers `monitor` ne paient que ce qu'ils utilisent.
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -27,23 +22,81 @@ def build_parser() -> argparse.ArgumentParser:
         prog="gaming-optimizer",
         description="Optimiseur de performances gaming (Windows 10/11).",
     )
+    parser.add_argument(
+        "--profile", action="store_true", help="Tracer l'exécution (trace Chrome/Perfetto + résumé par span)."
+    )
+    parser.add_argument("--profile-out", type=Path, help="Fichier de trace (défaut: reports/traces/trace_<date>.json).")
+    parser.add_argument("--local", action="store_true", help="Ne pas passer par l'agent résident même s'il tourne.")
     sub = parser.add_subparsers(dest="command")
 
-    sub.add_parser("analyze", help="Analyse complète du réseau et du système.")
+    analyze_parser = sub.add_parser("analyze", help="Analyse complète du réseau et du système.")
+    analyze_parser.add_argument(
+        "--frametimes", type=Path, default=None, help="Journal CSV de frame-times (PresentMon) à analyser."
+    )
 
     optimize_parser = sub.add_parser("optimize", help="Appliquer toutes les optimisations.")
+    optimize_parser.add_argument(
+        "--frametimes", type=Path, default=None, help="Journal CSV de frame-times capturé après optimisation."
+    )
     optimize_parser.add_argument("-y", "--yes", action="store_true", help="Ne pas demander de confirmation.")
+    optimize_parser.add_argument(
+        "--plan", action="store_true", help="Afficher les modifications nécessaires sans les appliquer."
+    )
 
-    sub.add_parser("network-test", help="Tests réseau approfondis.")
+    network_test = sub.add_parser("network-test", help="Tests réseau approfondis.")
+    network_test.add_argument(
+        "--top-k", type=int, help="Ne sonder que les N meilleurs serveurs du catalogue selon l'historique."
+    )
+    network_test.add_argument(
+        "--explore", type=int, default=LATENCY_MODEL_EXPLORE, help="Avec --top-k: serveurs d'exploration ajoutés."
+    )
+    network_test.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Sonder chaque cible jusqu'à un intervalle de confiance suffisant (cibles mortes abandonnées vite).",
+    )
+    trace = sub.add_parser("trace", help="Analyse saut par saut du chemin (façon MTR).")
+    trace.add_argument("targets", nargs="*", help="Noms de PING_TARGETS ou hôtes (défaut: toutes les cibles).")
     sub.add_parser("restore", help="Restaurer les paramètres sauvegardés.")
 
+    watch = sub.add_parser("watch", help="Booster les jeux dès leur lancement.")
+    watch.add_argument("--interval", type=float, default=WATCHER_INTERVAL, help="Intervalle entre deux passages (s).")
+    watch.add_argument("--duration", type=float, help="Arrêter après N secondes.")
+
     monitor = sub.add_parser("monitor", help="Monitoring temps réel.")
-    monitor.add_argument("--interval", type=float, default=2.0, help="Intervalle entre les mesures (s).")
+    monitor.add_argument("--interval", type=float, default=2.0, help="Intervalle de rafraîchissement de l'affichage (s).")
+    monitor.add_argument("--record", type=Path, help="Enregistrer les mesures dans ce fichier anneau binaire.")
+    monitor.add_argument(
+        "--record-mb", type=float, default=MONITOR_RECORD_MB, help="Taille maximale du fichier d'enregistrement (Mo)."
+    )
+    monitor.add_argument("--replay", type=Path, help="Relire un enregistrement au lieu de mesurer.")
+    monitor.add_argument("--last", type=float, help="Avec --replay: ne relire que les N dernières secondes.")
+    monitor.add_argument("--snapshot", action="store_true", help="Afficher une seule ligne de mesures puis quitter.")
+    monitor.add_argument(
+        "--serve", type=int, metavar="PORT", help="Exposer les mesures en OpenMetrics sur http://127.0.0.1:PORT/metrics."
+    )
+
+    agent = sub.add_parser("agent", help="Agent résident: les commandes suivantes réutilisent son état chaud.")
+    agent.add_argument("--stop", action="store_true", help="Arrêter l'agent en cours d'exécution.")
+    agent.add_argument("--status", action="store_true", help="Afficher l'état de l'agent.")
 
     return parser
 
 
 def interactive_menu(opt: GamingOptimizer) -> None:
+    from .ui import MenuUI
+
+    try:
+        from colorama import Fore, Style
+    except ImportError:  # fallback si colorama absent
+        class _Fallback:
+            RESET_ALL = ""
+
+            def __getattr__(self, name: str) -> str:
+                return ""
+
+        Fore = Style = _Fallback()
+
     ui = MenuUI(MENU_OPTIONS)
     while True:
         choice = ui.prompt()
@@ -55,34 +108,109 @@ def interactive_menu(opt: GamingOptimizer) -> None:
         if command == "quit":
             print(Fore.CYAN + "À bientôt et bon jeu !" + Style.RESET_ALL)
             break
-        args = argparse.Namespace(command=command, yes=False, interval=2.0)
+        args = argparse.Namespace(command=command, yes=False, plan=False, frametimes=None)
         dispatch_command(opt, args)
         ui.pause()
 
 
 def dispatch_command(opt: GamingOptimizer, args: argparse.Namespace) -> None:
     if args.command == "analyze":
-        opt.analyze()
+        opt.analyze(frametime_log=getattr(args, "frametimes", None))
     elif args.command == "optimize":
-        opt.optimize(force=args.yes)
+        opt.optimize(
+            force=args.yes,
+            plan_only=getattr(args, "plan", False),
+            frametime_log=getattr(args, "frametimes", None),
+        )
     elif args.command == "network-test":
-        opt.network_test()
+        opt.network_test(
+            top_k=getattr(args, "top_k", None),
+            explore=getattr(args, "explore", LATENCY_MODEL_EXPLORE),
+            adaptive=getattr(args, "adaptive", False),
+        )
+    elif args.command == "trace":
+        opt.trace(getattr(args, "targets", None))
     elif args.command == "restore":
         opt.restore()
+    elif args.command == "watch":
+        opt.watch(interval=getattr(args, "interval", WATCHER_INTERVAL), duration=getattr(args, "duration", None))
+    elif args.command == "monitor" and getattr(args, "snapshot", False):
+        opt.monitor_snapshot()
     elif args.command == "monitor":
-        opt.monitor(interval=getattr(args, "interval", 2.0))
+        opt.monitor(
+            interval=getattr(args, "interval", 2.0),
+            record=getattr(args, "record", None),
+            record_mb=getattr(args, "record_mb", MONITOR_RECORD_MB),
+            replay=getattr(args, "replay", None),
+            last=getattr(args, "last", None),
+            serve=getattr(args, "serve", None),
+        )
+    elif args.command == "agent":
+        run_agent(opt, args)
     else:
         raise SystemExit(1)
 
 
+def run_agent(opt: GamingOptimizer, args: argparse.Namespace) -> None:
+    from .agent import Agent, AgentClient
+
+    if getattr(args, "stop", False) or getattr(args, "status", False):
+        client = AgentClient.connect()
+        if client is None:
+            print("Aucun agent en cours d'exécution.")
+            return
+        response = client.request("shutdown" if args.stop else "status")
+        print("Agent arrêté." if args.stop else f"Agent actif: {response.get('result')}")
+        return
+    Agent(opt).serve()
+
+
 def main(argv: list[str] | None = None) -> None:
+    import multiprocessing
+
+    multiprocessing.freeze_support()  # pool de benchmark dans l'exécutable PyInstaller
     parser = build_parser()
     args = parser.parse_args(argv)
-    optimizer = GamingOptimizer()
-    if not args.command:
-        interactive_menu(optimizer)
+
+    if args.command and not (args.local or args.profile):
+        from .agent import run_remote
+
+        remote = run_remote(args)  # client léger: l'agent résident exécute la commande
+        if remote is not None:
+            if not remote:
+                raise SystemExit(1)
+            return
+
+    from .main import GamingOptimizer
+
+    if args.profile:
+        from . import tracing
+
+        tracing.enable()
+    try:
+        optimizer = GamingOptimizer()
+        if not args.command:
+            interactive_menu(optimizer)
+            return
+        dispatch_command(optimizer, args)
+    finally:
+        if args.profile:
+            _write_profile(args.profile_out)
+
+
+def _write_profile(path: Path | None) -> None:
+    import datetime as dt
+
+    from . import tracing
+    from .config import TRACE_DIR
+
+    tracer = tracing.disable()
+    if tracer is None:
         return
-    dispatch_command(optimizer, args)
+    path = path or TRACE_DIR / f"trace_{dt.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    print()
+    print(tracer.summary())
+    print(f"Trace: {tracer.export(path)} (chrome://tracing ou ui.perfetto.dev)")
 
 
 if __name__ == "__main__":
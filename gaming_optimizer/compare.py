@@ -0,0 +1,181 @@
+"""
+Comparaison avant/après: intervalles bootstrap vectorisés (NumPy) et test de Mann-Whitney.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+from .config import BOOTSTRAP_CONFIDENCE, BOOTSTRAP_DRAWS
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Écart après - avant d'une métrique; IC bootstrap de la différence des moyennes."""
+
+    name: str
+    before: float  # moyennes
+    after: float
+    low: float  # bornes de l'IC de la différence (unité de la métrique)
+    high: float
+    p_value: float  # Mann-Whitney bilatéral
+    higher_is_better: bool = True
+
+    @property
+    def delta(self) -> float:
+        return self.after - self.before
+
+    @property
+    def pct(self) -> float:
+        return self.delta / self.before * 100 if self.before else 0.0
+
+    @property
+    def pct_low(self) -> float:
+        return self.low / self.before * 100 if self.before else 0.0
+
+    @property
+    def pct_high(self) -> float:
+        return self.high / self.before * 100 if self.before else 0.0
+
+    @property
+    def significant(self) -> bool:
+        """Faux quand l'intervalle contient 0: aucun changement mesurable."""
+        return self.low > 0 or self.high < 0
+
+    @property
+    def improved(self) -> bool:
+        return self.delta > 0 if self.higher_is_better else self.delta < 0
+
+
+def bootstrap_delta(
+    before: Sequence[float],
+    after: Sequence[float],
+    *,
+    draws: int = BOOTSTRAP_DRAWS,
+    confidence: float = BOOTSTRAP_CONFIDENCE,
+    rng: Optional[Any] = None,
+) -> tuple[float, float]:
+    """
+    IC percentile de mean(after) - mean(before).
+
+    Les `draws` rééchantillonnages sont tirés d'un bloc (matrice draws x n d'indices):
+    quelques millisecondes pour des milliers de tirages.
+    """
+    if np is None:
+        raise RuntimeError("NumPy est requis pour le bootstrap.")
+    rng = rng or np.random.default_rng()
+    a = np.asarray(before, dtype=float)
+    b = np.asarray(after, dtype=float)
+    means_a = a[rng.integers(0, a.size, size=(draws, a.size))].mean(axis=1)
+    means_b = b[rng.integers(0, b.size, size=(draws, b.size))].mean(axis=1)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(means_b - means_a, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def _rank(values: "np.ndarray") -> "np.ndarray":
+    """Rangs 1..n, rang moyen pour les ex aequo."""
+    order = np.argsort(values, kind="mergesort")
+    ranks = np.empty(values.size, dtype=float)
+    ranks[order] = np.arange(1, values.size + 1)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=ranks)
+    return sums[inverse] / counts[inverse]
+
+
+def mann_whitney(before: Sequence[float], after: Sequence[float]) -> float:
+    """p-value bilatérale (approximation normale, correction des ex aequo et de continuité)."""
+    if np is None:
+        raise RuntimeError("NumPy est requis pour le test de Mann-Whitney.")
+    a = np.asarray(before, dtype=float)
+    b = np.asarray(after, dtype=float)
+    n1, n2 = a.size, b.size
+    ranks = _rank(np.concatenate([a, b]))
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    _, counts = np.unique(np.concatenate([a, b]), return_counts=True)
+    n = n1 + n2
+    ties = float((counts ** 3 - counts).sum())
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def compare_samples(
+    name: str,
+    before: Sequence[float],
+    after: Sequence[float],
+    *,
+    higher_is_better: bool = True,
+    draws: int = BOOTSTRAP_DRAWS,
+    rng: Optional[Any] = None,
+) -> Optional[Comparison]:
+    """None sans NumPy ou avec moins de deux échantillons d'un côté."""
+    if np is None or len(before) < 2 or len(after) < 2:
+        return None
+    low, high = bootstrap_delta(before, after, draws=draws, rng=rng)
+    return Comparison(
+        name=name,
+        before=float(np.mean(before)),
+        after=float(np.mean(after)),
+        low=low,
+        high=high,
+        p_value=mann_whitney(before, after),
+        higher_is_better=higher_is_better,
+    )
+
+
+def compare_metrics(before: Dict[str, Any], after: Dict[str, Any], *, rng: Optional[Any] = None) -> Dict[str, Comparison]:
+    """Comparaisons des benchmarks et de la latence réseau quand les échantillons sont conservés."""
+    if np is None:
+        return {}
+    rng = rng or np.random.default_rng()
+    comparisons: Dict[str, Comparison] = {}
+    previous = before.get("benchmarks", {})
+    for name, current in after.get("benchmarks", {}).items():
+        old = previous.get(name)
+        if not old:
+            continue
+        result = compare_samples(
+            name,
+            old.get("samples", []),
+            current.get("samples", []),
+            higher_is_better=current.get("higher_is_better", True),
+            rng=rng,
+        )
+        if result is not None:
+            comparisons[name] = result
+    # Latence: uniquement les cibles mesurées des deux côtés, échantillons regroupés.
+    old_latency = before.get("latency_samples", {})
+    new_latency = after.get("latency_samples", {})
+    common = [name for name in new_latency if name in old_latency]
+    result = compare_samples(
+        "latency",
+        [value for name in common for value in old_latency[name]],
+        [value for name in common for value in new_latency[name]],
+        higher_is_better=False,
+        rng=rng,
+    )
+    if result is not None:
+        comparisons["latency"] = result
+    return comparisons
+
+
+def describe(comparison: Comparison, unit: str = "") -> str:
+    """« 10.00 → 11.00 Mops/s (+10.0 %, IC95 [+4.1 %; +15.8 %], p=0.008, mieux) »."""
+    unit = f" {unit}" if unit else ""
+    head = f"{comparison.before:.2f} → {comparison.after:.2f}{unit}"
+    interval = f"IC{BOOTSTRAP_CONFIDENCE * 100:.0f} [{comparison.pct_low:+.1f} %; {comparison.pct_high:+.1f} %]"
+    if not comparison.significant:
+        return f"{head} (aucun changement mesurable, {interval})"
+    verdict = "mieux" if comparison.improved else "moins bien"
+    p_value = "p<0.001" if comparison.p_value < 0.001 else f"p={comparison.p_value:.3f}"
+    return f"{head} ({comparison.pct:+.1f} %, {interval}, {p_value}, {verdict})"
+
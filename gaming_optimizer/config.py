@@ -10,7 +10,19 @@ LOG_DIR = BASE_DIR.parent / "logs"
 STORAGE_DIR = BASE_DIR.parent / "storage"
 BACKUP_FILE = STORAGE_DIR / "system_backup.json"
 NETWORK_LOG = REPORT_DIR / "network_reports.json"
+NETWORK_HISTORY_DIR = REPORT_DIR / "network_history"
+TRACE_DIR = REPORT_DIR / "traces"  # --profile: traces Chrome/Perfetto
+# Agent résident: socket Unix, ou port TCP local + jeton (Windows) publiés dans AGENT_INFO_FILE
+AGENT_SOCKET = STORAGE_DIR / "agent.sock"
+AGENT_INFO_FILE = STORAGE_DIR / "agent.json"
+LATENCY_MODEL_FILE = STORAGE_DIR / "latency_model.json"
+DNS_BENCH_FILE = STORAGE_DIR / "dns_benchmark.json"  # dernière paire DNS mesurée et sa date
+# Catalogue facultatif de serveurs/relais: {"nom": "hôte"} ou {"nom": {"host": ..., "region": ...}}
+SERVER_CATALOG_FILE = DATA_DIR / "server_catalog.json"
 
+# « hôte » (echo ICMP), « tcp://hôte[:port] » (temps de connexion) ou « udp://hôte:port[?payload=hex] »
+# (aller-retour d'un datagramme) pour les serveurs qui filtrent l'ICMP; « &refused=1 » (ou « ?refused=1 »)
+# compte aussi un refus (RST, port injoignable) comme une réponse
 PING_TARGETS = {
     "Valorant EU": "185.40.64.1",
     "Valorant NA": "192.207.0.1",
@@ -37,10 +49,89 @@ GAME_PROCESS_NAMES = [
     "leagueclientux.exe",
 ]
 
-DNS_SERVERS = ("1.1.1.1", "1.0.0.1")
+# Surveillance des lancements de jeux (commande watch)
+WATCHER_INTERVAL = 1.0  # s entre deux diffs de la liste des PID
+WATCHER_MAX_OVERHEAD = 0.5  # % d'un cœur que la surveillance s'autorise
+WATCHER_DENIED_RETRY = 30.0  # s avant de réessayer un PID dont l'accès a été refusé
+GAME_NICE = -10  # équivalent Linux de HIGH_PRIORITY_CLASS
+
+# Affinité CPU: cœurs physiques réservés aux jeux (None = la moitié) et seuil d'un processus « lourd » (%)
+AFFINITY_RESERVED_CORES = None
+AFFINITY_HEAVY_CPU = 5.0
+
+DNS_SERVERS = ("1.1.1.1", "1.0.0.1")  # repli si le benchmark DNS n'obtient aucune réponse
+
+# Résolveurs comparés par optimize (« ip » ou « ip:port ») et noms résolus pendant le benchmark
+DNS_CANDIDATES = (
+    "1.1.1.1",
+    "1.0.0.1",
+    "8.8.8.8",
+    "8.8.4.4",
+    "9.9.9.9",
+    "149.112.112.112",
+    "208.67.222.222",
+    "208.67.220.220",
+)
+DNS_BENCH_HOSTNAMES = (
+    "auth.riotgames.com",
+    "api.steampowered.com",
+    "steamcommunity.com",
+    "epicgames.com",
+    "leagueoflegends.com",
+    "battle.net",
+)
+DNS_BENCH_MAX_AGE = 6 * 3600  # s pendant lesquelles la paire retenue est réutilisée sans nouveau benchmark
+
+# Profil cible appliqué par optimize (comparé à l'état courant en mode plan)
+TCP_GLOBALS = {
+    "autotuninglevel": "normal",
+    "ecncapability": "enabled",
+    "dca": "enabled",
+    "chimney": "enabled",
+}
+HIGH_PERFORMANCE_SCHEME = "8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c"  # alias powercfg SCHEME_MIN
+SERVICE_STARTUP_TYPE = "Manual"
+
+# Comparaison avant/après (rapport optimize)
+BOOTSTRAP_DRAWS = 5000
+BOOTSTRAP_CONFIDENCE = 0.95
+
+# Démarrage de la CLI (python -m gaming_optimizer.startup): médianes maximales en ms
+STARTUP_BUDGET_MS = {"import": 100.0, "first_output": 500.0}
+# Modules qu'un simple `import gaming_optimizer.cli` ne doit jamais charger
+STARTUP_LAZY_MODULES = ("psutil", "wmi", "colorama", "numpy", "asyncio", "gaming_optimizer.main")
+
+# Modèle de latence (EWMA par cible et tranche horaire)
+LATENCY_MODEL_ALPHA = 0.3
+LATENCY_MODEL_BUCKET_HOURS = 4
+LATENCY_MODEL_EXPLORE = 2  # sondes d'exploration ajoutées au top-K
 
 # Durée (ms) pour considérer qu'un ping est critique
 PING_THRESHOLD = 60.0
+# Jitter (ms) à partir duquel network-test analyse le chemin de la cible (comme toute perte)
+PATH_TRACE_JITTER = 6.0
+# Écart (points de %) toléré entre la perte d'un saut et celle du saut suivant pour lui attribuer l'origine
+PATH_LOSS_TOLERANCE = 5.0
+
+# Sondes adaptatives (network-test --adaptive): arrêt dès que les intervalles à 95 % sont étroits
+PROBE_LATENCY_TOLERANCE = 2.0  # demi-largeur max de l'IC de la latence moyenne (ms)
+PROBE_LOSS_TOLERANCE = 0.15  # demi-largeur max de l'intervalle de Wilson des pertes (fraction)
+PROBE_MIN_ATTEMPTS = 5
+PROBE_MAX_ATTEMPTS = 30
+PROBE_DEAD_AFTER = 2  # timeouts consécutifs sans aucune réponse avant d'abandonner une cible
+PROBE_TCP_PORT = 443  # port des cibles « tcp://hôte » sans port explicite
+
+# Monitoring: cible du ping et cadence de chaque capteur (Hz)
+MONITOR_PING_HOST = "1.1.1.1"
+MONITOR_RATES = {"cpu": 10.0, "cores": 10.0, "ram": 2.0, "ping": 2.0, "gpu": 1.0}
+# Enregistrement (monitor --record): cadence d'écriture et taille du fichier anneau
+MONITOR_RECORD_HZ = 10.0
+MONITOR_RECORD_MB = 32.0
+# Export OpenMetrics (monitor --serve): bornes des seaux de latence (ms) et fenêtre du taux de pertes
+MONITOR_LATENCY_BUCKETS_MS = (5.0, 10.0, 15.0, 20.0, 30.0, 40.0, 60.0, 80.0, 100.0, 150.0, 250.0, 500.0, 1000.0)
+MONITOR_LOSS_WINDOW = 120  # derniers pings pris en compte par gaming_ping_loss_ratio
+# Agent: arrêt des capteurs du monitoring après N secondes sans monitor --snapshot
+AGENT_MONITOR_IDLE = 60.0
 
 MENU_OPTIONS = {
     "1": ("analyze", "Analyse complète du système"),
@@ -48,6 +139,7 @@ MENU_OPTIONS = {
     "3": ("network-test", "Tests réseau détaillés"),
     "4": ("monitor", "Monitoring temps réel"),
     "5": ("restore", "Restaurer les paramètres"),
+    "6": ("watch", "Surveiller les lancements de jeux"),
     "q": ("quit", "Quitter"),
 }
 
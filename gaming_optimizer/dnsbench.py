@@ -0,0 +1,296 @@
+"""
+Benchmark de résolveurs DNS: requêtes UDP concurrentes (en cache / hors cache) et classement.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .config import DNS_BENCH_HOSTNAMES, DNS_CANDIDATES
+from .stats import exact_quantile
+
+DNS_PORT = 53
+QTYPE_A = 1
+QCLASS_IN = 1
+RCODE_NOERROR = 0
+RCODE_SERVFAIL = 2
+RCODE_NXDOMAIN = 3
+
+
+def encode_name(name: str) -> bytes:
+    labels = [label.encode("idna") for label in name.rstrip(".").split(".") if label]
+    return b"".join(struct.pack("!B", len(label)) + label for label in labels) + b"\x00"
+
+
+def build_query(query_id: int, name: str, qtype: int = QTYPE_A) -> bytes:
+    """Requête standard avec récursion demandée (RD)."""
+    header = struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0)
+    return header + encode_name(name) + struct.pack("!HH", qtype, QCLASS_IN)
+
+
+def parse_response(data: bytes) -> Optional[Tuple[int, int]]:
+    """(identifiant, rcode) d'une réponse DNS, None si le paquet n'en est pas une."""
+    if len(data) < 12:
+        return None
+    query_id, flags = struct.unpack("!HH", data[:4])
+    if not flags & 0x8000:  # bit QR: réponse
+        return None
+    return query_id, flags & 0x000F
+
+
+def parse_server(server: str) -> Tuple[str, int]:
+    host, _, port = server.partition(":")
+    return host, int(port) if port else DNS_PORT
+
+
+class _ResolverProtocol(asyncio.DatagramProtocol):
+    """Socket UDP connecté à un résolveur; les réponses sont associées par identifiant."""
+
+    def __init__(self) -> None:
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        parsed = parse_response(data)
+        if parsed is None:
+            return
+        future = self.pending.get(parsed[0])
+        if future is not None and not future.done():
+            future.set_result((time.perf_counter(), parsed[1]))
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP port injoignable, etc.: toutes les requêtes en vol échouent tout de suite.
+        for future in self.pending.values():
+            if not future.done():
+                future.set_result((time.perf_counter(), None))
+
+
+@dataclass
+class ResolverResult:
+    server: str
+    cached: List[float] = field(default_factory=list)  # ms
+    uncached: List[float] = field(default_factory=list)
+    sent: int = 0
+    failures: int = 0
+
+    @property
+    def latencies(self) -> List[float]:
+        return sorted(self.cached + self.uncached)
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.sent if self.sent else 1.0
+
+    @staticmethod
+    def _quantile(values: Sequence[float], p: float) -> Optional[float]:
+        return exact_quantile(sorted(values), p) if values else None
+
+    @property
+    def median(self) -> Optional[float]:
+        return self._quantile(self.latencies, 0.5)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self._quantile(self.latencies, 0.95)
+
+    @property
+    def cached_median(self) -> Optional[float]:
+        return self._quantile(self.cached, 0.5)
+
+    @property
+    def uncached_median(self) -> Optional[float]:
+        return self._quantile(self.uncached, 0.5)
+
+    def score(self, timeout_ms: float) -> float:
+        """
+        Plus bas = meilleur. Médianes en cache et hors cache, queue de distribution, et
+        chaque échec compté comme un timeout complet.
+        """
+        if not self.latencies:
+            return float("inf")
+        cached = self.cached_median if self.cached else self.median
+        uncached = self.uncached_median if self.uncached else self.median
+        return 0.5 * cached + 0.3 * uncached + 0.2 * self.p95 + self.failure_rate * timeout_ms
+
+    def as_dict(self) -> Dict[str, object]:
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 2) if value is not None else None
+
+        return {
+            "server": self.server,
+            "median": rounded(self.median),
+            "p95": rounded(self.p95),
+            "cached_median": rounded(self.cached_median),
+            "uncached_median": rounded(self.uncached_median),
+            "failure_rate": round(self.failure_rate, 3),
+        }
+
+
+class DnsBenchmark:
+    """
+    Interroge tous les résolveurs en parallèle, `rounds` fois.
+
+    Chaque round envoie pour chaque nom une requête « en cache » (le nom lui-même, déjà
+    demandé au round de chauffe) et une « hors cache » (sous-domaine aléatoire, que le
+    résolveur doit résoudre récursivement). NXDOMAIN est une réponse valide; timeout,
+    SERVFAIL ou REFUSED sont des échecs.
+    """
+
+    def __init__(
+        self,
+        candidates: Sequence[str] = DNS_CANDIDATES,
+        hostnames: Sequence[str] = DNS_BENCH_HOSTNAMES,
+        *,
+        rounds: int = 3,
+        timeout: float = 1.0,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.candidates = list(candidates)
+        self.hostnames = list(hostnames)
+        self.rounds = rounds
+        self.timeout = timeout
+        self._rng = rng or random.Random()
+
+    def run(self) -> List[ResolverResult]:
+        """Résultats classés du meilleur au moins bon."""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self) -> List[ResolverResult]:
+        loop = asyncio.get_running_loop()
+        endpoints: Dict[str, _ResolverProtocol] = {}
+        try:
+            for server in self.candidates:
+                try:
+                    _transport, protocol = await loop.create_datagram_endpoint(
+                        _ResolverProtocol, remote_addr=parse_server(server)
+                    )
+                except OSError:
+                    continue
+                endpoints[server] = protocol
+            results = {server: ResolverResult(server) for server in self.candidates}
+            # Chauffe: met les noms en cache chez chaque résolveur (non mesurée).
+            await asyncio.gather(
+                *(self._query(endpoints[s], name) for s in endpoints for name in self.hostnames)
+            )
+            for _ in range(self.rounds):
+                await asyncio.gather(*(self._round(endpoints[s], results[s]) for s in endpoints))
+            for server in self.candidates:
+                if server not in endpoints:
+                    results[server].sent = results[server].failures = 1
+        finally:
+            for protocol in endpoints.values():
+                if protocol.transport is not None:
+                    protocol.transport.close()
+        return self.rank(list(results.values()))
+
+    def rank(self, results: List[ResolverResult]) -> List[ResolverResult]:
+        return sorted(results, key=lambda result: result.score(self.timeout * 1000))
+
+    async def _round(self, protocol: _ResolverProtocol, result: ResolverResult) -> None:
+        names = [(name, True) for name in self.hostnames]
+        names += [(f"go-{self._rng.getrandbits(40):010x}.{name}", False) for name in self.hostnames]
+        latencies = await asyncio.gather(*(self._query(protocol, name) for name, _ in names))
+        for (_, cached), latency in zip(names, latencies):
+            result.sent += 1
+            if latency is None:
+                result.failures += 1
+            elif cached:
+                result.cached.append(latency)
+            else:
+                result.uncached.append(latency)
+
+    async def _query(self, protocol: _ResolverProtocol, name: str) -> Optional[float]:
+        """Latence en ms, None en cas d'échec (timeout ou rcode d'erreur)."""
+        if protocol.transport is None:
+            return None
+        loop = asyncio.get_running_loop()
+        query_id = self._rng.randrange(0x10000)
+        while query_id in protocol.pending:
+            query_id = self._rng.randrange(0x10000)
+        future = loop.create_future()
+        protocol.pending[query_id] = future
+        sent = time.perf_counter()
+        try:
+            protocol.transport.sendto(build_query(query_id, name))
+            received, rcode = await asyncio.wait_for(future, self.timeout)
+        except (asyncio.TimeoutError, OSError):
+            return None
+        finally:
+            protocol.pending.pop(query_id, None)
+        if rcode not in (RCODE_NOERROR, RCODE_NXDOMAIN):
+            return None
+        return (received - sent) * 1000
+
+    @staticmethod
+    def best_pair(results: Sequence[ResolverResult]) -> Optional[Tuple[str, str]]:
+        """Deux meilleurs résolveurs ayant répondu, None s'il y en a moins de deux."""
+        usable = [result.server for result in results if result.latencies]
+        if len(usable) < 2:
+            return None
+        return usable[0], usable[1]
+
+
+class StubDnsServer(asyncio.DatagramProtocol):
+    """
+    Serveur DNS factice pour tests en boucle locale.
+
+    `delay(name)` renvoie le délai de réponse en secondes (None = pas de réponse) et
+    `rcode` le code retourné; les requêtes sont comptées par nom dans `queries`.
+    """
+
+    def __init__(self, delay: Callable[[str], Optional[float]] = lambda name: 0.0, rcode: int = RCODE_NOERROR) -> None:
+        self.delay = delay
+        self.rcode = rcode
+        self.queries: Dict[str, int] = {}
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    @staticmethod
+    def _question(data: bytes) -> Tuple[str, int]:
+        labels: List[str] = []
+        offset = 12
+        while offset < len(data) and data[offset]:
+            length = data[offset]
+            labels.append(data[offset + 1 : offset + 1 + length].decode("ascii", "replace"))
+            offset += 1 + length
+        return ".".join(labels), offset + 5  # fin de QNAME + QTYPE/QCLASS
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        if len(data) < 12:
+            return
+        name, end = self._question(data)
+        self.queries[name] = self.queries.get(name, 0) + 1
+        delay = self.delay(name)
+        if delay is None:
+            return
+        query_id = struct.unpack("!H", data[:2])[0]
+        response = struct.pack("!HHHHHH", query_id, 0x8180 | self.rcode, 1, 0, 0, 0) + data[12:end]
+        asyncio.get_running_loop().call_later(delay, self._send, response, addr)
+
+    def _send(self, response: bytes, addr: Tuple[str, int]) -> None:
+        if self.transport is not None:
+            self.transport.sendto(response, addr)
+
+    @classmethod
+    async def start(cls, host: str = "127.0.0.1", port: int = 0, **kwargs) -> "StubDnsServer":
+        loop = asyncio.get_running_loop()
+        _transport, protocol = await loop.create_datagram_endpoint(lambda: cls(**kwargs), local_addr=(host, port))
+        return protocol
+
+    @property
+    def address(self) -> str:
+        host, port = self.transport.get_extra_info("sockname")[:2]  # type: ignore[union-attr]
+        return f"{host}:{port}"
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
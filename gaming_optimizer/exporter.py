@@ -0,0 +1,181 @@
+"""
+Export OpenMetrics/Prometheus des mesures du monitoring (monitor --serve).
+
+Les capteurs alimentent l'état exporté via SamplingPipeline.subscribe; une requête HTTP ne
+fait que relire cet état: un scrape ne déclenche jamais de sonde.
+"""
+from __future__ import annotations
+
+import bisect
+import collections
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, List, Optional, Sequence, Tuple
+
+from .config import MONITOR_LATENCY_BUCKETS_MS, MONITOR_LOSS_WINDOW
+from .sampling import Reading, SamplingPipeline
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Champ de GPUReading -> (métrique, aide)
+_GPU_METRICS = {
+    "temp": ("gaming_gpu_temperature_celsius", "Température du GPU."),
+    "load": ("gaming_gpu_load_percent", "Charge du GPU (%)."),
+    "clock": ("gaming_gpu_clock_megahertz", "Fréquence du cœur GPU."),
+    "vram": ("gaming_gpu_memory_used_megabytes", "Mémoire vidéo utilisée."),
+}
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LatencyHistogram:
+    """Histogramme cumulatif de latence (seaux en ms, exportés en secondes), avec pertes."""
+
+    def __init__(
+        self, buckets_ms: Sequence[float] = MONITOR_LATENCY_BUCKETS_MS, loss_window: int = MONITOR_LOSS_WINDOW
+    ) -> None:
+        self.bounds = sorted(buckets_ms)
+        self.counts = [0] * (len(self.bounds) + 1)  # dernier seau: +Inf
+        self.total_ms = 0.0
+        self.probes = 0
+        self.lost = 0
+        self._recent: Deque[bool] = collections.deque(maxlen=loss_window)
+        self._lock = threading.Lock()
+
+    def observe(self, latency_ms: Optional[float]) -> None:
+        """None = sonde perdue (timeout)."""
+        with self._lock:
+            self.probes += 1
+            self._recent.append(latency_ms is None)
+            if latency_ms is None:
+                self.lost += 1
+                return
+            self.counts[bisect.bisect_left(self.bounds, latency_ms)] += 1
+            self.total_ms += latency_ms
+
+    def loss_ratio(self) -> float:
+        with self._lock:
+            return sum(self._recent) / len(self._recent) if self._recent else 0.0
+
+    def render(self, name: str, labels: str) -> List[str]:
+        with self._lock:
+            counts, total_ms = list(self.counts), self.total_ms
+        lines = [f"# TYPE {name} histogram", f"# UNIT {name} seconds", f"# HELP {name} Latence des pings répondus."]
+        cumulative = 0
+        for bound, count in zip(self.bounds + [None], counts):
+            cumulative += count
+            le = "+Inf" if bound is None else _number(bound / 1000)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        lines.append(f"{name}_sum{{{labels}}} {_number(total_ms / 1000)}")
+        return lines
+
+
+class MonitorMetrics:
+    """État exporté: histogramme alimenté par le capteur ping, jauges relues dans `pipeline.latest()`."""
+
+    def __init__(
+        self, pipeline: SamplingPipeline, host: str, *, buckets_ms: Sequence[float] = MONITOR_LATENCY_BUCKETS_MS
+    ) -> None:
+        self.pipeline = pipeline
+        self.host = host
+        self.latency = LatencyHistogram(buckets_ms)
+        pipeline.subscribe(self._on_reading)
+
+    def _on_reading(self, name: str, reading: Reading) -> None:
+        if name == "ping" and reading.error is None:
+            self.latency.observe(reading.value)
+
+    def render(self) -> str:
+        latest = self.pipeline.latest()
+        values = {name: reading.value for name, reading in latest.items() if reading.error is None}
+        host = f'host="{_escape(self.host)}"'
+        lines = self.latency.render("gaming_ping_latency_seconds", host)
+        lines += [
+            "# TYPE gaming_ping_probes counter",
+            "# HELP gaming_ping_probes Pings envoyés.",
+            f"gaming_ping_probes_total{{{host}}} {self.latency.probes}",
+            "# TYPE gaming_ping_lost counter",
+            "# HELP gaming_ping_lost Pings sans réponse.",
+            f"gaming_ping_lost_total{{{host}}} {self.latency.lost}",
+            "# TYPE gaming_ping_loss_ratio gauge",
+            f"# HELP gaming_ping_loss_ratio Taux de pertes sur les {MONITOR_LOSS_WINDOW} derniers pings.",
+            f"gaming_ping_loss_ratio{{{host}}} {_number(self.latency.loss_ratio())}",
+        ]
+        gauges = {
+            "gaming_cpu_percent": ("Charge CPU totale (%).", values.get("cpu")),
+            "gaming_memory_percent": ("Mémoire utilisée (%).", values.get("ram")),
+        }
+        gpu = values.get("gpu")
+        for field_name, (metric, help_text) in _GPU_METRICS.items():
+            gauges[metric] = (help_text, getattr(gpu, field_name, None))
+        for metric, (help_text, value) in gauges.items():
+            if value is not None:
+                lines += [f"# TYPE {metric} gauge", f"# HELP {metric} {help_text}", f"{metric} {_number(value)}"]
+        if values.get("cores"):
+            lines += ["# TYPE gaming_cpu_core_percent gauge", "# HELP gaming_cpu_core_percent Charge par CPU logique (%)."]
+            lines += [
+                f'gaming_cpu_core_percent{{core="{index}"}} {_number(load)}' for index, load in enumerate(values["cores"])
+            ]
+        lines += ["# TYPE gaming_sensor_age_seconds gauge", "# HELP gaming_sensor_age_seconds Âge de la dernière lecture."]
+        lines += [
+            f'gaming_sensor_age_seconds{{sensor="{name}"}} {_number(reading.age())}'
+            for name, reading in sorted(latest.items())
+        ]
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    server: "_MetricsHTTPServer"
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass  # pas de journal par requête dans la console du monitoring
+
+
+class _MetricsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], metrics: MonitorMetrics) -> None:
+        super().__init__(address, _MetricsHandler)
+        self.metrics = metrics
+
+
+class MetricsServer:
+    """Serveur HTTP local: GET /metrics renvoie `metrics.render()`."""
+
+    def __init__(self, metrics: MonitorMetrics, port: int, host: str = "127.0.0.1") -> None:
+        self._server = _MetricsHTTPServer((host, port), metrics)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+        self._server.server_close()
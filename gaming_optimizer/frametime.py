@@ -0,0 +1,183 @@
+"""
+Analyse de journaux de frame-times (CSV type PresentMon/CapFrameX).
+
+Le fichier est lu par blocs convertis en tableaux NumPy: la mémoire utilisée dépend de
+la taille de bloc et de l'histogramme, pas de la durée de la capture.
+"""
+from __future__ import annotations
+
+import csv
+import itertools
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None
+
+from .stats import RunningStats
+
+FRAME_TIME_COLUMNS = ("MsBetweenPresents", "msBetweenPresents", "FrameTime", "MsBetweenDisplayChange")
+
+# Tranches affichées dans le rapport (ms): ≥120, 60-120, 30-60, 20-30 et <20 FPS
+REPORT_BUCKETS = (8.33, 16.67, 33.33, 50.0)
+
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return float("nan")
+
+
+@dataclass
+class FrameTimeSummary:
+    source: str
+    frames: int = 0
+    duration_s: float = 0.0
+    avg_fps: float = 0.0
+    low_1pct_fps: float = 0.0
+    low_01pct_fps: float = 0.0
+    p50_ms: float = 0.0
+    p99_ms: float = 0.0
+    stdev_ms: float = 0.0
+    max_ms: float = 0.0
+    stutters: int = 0
+    buckets: List[int] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "source": self.source,
+            "frames": self.frames,
+            "duration_s": round(self.duration_s, 2),
+            "avg_fps": round(self.avg_fps, 2),
+            "low_1pct_fps": round(self.low_1pct_fps, 2),
+            "low_01pct_fps": round(self.low_01pct_fps, 2),
+            "p50_ms": round(self.p50_ms, 3),
+            "p99_ms": round(self.p99_ms, 3),
+            "stdev_ms": round(self.stdev_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "stutters": self.stutters,
+            "buckets": self.buckets,
+        }
+
+
+class FrameTimeAnalyzer:
+    """
+    Calcule FPS moyen, 1 % / 0,1 % lows, variance et saccades en un seul passage.
+
+    Les percentiles viennent d'un histogramme à pas fixe (`resolution_ms`), exact à ce pas près.
+    Une saccade est une frame plus longue que `stutter_factor` fois la moyenne des
+    `stutter_window` frames précédentes (et au moins `stutter_min_ms`).
+    """
+
+    def __init__(
+        self,
+        *,
+        chunk_rows: int = 262_144,
+        resolution_ms: float = 0.01,
+        max_ms: float = 1000.0,
+        stutter_factor: float = 2.0,
+        stutter_window: int = 30,
+        stutter_min_ms: float = 8.0,
+    ) -> None:
+        if np is None:
+            raise RuntimeError("NumPy est requis pour analyser les frame-times (pip install numpy)")
+        self.chunk_rows = chunk_rows
+        self.resolution_ms = resolution_ms
+        self.max_ms = max_ms
+        self.bins = int(round(max_ms / resolution_ms)) + 1
+        self.stutter_factor = stutter_factor
+        self.stutter_window = stutter_window
+        self.stutter_min_ms = stutter_min_ms
+
+    # ---------- Lecture ----------
+    def iter_chunks(self, path: Path, column: Optional[str] = None) -> Iterator["np.ndarray"]:
+        with open(path, newline="", encoding="utf-8", errors="replace") as handle:
+            reader = csv.reader(line for line in handle if not line.startswith("//"))
+            header = next(reader, None)
+            if header is None:
+                return
+            names = [name.strip() for name in header]
+            index = self._column_index(names, column)
+            while True:
+                rows = list(itertools.islice(reader, self.chunk_rows))
+                if not rows:
+                    break
+                values = [row[index] if len(row) > index else "" for row in rows]
+                try:
+                    chunk = np.array(values, dtype=np.float64)
+                except ValueError:  # cellules vides ou non numériques
+                    chunk = np.array([_to_float(value) for value in values], dtype=np.float64)
+                yield chunk[np.isfinite(chunk) & (chunk > 0)]
+
+    @staticmethod
+    def _column_index(names: Sequence[str], column: Optional[str]) -> int:
+        candidates = (column,) if column else FRAME_TIME_COLUMNS
+        for candidate in candidates:
+            if candidate in names:
+                return names.index(candidate)
+        raise ValueError(f"Colonne de frame-time introuvable (attendu: {', '.join(candidates)})")
+
+    # ---------- Analyse ----------
+    def analyze(self, path: Path, column: Optional[str] = None) -> FrameTimeSummary:
+        return self.analyze_chunks(self.iter_chunks(Path(path), column), source=str(path))
+
+    def analyze_chunks(self, chunks: Iterator["np.ndarray"], *, source: str = "") -> FrameTimeSummary:
+        histogram = np.zeros(self.bins, dtype=np.int64)
+        moments = RunningStats()
+        total_ms = 0.0
+        stutters = 0
+        tail = np.empty(0)
+        for chunk in chunks:
+            if not chunk.size:
+                continue
+            total_ms += float(chunk.sum())
+            mean = float(chunk.mean())
+            moments.merge(chunk.size, mean, float(((chunk - mean) ** 2).sum()), float(chunk.min()), float(chunk.max()))
+            slots = np.minimum((chunk / self.resolution_ms).astype(np.int64), self.bins - 1)
+            histogram += np.bincount(slots, minlength=self.bins)
+            stutters += self._count_stutters(tail, chunk)
+            tail = np.concatenate((tail, chunk))[-self.stutter_window :]
+        summary = FrameTimeSummary(source=source)
+        if not moments.count:
+            return summary
+        p50, p99, p999 = self._percentiles(histogram, moments.count, (0.5, 0.99, 0.999))
+        summary.frames = moments.count
+        summary.duration_s = total_ms / 1000
+        summary.avg_fps = 1000 * moments.count / total_ms
+        summary.low_1pct_fps = 1000 / p99
+        summary.low_01pct_fps = 1000 / p999
+        summary.p50_ms, summary.p99_ms = p50, p99
+        summary.stdev_ms = moments.stdev
+        summary.max_ms = moments.maximum
+        summary.stutters = stutters
+        summary.buckets = self._buckets(histogram)
+        return summary
+
+    def _count_stutters(self, tail: "np.ndarray", chunk: "np.ndarray") -> int:
+        """Compare chaque frame à la moyenne glissante des précédentes, bloc précédent inclus."""
+        window = self.stutter_window
+        series = np.concatenate((tail, chunk))
+        if series.size <= window:
+            return 0
+        cumulative = np.concatenate(([0.0], np.cumsum(series)))
+        trailing = (cumulative[window:-1] - cumulative[: -window - 1]) / window
+        current = series[window:]
+        # Ne compte que les frames du bloc courant (les précédentes l'ont déjà été).
+        fresh = min(chunk.size, current.size)
+        current, trailing = current[-fresh:], trailing[-fresh:]
+        mask = (current > self.stutter_factor * trailing) & (current >= self.stutter_min_ms)
+        return int(mask.sum())
+
+    def _percentiles(self, histogram: "np.ndarray", count: int, quantiles: Sequence[float]) -> List[float]:
+        cumulative = np.cumsum(histogram)
+        ranks = np.ceil(np.asarray(quantiles) * count).clip(1, count)
+        slots = np.searchsorted(cumulative, ranks)
+        return [float((slot + 0.5) * self.resolution_ms) for slot in slots]
+
+    def _buckets(self, histogram: "np.ndarray") -> List[int]:
+        edges = [0] + [int(round(edge / self.resolution_ms)) for edge in REPORT_BUCKETS] + [self.bins]
+        return [int(histogram[lo:hi].sum()) for lo, hi in zip(edges[:-1], edges[1:])]
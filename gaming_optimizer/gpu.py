@@ -4,22 +4,21 @@ Optimisations GPU multi-vendeurs (NVIDIA / AMD / Intel).
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
-
-try:
-    import wmi  # type: ignore
-except ImportError:
-    wmi = None
+from typing import List, Optional
 
+from .telemetry import GPUReading, TelemetrySource, default_source
+from .tracing import traced
 from .utils import run_command
 
 
 class GPUOptimizer:
     """Applique des réglages recommandés selon le GPU détecté."""
 
-    def __init__(self) -> None:
+    def __init__(self, telemetry_source: Optional[TelemetrySource] = None) -> None:
         self.actions: List[str] = []
+        self._telemetry_source = telemetry_source
 
+    @traced(category="gpu")
     def optimize(self) -> str:
         self.actions.clear()
         if self._has_nvidia():
@@ -69,19 +68,13 @@ class GPUOptimizer:
     def _optimize_intel(self) -> None:
         self.actions.append("Intel: activer le mode Performance globale via l'app Arc Control")
 
-    def telemetry(self) -> str:
-        if not wmi:
-            return "WMI indisponible"
-        try:
-            computer = wmi.WMI(namespace="root\\OpenHardwareMonitor")
-            temps = [
-                s.Value
-                for s in computer.Sensor()
-                if s.SensorType == "Temperature" and "GPU" in s.Name
-            ]
-            if temps:
-                return f"{temps[0]}°C"
-        except Exception:
-            return "Lecture capteurs impossible"
-        return "N/A"
+    @property
+    def telemetry_source(self) -> TelemetrySource:
+        # Créée à la première lecture: analyze/optimize n'ouvrent jamais de connexion WMI.
+        if self._telemetry_source is None:
+            self._telemetry_source = default_source()
+        return self._telemetry_source
 
+    @traced(category="gpu")
+    def telemetry(self) -> GPUReading:
+        return self.telemetry_source.read()
@@ -0,0 +1,215 @@
+"""
+Historique réseau append-only: segments JSON Lines avec rotation et petit index par segment.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config import NETWORK_HISTORY_DIR, NETWORK_LOG
+from .utils import load_json, open_append, save_json
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".index.json"
+
+
+def _timestamp(value: Optional[dt.datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+class HistoryStore:
+    """
+    Stocke chaque rapport réseau sur une ligne, sans jamais réécrire l'historique.
+
+    Le segment actif est fermé (et son index écrit) lorsqu'il dépasse `max_segment_bytes`
+    ou `max_segment_age`. Une ligne tronquée par un crash est ignorée à la lecture.
+    """
+
+    def __init__(
+        self,
+        directory: Path = NETWORK_HISTORY_DIR,
+        *,
+        max_segment_bytes: int = 1_000_000,
+        max_segment_age: dt.timedelta = dt.timedelta(days=1),
+        legacy_path: Optional[Path] = NETWORK_LOG,
+    ) -> None:
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.legacy_path = legacy_path
+        self._active: Optional[Path] = None
+        self._active_index: Optional[Dict[str, Any]] = None
+        self._ready = False
+
+    # ---------- Écriture ----------
+    def append(self, report: Dict[str, Any], *, timestamp: Optional[dt.datetime] = None) -> Dict[str, Any]:
+        self._ensure_ready()
+        entry = {"timestamp": (timestamp or dt.datetime.utcnow()).isoformat(), **report}
+        self._write_entries([entry])
+        return entry
+
+    def _write_entries(self, entries: Iterable[Dict[str, Any]]) -> None:
+        current: Optional[Path] = None
+        handle = None
+        try:
+            for entry in entries:
+                path, index = self._active_segment(entry["timestamp"])
+                if path != current:
+                    if handle is not None:
+                        self._close_handle(handle)
+                    handle, current = open_append(path), path
+                line = json.dumps(entry, ensure_ascii=False) + "\n"
+                handle.write(line)
+                index["bytes"] += len(line.encode("utf-8"))
+                self._update_index(index, entry)
+        finally:
+            if handle is not None:
+                self._close_handle(handle)
+
+    @staticmethod
+    def _close_handle(handle) -> None:
+        handle.flush()
+        os.fsync(handle.fileno())
+        handle.close()
+
+    def _should_rotate(self, index: Dict[str, Any], timestamp: str) -> bool:
+        if not index["count"]:
+            return False
+        if index["bytes"] >= self.max_segment_bytes:
+            return True
+        opened = dt.datetime.fromisoformat(index["start"])
+        return dt.datetime.fromisoformat(timestamp) - opened >= self.max_segment_age
+
+    def _active_segment(self, timestamp: str) -> Tuple[Path, Dict[str, Any]]:
+        if self._active is not None and not self._should_rotate(self._active_index, timestamp):
+            return self._active, self._active_index
+        if self._active is not None:
+            self._seal(self._active, self._active_index)
+        segments = self.segments()
+        number = int(segments[-1].name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)]) + 1 if segments else 1
+        self._active = self.directory / f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"
+        self._active_index = self._empty_index()
+        return self._active, self._active_index
+
+    def _seal(self, path: Path, index: Dict[str, Any]) -> None:
+        save_json(self._index_path(path), index)
+        if path == self._active:
+            self._active = self._active_index = None
+
+    # ---------- Index ----------
+    @staticmethod
+    def _empty_index() -> Dict[str, Any]:
+        return {"start": None, "end": None, "count": 0, "bytes": 0, "targets": []}
+
+    @staticmethod
+    def _update_index(index: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        stamp = entry["timestamp"]
+        if index["start"] is None or stamp < index["start"]:
+            index["start"] = stamp
+        if index["end"] is None or stamp > index["end"]:
+            index["end"] = stamp
+        index["count"] += 1
+        known = set(index["targets"])
+        index["targets"].extend(sorted(k for k in entry if k != "timestamp" and k not in known))
+
+    @staticmethod
+    def _index_path(segment: Path) -> Path:
+        return segment.with_name(segment.name[: -len(SEGMENT_SUFFIX)] + INDEX_SUFFIX)
+
+    def _scan_index(self, segment: Path) -> Dict[str, Any]:
+        index = self._empty_index()
+        for entry in self._read_segment(segment):
+            self._update_index(index, entry)
+        index["bytes"] = segment.stat().st_size
+        return index
+
+    def segment_index(self, segment: Path) -> Dict[str, Any]:
+        """Index d'un segment: plage temporelle, nombre d'entrées et cibles présentes."""
+        if segment == self._active and self._active_index is not None:
+            return self._active_index
+        sidecar = self._index_path(segment)
+        if sidecar.exists():
+            return load_json(sidecar)
+        return self._scan_index(segment)
+
+    def segments(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+    # ---------- Lecture ----------
+    def iter_reports(
+        self,
+        start: Optional[dt.datetime] = None,
+        end: Optional[dt.datetime] = None,
+        *,
+        targets: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Parcourt paresseusement les rapports de [start, end], segment par segment."""
+        self._ensure_ready()
+        lower, upper = _timestamp(start), _timestamp(end)
+        wanted = set(targets) if targets is not None else None
+        for segment in self.segments():
+            index = self.segment_index(segment)
+            if not index["count"]:
+                continue
+            if lower is not None and index["end"] < lower:
+                continue
+            if upper is not None and index["start"] > upper:
+                continue
+            if wanted is not None and wanted.isdisjoint(index["targets"]):
+                continue
+            for entry in self._read_segment(segment):
+                stamp = entry.get("timestamp", "")
+                if lower is not None and stamp < lower:
+                    continue
+                if upper is not None and stamp > upper:
+                    continue
+                if wanted is not None and wanted.isdisjoint(entry):
+                    continue
+                yield entry
+
+    @staticmethod
+    def _read_segment(segment: Path) -> Iterator[Dict[str, Any]]:
+        with open(segment, encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # ligne tronquée par une interruption d'écriture
+
+    # ---------- Initialisation / migration ----------
+    def _ensure_ready(self) -> None:
+        if self._ready:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segments = self.segments()
+        if segments and not self._index_path(segments[-1]).exists():
+            # Dernier segment non scellé: on reprend l'écriture dedans.
+            self._active = segments[-1]
+            self._active_index = self._scan_index(segments[-1])
+        self._ready = True
+        self.migrate_legacy()
+
+    def migrate_legacy(self) -> int:
+        """Importe une seule fois l'ancien network_reports.json puis le renomme en .migrated."""
+        legacy = self.legacy_path
+        if legacy is None or not legacy.exists():
+            return 0
+        try:
+            reports = load_json(legacy).get("reports", [])
+        except json.JSONDecodeError:
+            reports = []
+        entries = [r for r in reports if isinstance(r, dict) and "timestamp" in r]
+        entries.sort(key=lambda r: r["timestamp"])
+        if entries:
+            self._write_entries(entries)
+        legacy.replace(legacy.with_name(legacy.name + ".migrated"))
+        return len(entries)
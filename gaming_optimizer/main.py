@@ -3,57 +3,138 @@ Coordination principale de l'outil Gaming Optimizer.
 """
 from __future__ import annotations
 
+import functools
 import statistics
-import time
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from .admin import AdminManager
-from .gpu import GPUOptimizer
-from .monitor import RealTimeMonitor
-from .network import NetworkAnalyzer, NetworkResult
-from .reporter import Reporter
-from .storage import StorageManager
-from .system import SystemOptimizer
+from .config import LATENCY_MODEL_EXPLORE, MONITOR_RECORD_MB, PATH_TRACE_JITTER, PING_TARGETS, WATCHER_INTERVAL
+
+if TYPE_CHECKING:
+    from .affinity import AffinityManager
+    from .gpu import GPUOptimizer
+    from .monitor import RealTimeMonitor
+    from .network import NetworkAnalyzer, NetworkResult
+    from .pathtrace import PathAnalyzer
+    from .reporter import Reporter
+    from .scheduler import Step
+    from .storage import StorageManager
+    from .system import SystemOptimizer
 
 
 class GamingOptimizer:
-    """API de haut niveau consommée par la CLI."""
+    """
+    API de haut niveau consommée par la CLI.
+
+    Les sous-systèmes sont importés et construits au premier accès: une commande ne charge
+    que ce qu'elle utilise (psutil, WMI, lecture de la sauvegarde...).
+    """
+
+    def __init__(self, *, max_workers: int = 4) -> None:
+        self.max_workers = max_workers
+        self._live: Optional[RealTimeMonitor] = None
+
+    @functools.cached_property
+    def storage(self) -> StorageManager:
+        from .storage import StorageManager
+
+        return StorageManager()
+
+    @functools.cached_property
+    def network(self) -> NetworkAnalyzer:
+        from .network import NetworkAnalyzer
+
+        return NetworkAnalyzer(storage=self.storage)
+
+    @functools.cached_property
+    def paths(self) -> PathAnalyzer:
+        from .pathtrace import PathAnalyzer
+
+        return PathAnalyzer(backend=self.network.backend)
+
+    @functools.cached_property
+    def system(self) -> SystemOptimizer:
+        from .system import SystemOptimizer
 
-    def __init__(self) -> None:
-        self.storage = StorageManager()
-        self.network = NetworkAnalyzer(storage=self.storage)
-        self.system = SystemOptimizer(storage=self.storage)
-        self.gpu = GPUOptimizer()
-        self.reporter = Reporter()
+        return SystemOptimizer(storage=self.storage)
+
+    @functools.cached_property
+    def gpu(self) -> GPUOptimizer:
+        from .gpu import GPUOptimizer
+
+        return GPUOptimizer()
+
+    @functools.cached_property
+    def affinity(self) -> AffinityManager:
+        from .affinity import AffinityManager
+
+        return AffinityManager(storage=self.storage)
+
+    @functools.cached_property
+    def reporter(self) -> Reporter:
+        from .reporter import Reporter
+
+        return Reporter()
 
     # ---------- Helpers ----------
-    def _synthetic_benchmark(self, iterations: int = 2_000_000) -> float:
-        """Retourne une estimation d'un score FPS relatif."""
-        start = time.perf_counter()
-        acc = 0
-        for i in range(iterations):
-            acc += (i * 3) % 7
-        duration = time.perf_counter() - start
-        # Valeur arbitraire convertie en pseudo FPS
-        fps_estimate = (iterations / duration) / 50_000
-        return round(fps_estimate, 2)
-
-    def collect_performance_metrics(self, network_results: Optional[Dict[str, NetworkResult]] = None) -> Dict[str, float]:
-        fps_score = self._synthetic_benchmark()
+    def collect_performance_metrics(
+        self,
+        network_results: Optional[Dict[str, NetworkResult]] = None,
+        frametime_log: Optional[Path] = None,
+    ) -> Dict[str, Any]:
+        from .benchmark import BenchmarkSuite
+
+        benchmarks = BenchmarkSuite().run()
         if network_results:
             valid_latencies = [res.average for res in network_results.values() if res.has_data]
             latency = statistics.mean(valid_latencies) if valid_latencies else 0.0
         else:
             latency = 0.0
-        return {"fps": fps_score, "latency": latency}
+        metrics: Dict[str, Any] = {
+            "latency": latency,
+            # Distributions conservées pour la comparaison statistique avant/après (compare.py).
+            "latency_samples": {
+                name: [round(value, 3) for value in res.samples] for name, res in (network_results or {}).items()
+            },
+            "benchmarks": {name: result.as_dict() for name, result in benchmarks.items()},
+        }
+        if frametime_log:
+            from .frametime import FrameTimeAnalyzer
+
+            try:
+                metrics["frametimes"] = FrameTimeAnalyzer().analyze(Path(frametime_log)).as_dict()
+            except (RuntimeError, OSError, ValueError) as exc:
+                metrics["frametimes_error"] = str(exc)
+        return metrics
+
+    def _optimize_steps(self) -> List[Step]:
+        """Étapes d'optimize; le re-test réseau attend toutes les autres (notamment le DNS)."""
+        from .scheduler import Step
+
+        steps = [
+            # netsh et DNS touchent tous deux la pile réseau: jamais en même temps.
+            Step("optimize_tcp", self.system.optimize_tcp, conflicts_with=("optimize_dns",)),
+            Step("optimize_power_plan", self.system.optimize_power_plan),
+            Step("disable_background_services", self.system.disable_background_services),
+            Step("optimize_dns", self.system.optimize_dns),
+            Step("optimize_windows_gaming", self.system.optimize_windows_gaming),
+            Step("prioritize_game_processes", self.system.prioritize_game_processes),
+            Step("cpu_affinity", self.affinity.apply),
+            Step("gpu", self.gpu.optimize),
+        ]
+        retest = functools.partial(self.network.run_tests, keep_samples=True)  # distributions pour compare.py
+        steps.append(Step("network_retest", retest, depends_on=tuple(s.name for s in steps)))
+        return steps
 
     # ---------- Commandes ----------
-    def analyze(self) -> None:
+    def analyze(self, *, frametime_log: Optional[Path] = None) -> None:
         AdminManager.ensure_admin()
-        results = self.network.run_tests()
-        perf = self.collect_performance_metrics(results)
-        self.storage.snapshot("analysis_last", {"network": {k: v.as_dict() for k, v in results.items()}, "perf": perf})
-        self.storage.snapshot("performance_before", perf)
+        results = self.network.run_tests(keep_samples=True)  # distributions pour compare.py
+        perf = self.collect_performance_metrics(results, frametime_log)
+        with self.storage.batch():
+            self.storage.snapshot("analysis_last", {"network": {k: v.as_dict() for k, v in results.items()}, "perf": perf})
+            self.storage.snapshot("performance_before", perf)
         report_text = "\n\n".join(
             [
                 self.reporter.build_network_section(results),
@@ -64,32 +145,45 @@ class GamingOptimizer:
         print(report_text)
         print(f"\nRapport sauvegardé: {path}")
 
-    def optimize(self, *, force: bool = False) -> None:
+    def optimize(self, *, force: bool = False, plan_only: bool = False, frametime_log: Optional[Path] = None) -> None:
         AdminManager.ensure_admin()
-        if not force:
-            confirmation = input("Appliquer les optimisations système ? (o/N) ").strip().lower()
-            if confirmation not in {"o", "oui", "y", "yes"}:
-                print("Optimisation annulée.")
+        try:
+            plan = self.system.probe_state()
+        except Exception as exc:  # lecture groupée impossible: tout sera réappliqué
+            self.system.clear_plan()
+            print(f"Lecture groupée de l'état système impossible ({exc}).")
+            if plan_only:
                 return
-        actions: List[str] = []
-        for func in [
-            self.system.optimize_tcp,
-            self.system.optimize_power_plan,
-            self.system.disable_background_services,
-            self.system.optimize_dns,
-            self.system.optimize_windows_gaming,
-            self.system.prioritize_game_processes,
-        ]:
-            try:
-                actions.append(func())
-            except Exception as exc:  # capture pour continuer les autres étapes
-                actions.append(f"{func.__name__}: échec ({exc})")
-        gpu_message = self.gpu.optimize()
-        actions.append(gpu_message)
-        results = self.network.run_tests()
-        before = self.storage.get_snapshot("performance_before")
-        after = self.collect_performance_metrics(results)
-        self.storage.snapshot("performance_after", after)
+            print("Toutes les optimisations seront réappliquées.")
+        else:
+            print(plan.format())
+            if plan_only:
+                self.system.clear_plan()
+                return
+        try:
+            if not force:
+                confirmation = input("Appliquer les optimisations système ? (o/N) ").strip().lower()
+                if confirmation not in {"o", "oui", "y", "yes"}:
+                    print("Optimisation annulée.")
+                    return
+            self._apply_optimizations(frametime_log)
+        finally:
+            self.system.clear_plan()
+
+    def _apply_optimizations(self, frametime_log: Optional[Path] = None) -> None:
+        from .scheduler import StepScheduler
+
+        # Un seul flush durable du journal pour tous les snapshots de la passe.
+        with self.storage.batch():
+            outcomes = StepScheduler(self._optimize_steps(), max_workers=self.max_workers).run()
+            network_step = outcomes.pop()
+            results = network_step.value if network_step.ok else {}
+            actions: List[str] = [f"{outcome.message} ({outcome.duration:.1f}s)" for outcome in outcomes]
+            if not network_step.ok:
+                actions.append(network_step.message)
+            before = self.storage.get_snapshot("performance_before")
+            after = self.collect_performance_metrics(results, frametime_log)
+            self.storage.snapshot("performance_after", after)
         report_text = "\n\n".join(
             [
                 self.reporter.build_system_section(actions),
@@ -101,23 +195,124 @@ class GamingOptimizer:
         print(report_text)
         print(f"\nRapport sauvegardé: {path}")
 
-    def network_test(self) -> None:
+    def network_test(
+        self, *, top_k: Optional[int] = None, explore: int = LATENCY_MODEL_EXPLORE, adaptive: bool = False
+    ) -> None:
+        """
+        Avec `top_k`, le catalogue de serveurs est filtré par le modèle de latence historique;
+        avec `adaptive`, chaque cible reçoit juste assez de sondes (StoppingRule).
+        """
+        from .network import StoppingRule
+        from .selection import load_catalog
+
         AdminManager.ensure_admin()
-        results = self.network.run_tests(attempts=10)
+        catalog = load_catalog()
+        targets = {name: entry.host for name, entry in catalog.items()}
+        results = self.network.run_tests(
+            attempts=10,
+            targets=targets,
+            top_k=top_k,
+            explore=explore,
+            stopping=StoppingRule() if adaptive else None,
+        )
+        if top_k is not None:
+            print(f"Sélection: {len(results)}/{len(targets)} serveurs sondés (top {top_k} + exploration).")
+        if adaptive:
+            sent = ", ".join(f"{name} {res.attempts}" for name, res in results.items())
+            print(f"Sondes adaptatives envoyées: {sent}.")
         print(self.reporter.build_network_section(results))
+        print()
+        print(self.reporter.build_ranking_section(self.network.model.rank_regions(catalog)))
+        # Pertes ou jitter: localiser le saut responsable (LAN, FAI ou hébergeur du jeu).
+        degraded = {
+            name: res.host
+            for name, res in results.items()
+            if res.has_data and (res.packet_loss > 0 or res.jitter >= PATH_TRACE_JITTER)
+        }
+        if degraded:
+            print()
+            print(self.reporter.build_path_section(self.paths.run(degraded)))
+
+    def trace(self, targets: Optional[List[str]] = None) -> None:
+        """Analyse de chemin vers des cibles de PING_TARGETS (par nom) ou des hôtes quelconques."""
+        AdminManager.ensure_admin()
+        selected = {target: PING_TARGETS.get(target, target) for target in targets} if targets else dict(PING_TARGETS)
+        print(self.reporter.build_path_section(self.paths.run(selected)))
 
     def restore(self) -> None:
+        from .affinity import AffinityManager
+        from .watcher import GameProcessWatcher
+
         AdminManager.ensure_admin()
         messages = [
             self.system.restore_power_plan(),
             self.system.restore_tcp(),
             self.system.restore_windows_gaming(),
+            GameProcessWatcher.restore(self.storage),
+            AffinityManager.restore(self.storage),
         ]
         print("[RESTAURATION]")
         for message in messages:
             print(f" - {message}")
 
-    def monitor(self, interval: float = 2.0) -> None:
+    def monitor(
+        self,
+        interval: float = 2.0,
+        *,
+        record: Optional[Path] = None,
+        record_mb: float = MONITOR_RECORD_MB,
+        replay: Optional[Path] = None,
+        last: Optional[float] = None,
+        serve: Optional[int] = None,
+    ) -> None:
+        from .monitor import RealTimeMonitor
+
+        if replay is not None:
+            RealTimeMonitor(self.gpu).replay(replay, interval=interval, last=last)
+            return
+        AdminManager.ensure_admin()
+        RealTimeMonitor(self.gpu).run(interval=interval, record=record, record_mb=record_mb, serve=serve)
+
+    def monitor_snapshot(self, *, keep_running: bool = False, wait: float = 1.5) -> Dict[str, Any]:
+        """
+        Affiche une ligne de mesures et renvoie les valeurs. Avec `keep_running` (agent), les
+        capteurs restent actifs: les appels suivants lisent directement les dernières valeurs.
+        """
+        from .monitor import RealTimeMonitor
+
         AdminManager.ensure_admin()
-        RealTimeMonitor(self.gpu).run(interval=interval)
+        if self._live is None:
+            self._live = RealTimeMonitor(self.gpu)
+        pipeline = self._live.pipeline
+        if not pipeline.running:
+            pipeline.start()
+        try:
+            pipeline.wait_ready(wait)
+            latest = pipeline.latest()
+            print(self._live.format_line(latest))
+        finally:
+            if not keep_running:
+                self.stop_live_monitor()
+        return {
+            name: reading.value if isinstance(reading.value, (int, float, list)) else str(reading.value)
+            for name, reading in latest.items()
+            if reading.error is None and reading.value is not None
+        }
+
+    def stop_live_monitor(self) -> None:
+        if self._live is not None and self._live.pipeline.running:
+            self._live.pipeline.stop()
+
+    def watch(self, interval: float = WATCHER_INTERVAL, duration: Optional[float] = None) -> None:
+        from .watcher import GameProcessWatcher
 
+        AdminManager.ensure_admin()
+        watcher = GameProcessWatcher(
+            self.storage, interval=interval, on_boost=lambda pid, name: print(f" + {name} (PID {pid}): priorité élevée")
+        )
+        print("[SURVEILLANCE DES JEUX] Ctrl+C pour quitter.")
+        try:
+            watcher.run(duration=duration)
+        except KeyboardInterrupt:
+            print("\nSurveillance interrompue.")
+        print(watcher.summary())
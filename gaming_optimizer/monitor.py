@@ -3,34 +3,142 @@ Monitoring temps réel: ping + ressources système.
 """
 from __future__ import annotations
 
+import datetime as dt
+import math
 import time
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 import psutil
-from ping3 import ping
 
+from .config import MONITOR_PING_HOST, MONITOR_RATES, MONITOR_RECORD_HZ, MONITOR_RECORD_MB
 from .gpu import GPUOptimizer
+from .probes import BlockingProber
+from .recorder import RingReader, RingRecorder
+from .sampling import Reading, SamplingPipeline, Sensor, next_deadline
 
 
 class RealTimeMonitor:
-    """Affiche en continu les métriques principales."""
+    """
+    Affiche en continu les métriques principales.
 
-    def __init__(self, gpu: Optional[GPUOptimizer] = None) -> None:
+    Chaque capteur est échantillonné à sa propre cadence (`MONITOR_RATES`) dans son thread;
+    l'affichage se contente de relire la dernière valeur de chacun.
+    """
+
+    def __init__(
+        self,
+        gpu: Optional[GPUOptimizer] = None,
+        *,
+        host: str = MONITOR_PING_HOST,
+        rates: Optional[Dict[str, float]] = None,
+    ) -> None:
         self.gpu = gpu or GPUOptimizer()
+        self.host = host
+        self.rates = {**MONITOR_RATES, **(rates or {})}
+        self.pipeline = SamplingPipeline(self.sensors())
+
+    def sensors(self) -> List[Sensor]:
+        # Timeout du ping sous sa période: un echo perdu ne fait jamais sauter de tick.
+        ping_timeout = min(1.0, 0.8 / self.rates["ping"]) if self.rates.get("ping") else 1.0
+        # Une boucle et des sockets pour toute la vie du thread du capteur, pas un par tick.
+        prober = BlockingProber()
+        readers = {
+            "cpu": lambda: psutil.cpu_percent(interval=None),
+            "cores": lambda: psutil.cpu_percent(interval=None, percpu=True),
+            "ram": lambda: psutil.virtual_memory().percent,
+            "ping": lambda: prober.probe(self.host, ping_timeout),
+            "gpu": self.gpu.telemetry,
+        }
+        closers = {"ping": prober.close}
+        return [
+            Sensor(name, read, self.rates[name], close=closers.get(name))
+            for name, read in readers.items()
+            if self.rates.get(name)
+        ]
+
+    @staticmethod
+    def format_values(host: str, values: Dict[str, Any]) -> str:
+        """Ligne d'affichage; une valeur None signifie mesure absente (timeout pour le ping)."""
+
+        def show(name: str, fmt: str) -> str:
+            value = values.get(name)
+            if value is None:
+                return "timeout" if name == "ping" and name in values else "--"
+            return format(value, fmt)
 
-    def run(self, interval: float = 2.0) -> None:
+        return (
+            f"Ping {host}: {show('ping', '.1f')} ms | "
+            f"CPU: {show('cpu', '.1f')}% | RAM: {show('ram', '.1f')}% | GPU: {show('gpu', '')}"
+        )
+
+    def format_line(self, latest: Dict[str, Reading]) -> str:
+        values = {name: reading.value for name, reading in latest.items() if reading.error is None}
+        return self.format_values(self.host, values)
+
+    def run(
+        self,
+        interval: float = 2.0,
+        *,
+        record: Optional[Path] = None,
+        record_mb: float = MONITOR_RECORD_MB,
+        record_hz: float = MONITOR_RECORD_HZ,
+        serve: Optional[int] = None,
+    ) -> None:
+        """`serve`: port local de l'export OpenMetrics (GET /metrics), alimenté par les capteurs."""
         print("[MONITORING TEMPS RÉEL] Ctrl+C pour quitter.")
+        recorder = RingRecorder(record, cores=psutil.cpu_count() or 1, size_mb=record_mb) if record else None
+        server = None
+        if serve is not None:
+            from .exporter import MetricsServer, MonitorMetrics
+
+            server = MetricsServer(MonitorMetrics(self.pipeline, self.host), serve).start()
+            print(f"Export OpenMetrics: {server.url}")
+        # Avec enregistrement, la boucle tourne à la cadence d'écriture et n'affiche qu'une fois par intervalle.
+        tick = min(interval, 1.0 / record_hz) if recorder else interval
         try:
-            while True:
-                latency = ping("1.1.1.1", unit="ms", timeout=1.0)
-                cpu = psutil.cpu_percent()
-                mem = psutil.virtual_memory().percent
-                gpu_temp = self.gpu.telemetry()
-                print(
-                    f"Ping 1.1.1.1: {latency if latency else 'timeout'} ms | "
-                    f"CPU: {cpu:.1f}% | RAM: {mem:.1f}% | GPU: {gpu_temp}"
-                )
-                time.sleep(interval)
+            with self.pipeline:
+                origin = time.monotonic()
+                deadline = origin
+                next_print = origin + interval
+                while True:
+                    deadline = next_deadline(origin, tick, max(time.monotonic(), deadline))
+                    time.sleep(max(deadline - time.monotonic(), 0.0))
+                    latest = self.pipeline.latest()
+                    if recorder:
+                        values = {name: r.value for name, r in latest.items() if r.error is None}
+                        values["gpu"] = getattr(values.get("gpu"), "temp", None)
+                        recorder.append(time.time(), values, values.get("cores") or ())
+                    if deadline >= next_print:
+                        print(self.format_line(latest))
+                        next_print = next_deadline(origin, interval, deadline)
         except KeyboardInterrupt:
             print("\nMonitoring interrompu.")
+        finally:
+            if server:
+                server.close()
+            if recorder:
+                recorder.close()
+                print(f"Enregistrement: {recorder.path} ({min(recorder.written, recorder.capacity)} échantillons)")
 
+    def replay(self, path: Path, *, interval: float = 2.0, last: Optional[float] = None) -> None:
+        """Réaffiche un enregistrement (une ligne par intervalle) puis son résumé."""
+        reader = RingReader(path)
+        data = reader.records()
+        if last is not None and data.size:
+            data = data[data["ts"] >= data["ts"][-1] - last]
+        print(f"[RELECTURE] {path}")
+        shown = -math.inf
+        for row in data:
+            if row["ts"] - shown < interval:
+                continue
+            shown = row["ts"]
+            values = {name: None if math.isnan(row[name]) else float(row[name]) for name in ("ping", "cpu", "ram")}
+            gpu = float(row["gpu"])
+            values["gpu"] = None if math.isnan(gpu) else f"{gpu:g}°C"
+            stamp = dt.datetime.fromtimestamp(float(row["ts"])).strftime("%H:%M:%S")
+            print(f"{stamp} {self.format_values(self.host, values)}")
+        summary = reader.summary(data)
+        print("Résumé: " + ", ".join(
+            f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}" for key, value in summary.items()
+        ))
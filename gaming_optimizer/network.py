@@ -3,46 +3,82 @@ Analyse réseau: ping, jitter, pertes, stabilité.
 """
 from __future__ import annotations
 
-import re
-import statistics
-import time
+import asyncio
+import math
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Sequence
 
-from ping3 import ping
-
-from .config import PING_TARGETS, PING_THRESHOLD
+from .config import (
+    LATENCY_MODEL_EXPLORE,
+    PING_TARGETS,
+    PING_THRESHOLD,
+    PROBE_DEAD_AFTER,
+    PROBE_LATENCY_TOLERANCE,
+    PROBE_LOSS_TOLERANCE,
+    PROBE_MAX_ATTEMPTS,
+    PROBE_MIN_ATTEMPTS,
+)
+from .probes import ProbeBackend, ProtocolRouter, parse_target
+from .selection import LatencyModel
+from .stats import LatencyAccumulator, t_critical, wilson_interval
 from .storage import StorageManager
-from .utils import run_command
+from .tracing import span
 
 
 @dataclass
 class NetworkResult:
     name: str
     host: str
-    samples: List[float] = field(default_factory=list)
     packet_loss: float = 0.0
-    jitter: float = 0.0
     attempts: int = 0
     timeouts: int = 0
+    keep_samples: bool = False
+    latency: LatencyAccumulator = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.latency = LatencyAccumulator(keep_samples=self.keep_samples)
+
+    def add_sample(self, value: float) -> None:
+        self.latency.add(value)
+
+    @property
+    def samples(self) -> Sequence[float]:
+        return self.latency.samples if self.latency.samples is not None else ()
 
     @property
     def average(self) -> float:
-        return statistics.mean(self.samples) if self.samples else float("inf")
+        return self.latency.stats.mean if self.latency.count else float("inf")
 
     @property
     def has_data(self) -> bool:
-        return bool(self.samples)
+        return self.latency.count > 0
+
+    @property
+    def jitter(self) -> float:
+        return round(self.latency.stats.stdev, 2) if self.latency.count > 1 else 0.0
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.latency.quantile(0.5)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.latency.quantile(0.95)
+
+    @property
+    def p99(self) -> Optional[float]:
+        return self.latency.quantile(0.99)
 
     @property
     def stability_score(self) -> int:
-        if self.average <= 30 and self.packet_loss < 0.5 and self.jitter < 3:
+        average, jitter = self.average, self.jitter
+        if average <= 30 and self.packet_loss < 0.5 and jitter < 3:
             return 5
-        if self.average <= 45 and self.packet_loss < 1.0 and self.jitter < 6:
+        if average <= 45 and self.packet_loss < 1.0 and jitter < 6:
             return 4
-        if self.average <= 60 and self.packet_loss < 2.0:
+        if average <= 60 and self.packet_loss < 2.0:
             return 3
-        if self.average <= 90:
+        if average <= 90:
             return 2
         return 1
 
@@ -54,16 +90,56 @@ class NetworkResult:
     def jitter_display(self) -> str:
         return f"{self.jitter:.1f} ms" if self.has_data else "n/a"
 
+    @property
+    def p95_display(self) -> str:
+        return f"{self.p95:.1f} ms" if self.has_data else "n/a"
+
     def as_dict(self) -> Dict[str, float]:
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 2) if value is not None else None
+
         return {
             "host": self.host,
             "avg": round(self.average, 2) if self.has_data else None,
+            "p50": rounded(self.p50),
+            "p95": rounded(self.p95),
+            "p99": rounded(self.p99),
             "loss": self.packet_loss,
             "jitter": self.jitter,
             "stability": self.stability_score,
         }
 
 
+@dataclass(frozen=True)
+class StoppingRule:
+    """
+    Arrêt anticipé d'une série de sondes.
+
+    La série s'arrête quand la demi-largeur de l'IC à 95 % de la latence moyenne (Student)
+    et celle de l'intervalle de Wilson des pertes passent sous leurs tolérances, ou au bout
+    de `max_attempts`. Une cible qui n'a jamais répondu est abandonnée après `dead_after` timeouts.
+    """
+
+    latency_tolerance: float = PROBE_LATENCY_TOLERANCE
+    loss_tolerance: float = PROBE_LOSS_TOLERANCE
+    min_attempts: int = PROBE_MIN_ATTEMPTS
+    max_attempts: int = PROBE_MAX_ATTEMPTS
+    dead_after: int = PROBE_DEAD_AFTER
+
+    def should_stop(self, sent: int, dropped: int, latency: LatencyAccumulator) -> bool:
+        if sent >= self.max_attempts:
+            return True
+        if latency.count == 0:
+            return dropped >= self.dead_after
+        if sent < self.min_attempts or latency.count < 2:
+            return False
+        low, high = wilson_interval(dropped, sent)
+        if (high - low) / 2 > self.loss_tolerance:
+            return False
+        half_width = t_critical(latency.count - 1) * math.sqrt(latency.stats.sample_variance / latency.count)
+        return half_width <= self.latency_tolerance
+
+
 class NetworkAnalyzer:
     """Effectue les tests de latence et produit un rapport."""
 
@@ -71,56 +147,125 @@ class NetworkAnalyzer:
         self,
         targets: Dict[str, str] | None = None,
         storage: StorageManager | None = None,
+        backend: ProbeBackend | None = None,
+        keep_samples: bool = False,
+        model: LatencyModel | None = None,
     ) -> None:
         self.targets = targets or PING_TARGETS
         self.storage = storage or StorageManager()
+        self.backend = backend or ProtocolRouter()
+        self.keep_samples = keep_samples
+        self.model = model or LatencyModel()
+
+    def run_tests(
+        self,
+        *,
+        attempts: int = 5,
+        delay: float = 0.2,
+        timeout: float = 1.0,
+        targets: Dict[str, str] | None = None,
+        top_k: Optional[int] = None,
+        explore: int = LATENCY_MODEL_EXPLORE,
+        stopping: StoppingRule | None = None,
+        keep_samples: Optional[bool] = None,
+    ) -> Dict[str, NetworkResult]:
+        """
+        `keep_samples` (défaut: celui de l'analyseur) conserve les latences brutes, nécessaires
+        seulement à la comparaison avant/après; sinon la mémoire par cible reste bornée.
 
-    def run_tests(self, *, attempts: int = 5, delay: float = 0.2, timeout: float = 1.0) -> Dict[str, NetworkResult]:
-        results: Dict[str, NetworkResult] = {}
-        for name, host in self.targets.items():
-            outcome = NetworkResult(name=name, host=host, attempts=attempts)
-            dropped = 0
-            for _ in range(attempts):
-                latency = self._ping_host(host, timeout)
-                if latency is None:
-                    dropped += 1
-                else:
-                    outcome.samples.append(latency)
-                time.sleep(delay)
-            outcome.packet_loss = round((dropped / attempts) * 100, 2)
-            outcome.timeouts = dropped
-            outcome.jitter = round(statistics.pstdev(outcome.samples) if len(outcome.samples) > 1 else 0.0, 2)
-            results[name] = outcome
+        Avec `top_k`, seules les `top_k` meilleures cibles selon le modèle historique sont
+        sondées, plus `explore` cibles jamais ou anciennement mesurées. Avec `stopping`, le
+        nombre de sondes par cible est adaptatif et `attempts` est ignoré.
+        """
+        targets = targets or self.targets
+        for host in targets.values():
+            parse_target(host)  # entrée de PING_TARGETS invalide: erreur avant toute sonde
+        if top_k is not None:
+            targets = {name: targets[name] for name in self.model.select(list(targets), top_k, explore)}
+        results = asyncio.run(
+            self._run_tests_async(
+                targets,
+                attempts=attempts,
+                delay=delay,
+                timeout=timeout,
+                stopping=stopping,
+                keep_samples=self.keep_samples if keep_samples is None else keep_samples,
+            )
+        )
         self.storage.append_network_report({k: v.as_dict() for k, v in results.items()})
+        for name, res in results.items():
+            self.model.observe(name, res.average if res.has_data else None, res.packet_loss / 100)
+        self.model.save()
         return results
 
-    def _ping_host(self, host: str, timeout: float) -> Optional[float]:
-        latency = ping(host, unit="ms", timeout=timeout)
-        if latency is not None:
-            return latency
-        return self._ping_via_system(host, timeout)
-
-    @staticmethod
-    def _ping_via_system(host: str, timeout: float) -> Optional[float]:
-        timeout_ms = max(int(timeout * 1000), 100)
-        proc = run_command(["ping", "-n", "1", "-w", str(timeout_ms), host], check=False)
-        if proc.returncode != 0:
-            return None
-        match = re.search(r"time[=<]\s*(\d+)\s*ms", proc.stdout)
-        if match:
-            return float(match.group(1))
-        return None
+    async def _run_tests_async(
+        self,
+        targets: Dict[str, str],
+        *,
+        attempts: int,
+        delay: float,
+        timeout: float,
+        stopping: StoppingRule | None = None,
+        keep_samples: bool = False,
+    ) -> Dict[str, NetworkResult]:
+        """Sonde toutes les cibles en parallèle: durée ≈ calendrier de la cible la plus lente."""
+        async with self.backend:
+            outcomes = await asyncio.gather(
+                *(
+                    self._probe_target(
+                        name,
+                        host,
+                        attempts=attempts,
+                        delay=delay,
+                        timeout=timeout,
+                        stopping=stopping,
+                        keep_samples=keep_samples,
+                    )
+                    for name, host in targets.items()
+                )
+            )
+        return {outcome.name: outcome for outcome in outcomes}
+
+    async def _probe_target(
+        self,
+        name: str,
+        host: str,
+        *,
+        attempts: int,
+        delay: float,
+        timeout: float,
+        stopping: StoppingRule | None = None,
+        keep_samples: bool = False,
+    ) -> NetworkResult:
+        outcome = NetworkResult(name=name, host=host, keep_samples=keep_samples)
+        limit = stopping.max_attempts if stopping else attempts
+        sent = dropped = 0
+        while sent < limit:
+            with span("probe", "network", target=name, host=host):
+                latency = await self.backend.probe(host, timeout)
+            sent += 1
+            if latency is None:
+                dropped += 1
+            else:
+                outcome.add_sample(latency)
+            if sent >= limit or (stopping and stopping.should_stop(sent, dropped, outcome.latency)):
+                break
+            await self.backend.sleep(delay)
+        outcome.attempts = sent
+        outcome.packet_loss = round((dropped / sent) * 100, 2) if sent else 0.0
+        outcome.timeouts = dropped
+        return outcome
 
     def format_report(self, results: Dict[str, NetworkResult]) -> str:
         lines = ["[ANALYSE RÉSEAU]"]
         for name, data in results.items():
             lines.append(
-                f"{name:<20} Ping moyen: {data.latency_display} | "
+                f"{name:<20} Ping moyen: {data.latency_display} (p95 {data.p95_display}) | "
                 f"Pertes: {data.packet_loss:.1f}% | Jitter: {data.jitter_display} | "
                 f"Stabilité: {'★'*data.stability_score}{'☆'*(5-data.stability_score)}"
             )
             if not data.has_data:
-                lines.append(" " * 6 + "⚠ Serveur injoignable (timeout ICMP).")
+                lines.append(" " * 6 + f"⚠ Serveur injoignable (timeout {parse_target(data.host).scheme.upper()}).")
             elif data.average > PING_THRESHOLD:
                 lines.append(" " * 6 + "⚠ Latence élevée détectée, vérifiez votre connexion.")
         return "\n".join(lines)
@@ -0,0 +1,123 @@
+"""
+Analyse de chemin façon MTR: découverte des sauts par TTL puis sondes parallèles par rounds.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .config import PATH_LOSS_TOLERANCE, PING_TARGETS
+from .network import NetworkResult
+from .probes import HopReply, ProbeBackend, ProtocolRouter
+
+SILENT_HOP = "*"
+
+
+@dataclass
+class PathReport:
+    """Sauts vers une cible; un saut muet a pour hôte `*` et aucune tentative."""
+
+    name: str
+    host: str
+    hops: List[NetworkResult] = field(default_factory=list)
+    reached: bool = False
+
+    @property
+    def loss_origin(self) -> Optional[int]:
+        """
+        Index du premier saut à partir duquel la perte persiste jusqu'à la destination.
+
+        Une perte isolée sur un routeur intermédiaire (réponses ICMP limitées) sans perte
+        à la destination n'est pas une perte du chemin: None dans ce cas. En remontant, un
+        saut n'est retenu que si sa perte atteint celle du saut suivant (à PATH_LOSS_TOLERANCE
+        près): une perte réelle se propage en aval, une limitation ICMP moindre non.
+        """
+        probed = [index for index, hop in enumerate(self.hops) if hop.attempts]
+        if not self.reached or not probed or self.hops[probed[-1]].packet_loss <= 0:
+            return None
+        origin = probed[-1]
+        for index in reversed(probed[:-1]):
+            loss = self.hops[index].packet_loss
+            if loss <= 0 or loss < self.hops[origin].packet_loss - PATH_LOSS_TOLERANCE:
+                break
+            origin = index
+        return origin
+
+
+class PathAnalyzer:
+    """
+    Découvre les sauts avec des sondes à TTL 1..max_hops envoyées en même temps, puis sonde
+    tous les sauts en parallèle à chaque round (même backend que NetworkAnalyzer).
+    """
+
+    def __init__(
+        self,
+        backend: Optional[ProbeBackend] = None,
+        *,
+        max_hops: int = 30,
+        rounds: int = 10,
+        interval: float = 0.5,
+        timeout: float = 1.0,
+        discovery_attempts: int = 3,
+    ) -> None:
+        self.backend = backend or ProtocolRouter()
+        self.max_hops = max_hops
+        self.rounds = rounds
+        self.interval = interval
+        self.timeout = timeout
+        self.discovery_attempts = discovery_attempts
+
+    def run(self, targets: Optional[Dict[str, str]] = None) -> Dict[str, PathReport]:
+        return asyncio.run(self._run_async(targets or PING_TARGETS))
+
+    async def _run_async(self, targets: Dict[str, str]) -> Dict[str, PathReport]:
+        async with self.backend:
+            reports = await asyncio.gather(*(self.trace(name, host) for name, host in targets.items()))
+        return {report.name: report for report in reports}
+
+    async def discover(self, host: str) -> Tuple[List[Optional[str]], bool]:
+        """(adresse de chaque saut, None si muet ; destination atteinte)."""
+        replies: List[Optional[HopReply]] = [None] * self.max_hops
+        for _ in range(self.discovery_attempts):
+            last = self._destination(replies)
+            horizon = last + 1 if last is not None else self.max_hops
+            missing = [ttl for ttl in range(1, horizon + 1) if replies[ttl - 1] is None]
+            if not missing:
+                break
+            found = await asyncio.gather(*(self.backend.probe_ttl(host, ttl, self.timeout) for ttl in missing))
+            for ttl, reply in zip(missing, found):
+                replies[ttl - 1] = reply
+        last = self._destination(replies)
+        if last is None:
+            # Destination muette: garder jusqu'au dernier routeur ayant répondu.
+            answered = [index for index, reply in enumerate(replies) if reply is not None]
+            last = answered[-1] if answered else -1
+        addresses = [reply.address if reply else None for reply in replies[: last + 1]]
+        return addresses, self._destination(replies) is not None
+
+    @staticmethod
+    def _destination(replies: List[Optional[HopReply]]) -> Optional[int]:
+        return next((index for index, reply in enumerate(replies) if reply is not None and reply.reached), None)
+
+    async def trace(self, name: str, host: str) -> PathReport:
+        addresses, reached = await self.discover(host)
+        report = PathReport(name=name, host=host, reached=reached)
+        for ttl, address in enumerate(addresses, start=1):
+            report.hops.append(NetworkResult(name=f"{ttl:>2}. {address or SILENT_HOP}", host=address or SILENT_HOP))
+        probed = [hop for hop in report.hops if hop.host != SILENT_HOP]
+        dropped = [0] * len(probed)
+        for index in range(self.rounds):
+            latencies = await asyncio.gather(*(self.backend.probe(hop.host, self.timeout) for hop in probed))
+            for position, (hop, latency) in enumerate(zip(probed, latencies)):
+                if latency is None:
+                    dropped[position] += 1
+                else:
+                    hop.add_sample(latency)
+            if index < self.rounds - 1:
+                await self.backend.sleep(self.interval)
+        for hop, lost in zip(probed, dropped):
+            hop.attempts = self.rounds
+            hop.timeouts = lost
+            hop.packet_loss = round(lost / self.rounds * 100, 2) if self.rounds else 0.0
+        return report
@@ -0,0 +1,185 @@
+"""
+Mode plan: lecture groupée de l'état système et diff avec le profil cible d'optimize.
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .config import BACKGROUND_SERVICES, DNS_SERVERS, HIGH_PERFORMANCE_SCHEME, SERVICE_STARTUP_TYPE, TCP_GLOBALS
+from .utils import powershell
+
+# Valeurs écrites par SystemOptimizer.toggle_windows_game_features(True)
+GAME_FEATURE_TARGETS = {"AllowAutoGameMode": 1, "GameDVR_Enabled": 1}
+
+# Libellés netsh (anglais/français) -> paramètre `netsh int tcp set global`
+_TCP_LABELS: Sequence[Tuple[str, Tuple[str, ...]]] = (
+    ("autotuninglevel", ("auto-tuning", "autotuning", "réglage automatique", "paramétrage automatique")),
+    ("ecncapability", ("ecn",)),
+    ("dca", ("dca", "direct cache")),
+    ("chimney", ("chimney",)),
+)
+_TCP_VALUES = {"activé": "enabled", "active": "enabled", "désactivé": "disabled", "desactive": "disabled"}
+
+# Interfaces DNS à régler: carte réseau active (la boucle locale n'en a pas) avec des serveurs.
+DNS_ADAPTERS_QUERY = (
+    "Get-DnsClientServerAddress -AddressFamily IPv4 -ErrorAction SilentlyContinue | Where-Object { "
+    "$_.ServerAddresses -and "
+    "(Get-NetAdapter -InterfaceIndex $_.InterfaceIndex -ErrorAction SilentlyContinue).Status -eq 'Up' }"
+)
+
+_PROBE_SCRIPT = r"""
+$svcNames = @({services})
+$state = [ordered]@{{
+  tcp = ((netsh int tcp show global) -join "`n")
+  power = ((powercfg /GETACTIVESCHEME) -join " ")
+  services = @(Get-Service -Name $svcNames -ErrorAction SilentlyContinue | ForEach-Object {{
+    [ordered]@{{ name = $_.Name; status = "$($_.Status)"; start = "$($_.StartType)" }} }})
+  dns = @({dns_adapters} | ForEach-Object {{
+    [ordered]@{{ alias = $_.InterfaceAlias; servers = @($_.ServerAddresses) }} }})
+  game = [ordered]@{{
+    AllowAutoGameMode = (Get-ItemProperty -Path 'HKCU:\Software\Microsoft\GameBar' -Name AllowAutoGameMode -ErrorAction SilentlyContinue).AllowAutoGameMode
+    GameDVR_Enabled = (Get-ItemProperty -Path 'HKCU:\System\GameConfigStore' -Name GameDVR_Enabled -ErrorAction SilentlyContinue).GameDVR_Enabled
+  }}
+}}
+$state | ConvertTo-Json -Depth 4 -Compress
+"""
+
+
+def parse_tcp_globals(raw: str) -> Dict[str, Optional[str]]:
+    """Extrait les paramètres suivis de la sortie `netsh int tcp show global`."""
+    values: Dict[str, Optional[str]] = {key: None for key in TCP_GLOBALS}
+    for line in raw.splitlines():
+        label, sep, value = line.partition(":")
+        if not sep:
+            continue
+        label = label.strip().lower()
+        value = value.strip().lower()
+        for key, keywords in _TCP_LABELS:
+            if values[key] is None and any(word in label for word in keywords):
+                values[key] = _TCP_VALUES.get(value, value)
+                break
+    return values
+
+
+def parse_scheme_guid(raw: str) -> Optional[str]:
+    match = re.search(r"[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}", raw or "")
+    return match.group(0).lower() if match else None
+
+
+@dataclass
+class SystemState:
+    """État courant lu en une seule passe PowerShell."""
+
+    tcp_raw: str = ""
+    power_raw: str = ""
+    services: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    dns: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    game: Dict[str, Optional[int]] = field(default_factory=dict)
+
+    @property
+    def tcp(self) -> Dict[str, Optional[str]]:
+        return parse_tcp_globals(self.tcp_raw)
+
+    @property
+    def power_scheme(self) -> Optional[str]:
+        return parse_scheme_guid(self.power_raw)
+
+    @classmethod
+    def from_json(cls, payload: Dict[str, Any]) -> "SystemState":
+        def as_list(value: Any) -> List[Any]:
+            # ConvertTo-Json aplatit les tableaux à un élément
+            if value is None:
+                return []
+            return value if isinstance(value, list) else [value]
+
+        return cls(
+            tcp_raw=payload.get("tcp") or "",
+            power_raw=payload.get("power") or "",
+            services={svc["name"]: svc for svc in as_list(payload.get("services"))},
+            dns={
+                entry["alias"]: tuple(as_list(entry.get("servers")))
+                for entry in as_list(payload.get("dns"))
+                if as_list(entry.get("servers"))
+            },
+            game=dict(payload.get("game") or {}),
+        )
+
+
+class SystemStateProbe:
+    """Lit TCP, plan d'énergie, services, DNS et GameBar/GameDVR en un seul appel PowerShell."""
+
+    def __init__(self, services: Sequence[str] = BACKGROUND_SERVICES) -> None:
+        self.services = list(services)
+
+    def read(self) -> SystemState:
+        names = ", ".join(f"'{name}'" for name in self.services)
+        output = powershell(_PROBE_SCRIPT.format(services=names, dns_adapters=DNS_ADAPTERS_QUERY)).stdout
+        return SystemState.from_json(json.loads(output))
+
+
+@dataclass
+class Change:
+    category: str
+    key: str
+    current: Any
+    target: Any
+
+    def describe(self) -> str:
+        current = "absent" if self.current in (None, "", ()) else self.current
+        return f"{self.category}/{self.key}: {current} → {self.target}"
+
+
+@dataclass
+class OptimizationPlan:
+    """Différences entre l'état courant et le profil cible; vide = rien à appliquer."""
+
+    state: SystemState
+    changes: List[Change] = field(default_factory=list)
+
+    def pending(self, category: str) -> List[Change]:
+        return [change for change in self.changes if change.category == category]
+
+    def needs(self, category: str, key: str) -> bool:
+        return any(change.category == category and change.key == key for change in self.changes)
+
+    def format(self) -> str:
+        lines = ["[PLAN D'OPTIMISATION]"]
+        if not self.changes:
+            lines.append("Aucune modification nécessaire: le système est déjà optimisé.")
+        lines.extend(f" - {change.describe()}" for change in self.changes)
+        return "\n".join(lines)
+
+
+def compute_plan(
+    state: SystemState,
+    *,
+    dns_servers: Tuple[str, ...] = DNS_SERVERS,
+    services: Sequence[str] = BACKGROUND_SERVICES,
+) -> OptimizationPlan:
+    plan = OptimizationPlan(state=state)
+    changes = plan.changes
+    tcp = state.tcp
+    readable = any(value is not None for value in tcp.values())
+    for key, target in TCP_GLOBALS.items():
+        if readable and tcp.get(key) is None:
+            continue  # paramètre absent de cette version de Windows (ex. chimney/DCA sur 10/11 récents)
+        if tcp.get(key) != target:
+            changes.append(Change("tcp", key, tcp.get(key), target))
+    if state.power_scheme != HIGH_PERFORMANCE_SCHEME:
+        changes.append(Change("power", "scheme", state.power_scheme, HIGH_PERFORMANCE_SCHEME))
+    for name in services:
+        svc = state.services.get(name)
+        if svc is None:
+            continue  # service absent de cette machine
+        if svc.get("status") != "Stopped" or svc.get("start") not in (SERVICE_STARTUP_TYPE, "Disabled"):
+            changes.append(Change("service", name, f"{svc.get('status')}/{svc.get('start')}", f"Stopped/{SERVICE_STARTUP_TYPE}"))
+    for alias, current in state.dns.items():
+        if tuple(current) != tuple(dns_servers):
+            changes.append(Change("dns", alias, ",".join(current), ",".join(dns_servers)))
+    for key, target in GAME_FEATURE_TARGETS.items():
+        if state.game.get(key) != target:
+            changes.append(Change("game", key, state.game.get(key), target))
+    return plan
@@ -0,0 +1,712 @@
+"""
+Moteurs de sonde réseau: ICMP asynchrone partagé, ping système, TCP/UDP et réseau simulé.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import random
+import re
+import socket
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .config import PROBE_TCP_PORT
+from .utils import run_command
+
+ICMP_ECHO_REPLY = 0
+ICMP_DEST_UNREACHABLE = 3
+ICMP_ECHO_REQUEST = 8
+ICMP_TIME_EXCEEDED = 11
+PAYLOAD = b"gaming-optimizer"
+# Erreurs ICMP des ping sockets Linux: file d'erreurs du socket (IP_RECVERR, <linux/in.h>)
+IP_RECVERR = getattr(socket, "IP_RECVERR", 11) if sys.platform.startswith("linux") else None
+SO_EE_ORIGIN_ICMP = 2
+
+
+class HopReply(NamedTuple):
+    """Réponse à une sonde à TTL limité: routeur (ou cible) qui a répondu."""
+
+    address: str
+    latency: Optional[float]  # ms, None si non mesurable (ping système)
+    reached: bool  # True: echo reply de la cible, False: TTL expiré en route
+
+
+class ProbeTarget(NamedTuple):
+    """Cible d'une entrée de PING_TARGETS: « hôte », « tcp://hôte[:port] » ou « udp://hôte:port »."""
+
+    scheme: str  # icmp | tcp | udp
+    host: str
+    port: Optional[int] = None
+    payload: bytes = PAYLOAD  # datagramme UDP envoyé (?payload=<hex> pour un handshake de jeu)
+    # ?refused=1: un RST TCP / « port injoignable » UDP compte comme une réponse. Par défaut une
+    # perte: ces refus viennent souvent d'un pare-feu local ou intermédiaire, pas de l'hôte.
+    refused: bool = False
+
+
+@lru_cache(maxsize=256)
+def parse_target(spec: str) -> ProbeTarget:
+    """Lève ValueError pour un schéma inconnu, un port invalide ou une cible UDP sans port."""
+    if "://" not in spec:
+        return ProbeTarget("icmp", spec)
+    parts = urlsplit(spec)
+    scheme = parts.scheme.lower()
+    if scheme not in ("icmp", "tcp", "udp") or not parts.hostname:
+        raise ValueError(f"Cible de sonde invalide: {spec}")
+    try:
+        port = parts.port
+    except ValueError:
+        raise ValueError(f"Port invalide: {spec}") from None
+    if scheme == "tcp" and port is None:
+        port = PROBE_TCP_PORT
+    if scheme == "udp" and port is None:
+        raise ValueError(f"Port UDP manquant: {spec}")
+    options = parse_qs(parts.query)
+    payload = bytes.fromhex(options["payload"][0]) if options.get("payload") else PAYLOAD
+    refused = options.get("refused", ["0"])[0].lower() in ("1", "true", "yes", "oui")
+    return ProbeTarget(scheme, parts.hostname, port if scheme != "icmp" else None, payload, refused)
+
+
+def icmp_checksum(data: bytes) -> int:
+    """Somme de contrôle Internet (RFC 1071)."""
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_echo_request(identifier: int, sequence: int, payload: bytes = PAYLOAD) -> bytes:
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    checksum = icmp_checksum(header + payload)
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, identifier, sequence) + payload
+
+
+def strip_ip_header(packet: bytes) -> bytes:
+    """Retire l'en-tête IPv4 présent sur les sockets raw (absent en SOCK_DGRAM sous Linux)."""
+    if len(packet) >= 20 and packet[0] >> 4 == 4:
+        return packet[(packet[0] & 0x0F) * 4 :]
+    return packet
+
+
+def parse_echo_reply(packet: bytes) -> Optional[Tuple[int, int]]:
+    """Retourne (identifiant, séquence) d'un echo reply, None pour tout autre paquet."""
+    icmp = strip_ip_header(packet)
+    if len(icmp) < 8:
+        return None
+    icmp_type, _code, _checksum, identifier, sequence = struct.unpack("!BBHHH", icmp[:8])
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return identifier, sequence
+
+
+def parse_icmp_error(packet: bytes) -> Optional[Tuple[int, int, int, str]]:
+    """
+    (type, identifiant, séquence, routeur) d'un TTL expiré / destination injoignable reçu en raw.
+
+    Le message ICMP d'erreur cite l'en-tête IP et les 8 premiers octets de l'echo d'origine.
+    """
+    if len(packet) < 20 or packet[0] >> 4 != 4:
+        return None
+    responder = socket.inet_ntoa(packet[12:16])
+    icmp = strip_ip_header(packet)
+    if len(icmp) < 8 or icmp[0] not in (ICMP_TIME_EXCEEDED, ICMP_DEST_UNREACHABLE):
+        return None
+    quoted = strip_ip_header(icmp[8:])
+    if len(quoted) < 8 or quoted[0] != ICMP_ECHO_REQUEST:
+        return None
+    _type, _code, _checksum, identifier, sequence = struct.unpack("!BBHHH", quoted[:8])
+    return icmp[0], identifier, sequence, responder
+
+
+def parse_recverr(ancdata: List[Tuple[int, int, bytes]]) -> Optional[Tuple[int, str]]:
+    """(type ICMP, routeur) depuis le sock_extended_err d'un recvmsg(MSG_ERRQUEUE)."""
+    for level, kind, data in ancdata:
+        if level != socket.IPPROTO_IP or kind != IP_RECVERR or len(data) < 24:
+            continue
+        _errno, origin, icmp_type, _code, _pad, _info, _data = struct.unpack_from("=IBBBBII", data)
+        if origin != SO_EE_ORIGIN_ICMP:
+            continue
+        # sockaddr_in de l'émetteur de l'erreur juste après la structure (16 octets)
+        return icmp_type, socket.inet_ntoa(data[20:24])
+    return None
+
+
+def open_icmp_socket() -> socket.socket:
+    """
+    Ouvre un socket ICMP: raw (Windows/admin) puis SOCK_DGRAM (ping sockets Linux/macOS).
+
+    Lève OSError si aucun des deux n'est autorisé.
+    """
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+    except OSError:
+        return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+
+
+class AsyncPinger:
+    """Envoie des echo ICMP sur un socket unique et associe les réponses par (identifiant, séquence)."""
+
+    def __init__(self) -> None:
+        self._sock: Optional[socket.socket] = None
+        self._identifier = os.getpid() & 0xFFFF
+        self._sequence = itertools.count(random.randrange(0x10000))
+        # Résultat attendu: (instant de réception, routeur si erreur ICMP, None pour un echo reply)
+        self._pending: Dict[Tuple[int, int], asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._default_ttl = 64
+        self._errqueue = False
+
+    def open(self) -> None:
+        sock = open_icmp_socket()
+        sock.setblocking(False)
+        if sock.type == socket.SOCK_DGRAM:
+            # Le noyau réécrit l'identifiant avec le "port" local du ping socket.
+            sock.bind(("0.0.0.0", 0))
+            self._identifier = sock.getsockname()[1] & 0xFFFF
+            if IP_RECVERR is not None:
+                # Les TTL expirés n'arrivent pas par recv() sur un ping socket: file d'erreurs.
+                sock.setsockopt(socket.IPPROTO_IP, IP_RECVERR, 1)
+                self._errqueue = True
+        self._default_ttl = sock.getsockopt(socket.IPPROTO_IP, socket.IP_TTL)
+        self._sock = sock
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        for future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+
+    async def __aenter__(self) -> "AsyncPinger":
+        self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def ping(self, address: str, timeout: float) -> Optional[float]:
+        """Latence en ms vers une adresse IPv4 déjà résolue, None en cas de timeout."""
+        reply = await self._send(address, timeout)
+        if reply is None or reply[1] is not None:
+            return None  # pas de réponse, ou erreur ICMP renvoyée par un routeur
+        return reply[0]
+
+    async def probe_ttl(self, address: str, ttl: int, timeout: float) -> Optional[HopReply]:
+        """Echo limité à `ttl` sauts: routeur du saut `ttl`, ou la cible si elle est plus proche."""
+        reply = await self._send(address, timeout, ttl=ttl)
+        if reply is None:
+            return None
+        latency, responder = reply
+        return HopReply(responder or address, latency, responder is None)
+
+    async def _send(self, address: str, timeout: float, ttl: Optional[int] = None) -> Optional[Tuple[float, Optional[str]]]:
+        if self._sock is None:
+            raise RuntimeError("AsyncPinger non ouvert")
+        loop = asyncio.get_running_loop()
+        sequence = next(self._sequence) & 0xFFFF
+        key = (self._identifier, sequence)
+        future = loop.create_future()
+        self._pending[key] = future
+        packet = build_echo_request(self._identifier, sequence)
+        sent = time.perf_counter()
+        try:
+            if ttl is None:
+                self._sock.sendto(packet, (address, 0))
+            else:
+                # TTL réglé le temps d'un seul envoi: aucun await entre les trois appels,
+                # donc les autres sondes du socket partagé gardent le TTL par défaut.
+                self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+                try:
+                    self._sock.sendto(packet, (address, 0))
+                finally:
+                    self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, self._default_ttl)
+        except OSError:
+            self._pending.pop(key, None)
+            return None
+        # Lecteur démarré après le premier envoi: un socket raw Windows doit être lié avant recv.
+        self._ensure_reader()
+        try:
+            received, responder = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._pending.pop(key, None)
+        return (received - sent) * 1000, responder
+
+    def _ensure_reader(self) -> None:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.get_running_loop().create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._sock is not None:
+            try:
+                packet = await loop.sock_recv(self._sock, 2048)
+            except OSError:
+                # Avec IP_RECVERR, une erreur ICMP en attente fait échouer recv(): vider la file.
+                if not (self._errqueue and self._drain_errors()):
+                    await asyncio.sleep(0.01)
+                continue
+            received = time.perf_counter()
+            key = parse_echo_reply(packet)
+            if key is not None:
+                self._resolve(key, received, None)
+                continue
+            error = parse_icmp_error(packet)
+            if error is not None:
+                _type, identifier, sequence, responder = error
+                self._resolve((identifier, sequence), received, responder)
+
+    def _resolve(self, key: Tuple[int, int], received: float, responder: Optional[str]) -> None:
+        future = self._pending.get(key)
+        if future is not None and not future.done():
+            future.set_result((received, responder))
+
+    def _drain_errors(self) -> bool:
+        drained = False
+        while self._sock is not None:
+            try:
+                data, ancdata, _flags, _addr = self._sock.recvmsg(512, 512, socket.MSG_ERRQUEUE)
+            except OSError:  # BlockingIOError: file vide
+                return drained
+            drained = True
+            received = time.perf_counter()
+            error = parse_recverr(ancdata)
+            if error is None or len(data) < 8:
+                continue
+            # `data` est l'echo envoyé: la séquence identifie la sonde.
+            sequence = struct.unpack("!H", data[6:8])[0]
+            self._resolve((self._identifier, sequence), received, error[1])
+        return drained
+
+
+async def resolve_ipv4(host: str) -> Optional[str]:
+    """Résout un nom d'hôte en IPv4 sans bloquer la boucle."""
+    loop = asyncio.get_running_loop()
+    try:
+        infos = await loop.getaddrinfo(host, None, family=socket.AF_INET)
+    except OSError:
+        return None
+    return infos[0][4][0] if infos else None
+
+
+class ProbeBackend:
+    """Interface commune des moteurs de sonde consommés par NetworkAnalyzer."""
+
+    async def open(self) -> None:
+        """Prépare les ressources partagées (sockets...) avant une série de sondes."""
+
+    async def close(self) -> None:
+        """Libère les ressources ouvertes par open()."""
+
+    async def probe(self, host: str, timeout: float) -> Optional[float]:
+        """Latence en ms vers host, None si aucune réponse avant timeout."""
+        raise NotImplementedError
+
+    async def probe_ttl(self, host: str, ttl: int, timeout: float) -> Optional[HopReply]:
+        """Sonde à TTL limité (découverte de chemin), None si aucun saut n'a répondu."""
+        raise NotImplementedError
+
+    async def sleep(self, delay: float) -> None:
+        """Pause entre deux tentatives (virtuelle pour les backends simulés)."""
+        await asyncio.sleep(delay)
+
+    async def __aenter__(self) -> "ProbeBackend":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+class SystemPingBackend(ProbeBackend):
+    """Lance la commande ping de l'OS (un processus par tentative) dans un thread."""
+
+    LATENCY_RE = re.compile(r"(?:time|temps)[=<]\s*([\d.,]+)\s*ms")
+    # « Reply from 10.0.0.1: TTL expired in transit » / « From 10.0.0.1 icmp_seq=1 Time to live exceeded »
+    EXPIRED_RE = re.compile(r"(?:from|de)\s+(\d+\.\d+\.\d+\.\d+)[^\n]*?(?:ttl expir|time to live exceeded)", re.I)
+
+    async def probe(self, host: str, timeout: float) -> Optional[float]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.ping_once, host, timeout)
+
+    async def probe_ttl(self, host: str, ttl: int, timeout: float) -> Optional[HopReply]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.ping_ttl_once, host, ttl, timeout)
+
+    @staticmethod
+    def _command(host: str, timeout: float, ttl: Optional[int] = None) -> List[str]:
+        if os.name == "nt":
+            cmd = ["ping", "-n", "1", "-w", str(max(int(timeout * 1000), 100))]
+            cmd += ["-i", str(ttl)] if ttl else []
+        else:
+            cmd = ["ping", "-c", "1", "-W", str(max(int(round(timeout)), 1))]
+            cmd += ["-t", str(ttl)] if ttl else []
+        return cmd + [host]
+
+    @classmethod
+    def ping_once(cls, host: str, timeout: float) -> Optional[float]:
+        try:
+            proc = run_command(cls._command(host, timeout), check=False)
+        except OSError:
+            return None
+        if proc.returncode != 0:
+            return None
+        match = cls.LATENCY_RE.search(proc.stdout)
+        if match:
+            return float(match.group(1).replace(",", "."))
+        return None
+
+    @classmethod
+    def ping_ttl_once(cls, host: str, ttl: int, timeout: float) -> Optional[HopReply]:
+        """Le ping système n'affiche pas de temps pour un TTL expiré: latence None dans ce cas."""
+        try:
+            proc = run_command(cls._command(host, timeout, ttl), check=False)
+        except OSError:
+            return None
+        expired = cls.EXPIRED_RE.search(proc.stdout)
+        if expired:
+            return HopReply(expired.group(1), None, False)
+        match = cls.LATENCY_RE.search(proc.stdout)
+        if proc.returncode == 0 and match:
+            return HopReply(host, float(match.group(1).replace(",", ".")), True)
+        return None
+
+
+class IcmpBackend(ProbeBackend):
+    """
+    Echo ICMP sur un socket partagé (AsyncPinger).
+
+    `fallback` (ping système par défaut) ne sert que si aucun socket ICMP ne peut être ouvert;
+    une tentative sans réponse sur un socket ouvert reste une perte, sans processus lancé.
+    """
+
+    def __init__(self, fallback: Optional[ProbeBackend] = None) -> None:
+        self.fallback = fallback if fallback is not None else SystemPingBackend()
+        self._pinger: Optional[AsyncPinger] = None
+        self._addresses: Dict[str, Optional[str]] = {}
+
+    async def open(self) -> None:
+        pinger = AsyncPinger()
+        try:
+            pinger.open()
+        except OSError:
+            pinger = None
+        self._pinger = pinger
+        self._addresses.clear()
+        if pinger is None:
+            await self.fallback.open()
+
+    async def close(self) -> None:
+        if self._pinger is not None:
+            await self._pinger.close()
+            self._pinger = None
+        else:
+            await self.fallback.close()
+
+    async def probe(self, host: str, timeout: float) -> Optional[float]:
+        if self._pinger is None:
+            return await self.fallback.probe(host, timeout)
+        if host not in self._addresses:
+            self._addresses[host] = await resolve_ipv4(host)
+        address = self._addresses[host]
+        if not address:
+            return None
+        return await self._pinger.ping(address, timeout)
+
+    async def probe_ttl(self, host: str, ttl: int, timeout: float) -> Optional[HopReply]:
+        if self._pinger is None:
+            return await self.fallback.probe_ttl(host, ttl, timeout)
+        if host not in self._addresses:
+            self._addresses[host] = await resolve_ipv4(host)
+        address = self._addresses[host]
+        if not address:
+            return None
+        # Pas de repli ici: un saut muet est une information, pas un échec du socket.
+        return await self._pinger.probe_ttl(address, ttl, timeout)
+
+
+class _TransportBackend(ProbeBackend):
+    """Base des sondes TCP/UDP: résolution mise en cache, sans socket partagé ni processus."""
+
+    socket_type = socket.SOCK_STREAM
+
+    def __init__(self) -> None:
+        self._addresses: Dict[str, Optional[str]] = {}
+
+    async def open(self) -> None:
+        self._addresses.clear()
+
+    async def _address(self, host: str) -> Optional[str]:
+        if host not in self._addresses:
+            self._addresses[host] = await resolve_ipv4(host)
+        return self._addresses[host]
+
+    async def probe(self, host: str, timeout: float) -> Optional[float]:
+        target = parse_target(host)
+        address = await self._address(target.host)
+        if not address:
+            return None
+        sock = socket.socket(socket.AF_INET, self.socket_type)
+        sock.setblocking(False)
+        try:
+            return await self._measure(sock, (address, target.port or 0), target, timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        finally:
+            sock.close()
+
+    async def probe_ttl(self, host: str, ttl: int, timeout: float) -> Optional[HopReply]:
+        return None  # découverte de chemin: ICMP uniquement (voir ProtocolRouter)
+
+    async def _measure(
+        self, sock: socket.socket, address: Tuple[str, int], target: ProbeTarget, timeout: float
+    ) -> Optional[float]:
+        raise NotImplementedError
+
+
+class TcpConnectBackend(_TransportBackend):
+    """
+    Temps d'établissement d'une connexion TCP (SYN → SYN-ACK), fermée aussitôt.
+
+    Un refus (RST) est une perte, sauf pour une cible `?refused=1`.
+    """
+
+    async def _measure(
+        self, sock: socket.socket, address: Tuple[str, int], target: ProbeTarget, timeout: float
+    ) -> Optional[float]:
+        loop = asyncio.get_running_loop()
+        sent = time.perf_counter()
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, address), timeout)
+        except ConnectionRefusedError:
+            if not target.refused:
+                return None
+        return (time.perf_counter() - sent) * 1000
+
+
+class UdpEchoBackend(_TransportBackend):
+    """
+    Aller-retour d'un datagramme (`payload` de la cible) jusqu'à la première réponse du port.
+
+    Un « port injoignable » est une perte, sauf pour une cible `?refused=1` (comme le RST en TCP).
+    """
+
+    socket_type = socket.SOCK_DGRAM
+
+    async def _measure(
+        self, sock: socket.socket, address: Tuple[str, int], target: ProbeTarget, timeout: float
+    ) -> Optional[float]:
+        loop = asyncio.get_running_loop()
+        sock.connect(address)  # UDP: fixe seulement le pair, les erreurs ICMP remontent au recv
+        sent = time.perf_counter()
+        try:
+            sock.send(target.payload)
+            await asyncio.wait_for(loop.sock_recv(sock, 2048), timeout)
+        except ConnectionError:  # Linux: ECONNREFUSED, Windows: WSAECONNRESET
+            if not target.refused:
+                return None
+        return (time.perf_counter() - sent) * 1000
+
+
+class ProtocolRouter(ProbeBackend):
+    """
+    Aiguille chaque cible vers son moteur selon son schéma (voir parse_target).
+
+    Les sondes à TTL limité passent toujours par ICMP vers l'hôte nu: le chemin d'une
+    cible « tcp://hôte:port » reste analysable.
+    """
+
+    def __init__(self, backends: Optional[Dict[str, ProbeBackend]] = None) -> None:
+        self.backends = {"icmp": IcmpBackend(), "tcp": TcpConnectBackend(), "udp": UdpEchoBackend()}
+        self.backends.update(backends or {})
+
+    async def open(self) -> None:
+        for backend in self.backends.values():
+            await backend.open()
+
+    async def close(self) -> None:
+        for backend in self.backends.values():
+            await backend.close()
+
+    async def probe(self, host: str, timeout: float) -> Optional[float]:
+        target = parse_target(host)
+        if target.scheme == "icmp":
+            return await self.backends["icmp"].probe(target.host, timeout)
+        return await self.backends[target.scheme].probe(host, timeout)
+
+    async def probe_ttl(self, host: str, ttl: int, timeout: float) -> Optional[HopReply]:
+        return await self.backends["icmp"].probe_ttl(parse_target(host).host, ttl, timeout)
+
+
+class BlockingProber:
+    """
+    Sonde bloquante pour un thread de capteur: boucle et sockets ouverts au premier appel
+    puis réutilisés à chaque tick jusqu'à `close()` (à appeler depuis le même thread).
+    """
+
+    def __init__(self, backend: Optional[ProbeBackend] = None) -> None:
+        self.backend = backend or ProtocolRouter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def probe(self, host: str, timeout: float) -> Optional[float]:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.backend.open())
+        return self._loop.run_until_complete(self.backend.probe(host, timeout))
+
+    def close(self) -> None:
+        loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        try:
+            loop.run_until_complete(self.backend.close())
+        finally:
+            loop.close()
+
+
+@dataclass
+class SimulatedTarget:
+    """Profil de latence d'une cible simulée (valeurs en ms, pertes en probabilité 0..1)."""
+
+    latency: float = 20.0
+    jitter: float = 2.0
+    loss: float = 0.0
+    distribution: str = "normal"  # normal | lognormal | uniform
+    spike_rate: float = 0.0
+    spike_latency: float = 0.0
+
+    def sample(self, rng: random.Random) -> Optional[float]:
+        if self.loss and rng.random() < self.loss:
+            return None
+        return self.sample_latency(rng)
+
+    def sample_latency(self, rng: random.Random) -> float:
+        if self.distribution == "lognormal" and self.latency > 0:
+            sigma = self.jitter / self.latency if self.jitter else 0.0
+            value = self.latency * rng.lognormvariate(0.0, sigma)
+        elif self.distribution == "uniform":
+            value = rng.uniform(self.latency - self.jitter, self.latency + self.jitter)
+        else:
+            value = rng.gauss(self.latency, self.jitter)
+        if self.spike_rate and rng.random() < self.spike_rate:
+            value += self.spike_latency
+        return max(value, 0.01)
+
+
+@dataclass
+class SimulatedHop:
+    """
+    Routeur intermédiaire simulé.
+
+    `target.latency` est le RTT jusqu'à ce routeur et `target.loss` la perte du lien qui y
+    mène (elle s'applique à tout ce qui passe au-delà). `icmp_loss` ne touche que les
+    réponses du routeur lui-même (limitation ICMP); `silent` ne répond jamais.
+    """
+
+    address: str
+    target: SimulatedTarget = field(default_factory=SimulatedTarget)
+    icmp_loss: float = 0.0
+    silent: bool = False
+
+
+class SimulatedBackend(ProbeBackend):
+    """
+    Réseau simulé déterministe: chaque hôte tire ses latences d'un générateur dérivé de (seed, hôte).
+
+    Chaque série (open) rejoue la même séquence pour un seed donné, quel que soit l'ordre
+    d'entrelacement des cibles; reseed() passe au scénario suivant. Avec realtime=False (défaut),
+    latences et délais sont virtuels et une série complète est instantanée. `paths` décrit les
+    routeurs intermédiaires vers une cible (la cible est le saut suivant le dernier routeur).
+    """
+
+    def __init__(
+        self,
+        profiles: Optional[Dict[str, SimulatedTarget]] = None,
+        *,
+        seed: int = 0,
+        default: Optional[SimulatedTarget] = None,
+        realtime: bool = False,
+        paths: Optional[Dict[str, List[SimulatedHop]]] = None,
+    ) -> None:
+        self.profiles = dict(profiles or {})
+        self.default = default or SimulatedTarget()
+        self.seed = seed
+        self.realtime = realtime
+        self.paths = {host: list(hops) for host, hops in (paths or {}).items()}
+        # adresse d'un routeur -> (cible du chemin, nombre de sauts)
+        self._hops: Dict[str, Tuple[str, int]] = {
+            hop.address: (host, index + 1) for host, hops in self.paths.items() for index, hop in enumerate(hops)
+        }
+        self._rngs: Dict[str, random.Random] = {}
+
+    def reseed(self, seed: int) -> None:
+        self.seed = seed
+        self._rngs.clear()
+
+    async def open(self) -> None:
+        self._rngs.clear()
+
+    def _rng(self, host: str) -> random.Random:
+        rng = self._rngs.get(host)
+        if rng is None:
+            rng = self._rngs[host] = random.Random(f"{self.seed}:{host}")
+        return rng
+
+    def _sample(self, host: str, hops: int) -> Optional[float]:
+        """RTT vers le saut `hops` du chemin de host (au-delà du dernier routeur: host lui-même)."""
+        path = self.paths.get(host, [])
+        rng = self._rng(path[hops - 1].address if hops <= len(path) else host)
+        for hop in path[:hops]:
+            if hop.target.loss and rng.random() < hop.target.loss:
+                return None
+        if hops > len(path):
+            return self.profiles.get(host, self.default).sample(rng)
+        hop = path[hops - 1]
+        if hop.silent or (hop.icmp_loss and rng.random() < hop.icmp_loss):
+            return None
+        return hop.target.sample_latency(rng)
+
+    async def _answer(self, latency: Optional[float], timeout: float) -> Optional[float]:
+        if latency is None or latency > timeout * 1000:
+            if self.realtime:
+                await asyncio.sleep(timeout)
+            return None
+        if self.realtime:
+            await asyncio.sleep(latency / 1000)
+        return latency
+
+    async def probe(self, host: str, timeout: float) -> Optional[float]:
+        if host in self._hops:
+            target, hops = self._hops[host]
+            return await self._answer(self._sample(target, hops), timeout)
+        return await self._answer(self._sample(host, len(self.paths.get(host, [])) + 1), timeout)
+
+    async def probe_ttl(self, host: str, ttl: int, timeout: float) -> Optional[HopReply]:
+        path = self.paths.get(host, [])
+        reached = ttl > len(path)
+        latency = await self._answer(self._sample(host, len(path) + 1 if reached else ttl), timeout)
+        if latency is None:
+            return None
+        return HopReply(host if reached else path[ttl - 1].address, latency, reached)
+
+    async def sleep(self, delay: float) -> None:
+        if self.realtime:
+            await asyncio.sleep(delay)
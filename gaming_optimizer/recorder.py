@@ -0,0 +1,154 @@
+"""
+Enregistrement du monitoring dans un fichier anneau mappé en mémoire (enregistrements binaires fixes).
+
+Le fichier a une taille fixe: une fois plein, les plus anciens échantillons sont écrasés,
+donc disque et mémoire restent bornés quelle que soit la durée de la session.
+"""
+from __future__ import annotations
+
+import math
+import mmap
+import re
+import struct
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None
+
+MAGIC = b"GORING01"
+# magic, version, taille d'en-tête, taille d'enregistrement, cœurs, capacité, enregistrements écrits
+_HEADER = struct.Struct("<8sIIIIQQ")
+HEADER_SIZE = 64
+_WRITTEN_OFFSET = _HEADER.size - 8
+FIELDS = ("ping", "cpu", "ram", "gpu")  # float32, NaN = absent/timeout
+
+
+def record_struct(cores: int) -> struct.Struct:
+    return struct.Struct("<d" + "f" * (len(FIELDS) + cores))
+
+
+def record_dtype(cores: int) -> "np.dtype":
+    fields = [("ts", "<f8")] + [(name, "<f4") for name in FIELDS]
+    if cores:
+        fields.append(("cores", "<f4", (cores,)))
+    return np.dtype(fields)
+
+
+def as_float(value: Any) -> float:
+    """Valeur numérique d'une mesure (None, texte du type « 55°C »…), NaN sinon."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = re.search(r"-?\d+(?:[.,]\d+)?", value)
+        if match:
+            return float(match.group(0).replace(",", "."))
+    return math.nan
+
+
+class RingRecorder:
+    """Écrit des échantillons horodatés dans un anneau de `capacity` enregistrements."""
+
+    def __init__(self, path: Path, *, cores: int, size_mb: float = 32.0) -> None:
+        self.path = Path(path)
+        self.cores = cores
+        self._record = record_struct(cores)
+        self.capacity = max(int((size_mb * 1024 * 1024 - HEADER_SIZE) // self._record.size), 1)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        size = HEADER_SIZE + self.capacity * self._record.size
+        # Un fichier existant est réinitialisé: une session = un enregistrement.
+        with open(self.path, "wb") as handle:
+            handle.truncate(size)
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self.written = 0
+        _HEADER.pack_into(self._map, 0, MAGIC, 1, HEADER_SIZE, self._record.size, cores, self.capacity, 0)
+
+    def append(self, timestamp: float, values: Dict[str, Any], cores: Sequence[float] = ()) -> None:
+        row = [as_float(values.get(name)) for name in FIELDS]
+        per_core = [as_float(v) for v in list(cores)[: self.cores]]
+        per_core += [math.nan] * (self.cores - len(per_core))
+        offset = HEADER_SIZE + (self.written % self.capacity) * self._record.size
+        self._record.pack_into(self._map, offset, timestamp, *row, *per_core)
+        # Le compteur est publié après l'enregistrement: un lecteur ne voit jamais de ligne à moitié écrite.
+        self.written += 1
+        struct.pack_into("<Q", self._map, _WRITTEN_OFFSET, self.written)
+
+    def close(self) -> None:
+        if self._map.closed:
+            return
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "RingRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class RingReader:
+    """Relit un fichier anneau sous forme de tableau NumPy structuré (ts, ping, cpu, ram, gpu, cores)."""
+
+    def __init__(self, path: Path) -> None:
+        if np is None:
+            raise RuntimeError("NumPy est requis pour relire un enregistrement (pip install numpy)")
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            header = handle.read(HEADER_SIZE)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{self.path}: en-tête tronqué")
+        magic, _version, header_size, record_size, cores, capacity, _ = _HEADER.unpack_from(header)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: fichier d'enregistrement invalide")
+        self.cores = cores
+        self.capacity = capacity
+        self.dtype = record_dtype(cores)
+        if self.dtype.itemsize != record_size:
+            raise ValueError(f"{self.path}: taille d'enregistrement inattendue")
+        self._records = np.memmap(self.path, dtype=self.dtype, mode="r", offset=header_size, shape=(capacity,))
+        self._header = np.memmap(self.path, dtype=np.uint8, mode="r", shape=(header_size,))
+
+    @property
+    def written(self) -> int:
+        return int(self._header[_WRITTEN_OFFSET : _WRITTEN_OFFSET + 8].view("<u8")[0])
+
+    def records(self) -> "np.ndarray":
+        """Tous les enregistrements présents, du plus ancien au plus récent."""
+        written = self.written
+        if written <= self.capacity:
+            return np.array(self._records[:written])
+        head = written % self.capacity
+        return np.concatenate((self._records[head:], self._records[:head]))
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None) -> "np.ndarray":
+        """Tranche temporelle [start, end] (timestamps epoch, bornes facultatives)."""
+        data = self.records()
+        mask = np.ones(data.shape[0], dtype=bool)
+        if start is not None:
+            mask &= data["ts"] >= start
+        if end is not None:
+            mask &= data["ts"] <= end
+        return data[mask]
+
+    def summary(self, data: "np.ndarray") -> Dict[str, float]:
+        if not data.size:
+            return {"samples": 0}
+        ping = data["ping"]
+        replied = ping[np.isfinite(ping)]
+        result = {
+            "samples": int(data.size),
+            "duration_s": float(data["ts"][-1] - data["ts"][0]),
+            "ping_timeouts": int(ping.size - replied.size),
+        }
+        if replied.size:
+            result.update(ping_avg=float(replied.mean()), ping_p95=float(np.percentile(replied, 95)), ping_max=float(replied.max()))
+        for name in ("cpu", "ram", "gpu"):
+            column = data[name][np.isfinite(data[name])]
+            if column.size:
+                result[f"{name}_avg"] = float(column.mean())
+                result[f"{name}_max"] = float(column.max())
+        return result
@@ -3,9 +3,21 @@ Génération de rapports lisibles pour l'utilisateur.
 """
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Any, Dict, List, Tuple
 
+from .compare import compare_metrics, describe
 from .network import NetworkResult
+from .pathtrace import PathReport
+
+BENCHMARK_LABELS = {
+    "cpu_int": "CPU entier (1 cœur)",
+    "cpu_float": "CPU flottant (1 cœur)",
+    "cpu_multi": "CPU tous cœurs",
+    "mem_bandwidth": "Bande passante mémoire",
+    "mem_latency": "Accès mémoire aléatoire",
+    "timer_resolution": "Résolution du timer",
+    "timer_jitter": "Gigue d'ordonnancement (sleep 1 ms)",
+}
 
 
 class Reporter:
@@ -15,12 +27,47 @@ class Reporter:
         lines = ["[ANALYSE RÉSEAU]"]
         for name, res in results.items():
             lines.append(
-                f"{name:<20} Ping: {res.latency_display} | "
+                f"{name:<20} Ping: {res.latency_display} (p95 {res.p95_display}) | "
                 f"Pertes: {res.packet_loss:.1f}% | Jitter: {res.jitter_display} | "
                 f"Stabilité: {'★'*res.stability_score}{'☆'*(5-res.stability_score)}"
             )
             if not res.has_data:
-                lines.append(" " * 6 + "⚠ Aucun paquet reçu (serveur peut filtrer l'ICMP).")
+                if "://" in res.host:
+                    lines.append(" " * 6 + "⚠ Aucune réponse (port fermé ou filtré, hôte injoignable ?).")
+                else:
+                    lines.append(" " * 6 + "⚠ Aucun paquet reçu (serveur peut filtrer l'ICMP: essayer tcp://hôte:port).")
+        return "\n".join(lines)
+
+    def build_path_section(self, reports: Dict[str, PathReport]) -> str:
+        lines = ["[ANALYSE DU CHEMIN]"]
+        for name, report in reports.items():
+            lines.append(f"{name} ({report.host}):")
+            for hop in report.hops:
+                if not hop.attempts:
+                    lines.append(f"   {hop.name:<22} pas de réponse (routeur muet)")
+                    continue
+                lines.append(
+                    f"   {hop.name:<22} Ping: {hop.latency_display} (p95 {hop.p95_display}) | "
+                    f"Pertes: {hop.packet_loss:.1f}% | Jitter: {hop.jitter_display}"
+                )
+            origin = report.loss_origin
+            if not report.hops:
+                lines.append(" " * 6 + "⚠ Aucun saut n'a répondu (ICMP filtré dès le premier routeur ?).")
+            elif not report.reached:
+                lines.append(" " * 6 + f"⚠ Destination injoignable après {len(report.hops)} saut(s).")
+            elif origin is not None:
+                lines.append(" " * 6 + f"⚠ Pertes à partir du saut {report.hops[origin].name.strip()}.")
+            else:
+                lines.append(" " * 6 + "Aucune perte jusqu'à la destination.")
+        return "\n".join(lines)
+
+    def build_ranking_section(self, ranking: List[Tuple[str, str, float]]) -> str:
+        lines = ["[MEILLEURS SERVEURS (HISTORIQUE)]"]
+        if not ranking:
+            lines.append("Pas encore d'historique de latence.")
+        for position, (region, name, cost) in enumerate(ranking, start=1):
+            label = region if region == name else f"{region} ({name})"
+            lines.append(f"{position:>2}. {label:<30} Qualité attendue: {cost:.1f} ms")
         return "\n".join(lines)
 
     def build_system_section(self, actions: List[str]) -> str:
@@ -28,13 +75,43 @@ class Reporter:
         lines.extend(f" - {action}" for action in actions)
         return "\n".join(lines)
 
-    def build_performance_section(self, before: Dict[str, float] | None, after: Dict[str, float]) -> str:
+    def build_performance_section(self, before: Dict[str, Any] | None, after: Dict[str, Any]) -> str:
         lines = ["[GAINS PERFORMANCE]"]
+        compared = False
         if before and "fps" in before and "fps" in after:
             delta = after["fps"] - before["fps"]
             pct = (delta / before["fps"]) * 100 if before["fps"] else 0
             lines.append(f"FPS moyens: {before['fps']:.0f} → {after['fps']:.0f} ({pct:+.1f}%)")
-        if (
+            compared = True
+        previous = (before or {}).get("benchmarks", {})
+        comparisons = compare_metrics(before, after) if before else {}
+        for name, current in after.get("benchmarks", {}).items():
+            label = BENCHMARK_LABELS.get(name, name)
+            unit = current["unit"]
+            now = f"{current['mean']:.2f} ± {current['ci']:.2f} {unit}"
+            old = previous.get(name)
+            if name in comparisons:
+                lines.append(f"{label}: {describe(comparisons[name], unit)}")
+                compared = True
+            elif old and old.get("mean"):
+                pct = (current["mean"] - old["mean"]) / old["mean"] * 100
+                better = pct >= 0 if current.get("higher_is_better", True) else pct <= 0
+                lines.append(
+                    f"{label}: {old['mean']:.2f} ± {old['ci']:.2f} → {now} "
+                    f"({pct:+.1f}%, {'mieux' if better else 'moins bien'})"
+                )
+                compared = True
+            else:
+                lines.append(f"{label}: {now}")
+        frame_lines = self._frame_pacing_lines((before or {}).get("frametimes"), after.get("frametimes"))
+        compared = compared or (bool(frame_lines) and bool((before or {}).get("frametimes")))
+        lines.extend(frame_lines)
+        if "frametimes_error" in after:
+            lines.append(f"Frame-times: analyse impossible ({after['frametimes_error']})")
+        if "latency" in comparisons:
+            lines.append(f"Latence: {describe(comparisons['latency'], 'ms')}")
+            compared = True
+        elif (
             before
             and "latency" in before
             and "latency" in after
@@ -44,7 +121,29 @@ class Reporter:
             delta = after["latency"] - before["latency"]
             pct = (delta / before["latency"]) * 100
             lines.append(f"Latence: {before['latency']:.0f}ms → {after['latency']:.0f}ms ({pct:+.1f}%)")
-        if len(lines) == 1:
+            compared = True
+        if not compared:
             lines.append("Collectez des métriques avant/après pour voir les gains.")
         return "\n".join(lines)
 
+    @staticmethod
+    def _frame_pacing_lines(before: Dict[str, Any] | None, after: Dict[str, Any] | None) -> List[str]:
+        if not after:
+            return []
+        lines = [f"Frame pacing ({after['frames']} frames, {after['duration_s']:.0f}s):"]
+        fields = [
+            ("FPS moyen", "avg_fps", "{:.1f}"),
+            ("1% low", "low_1pct_fps", "{:.1f}"),
+            ("0.1% low", "low_01pct_fps", "{:.1f}"),
+            ("Écart-type frame-time", "stdev_ms", "{:.2f} ms"),
+            ("Saccades", "stutters", "{}"),
+        ]
+        for label, key, fmt in fields:
+            current = fmt.format(after[key])
+            if before and key in before:
+                previous = before[key]
+                pct = (after[key] - previous) / previous * 100 if previous else 0.0
+                lines.append(f"   {label}: {fmt.format(previous)} → {current} ({pct:+.1f}%)")
+            else:
+                lines.append(f"   {label}: {current}")
+        return lines
@@ -0,0 +1,132 @@
+"""
+Échantillonnage multi-cadence: chaque capteur tourne dans son thread sur une échéance monotone.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+@dataclass
+class Sensor:
+    """
+    Un capteur et sa cadence; `read` peut bloquer sans retarder les autres capteurs.
+
+    `close` libère, dans le thread du capteur et à son arrêt, ce que `read` garde ouvert.
+    """
+
+    name: str
+    read: Callable[[], Any]
+    rate_hz: float
+    close: Optional[Callable[[], None]] = None
+
+    @property
+    def period(self) -> float:
+        return 1.0 / self.rate_hz
+
+
+@dataclass(frozen=True)
+class Reading:
+    value: Any
+    timestamp: float  # time.monotonic() à la fin de la lecture
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now if now is not None else time.monotonic()) - self.timestamp
+
+
+Listener = Callable[[str, Reading], None]
+
+
+def next_deadline(origin: float, period: float, now: float) -> float:
+    """Prochaine échéance origin + k·period strictement après now (les ticks manqués sont sautés)."""
+    ticks = math.floor((now - origin) / period) + 1
+    return origin + max(ticks, 1) * period
+
+
+class SamplingPipeline:
+    """
+    Lance un thread par capteur et conserve la dernière lecture de chacun.
+
+    Les échéances sont calculées depuis l'instant de départ (horloge monotone), donc la durée
+    d'une lecture ne fait pas dériver la cadence: un capteur trop lent saute simplement les
+    ticks dépassés. L'affichage lit `latest()` sans jamais attendre un capteur.
+    """
+
+    def __init__(self, sensors: Iterable[Sensor]) -> None:
+        self.sensors = list(sensors)
+        self._latest: Dict[str, Reading] = {}
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._ready = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Attend une première lecture de chaque capteur (ou l'expiration du délai)."""
+        return self._ready.wait(timeout)
+
+    def subscribe(self, listener: Listener) -> None:
+        """Appelé (dans le thread du capteur) à chaque nouvelle lecture."""
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        self._stop.clear()
+        origin = time.monotonic()
+        for sensor in self.sensors:
+            thread = threading.Thread(
+                target=self._loop, args=(sensor, origin), name=f"sensor-{sensor.name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            # Un capteur bloqué reste en arrière-plan (thread démon) sans bloquer l'arrêt.
+            thread.join(max(deadline - time.monotonic(), 0.0))
+        self._threads.clear()
+
+    def __enter__(self) -> "SamplingPipeline":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def latest(self) -> Dict[str, Reading]:
+        with self._lock:
+            return dict(self._latest)
+
+    def _loop(self, sensor: Sensor, origin: float) -> None:
+        try:
+            self._sample(sensor, origin)
+        finally:
+            if sensor.close is not None:
+                sensor.close()
+
+    def _sample(self, sensor: Sensor, origin: float) -> None:
+        deadline = origin
+        while not self._stop.is_set():
+            start = time.monotonic()
+            try:
+                reading = Reading(sensor.read(), time.monotonic(), time.monotonic() - start)
+            except Exception as exc:  # un capteur en erreur ne doit pas arrêter les autres
+                reading = Reading(None, time.monotonic(), time.monotonic() - start, error=str(exc))
+            with self._lock:
+                self._latest[sensor.name] = reading
+                if len(self._latest) == len(self.sensors):
+                    self._ready.set()
+            for listener in self._listeners:
+                listener(sensor.name, reading)
+            deadline = next_deadline(origin, sensor.period, max(time.monotonic(), deadline))
+            self._stop.wait(max(deadline - time.monotonic(), 0.0))
@@ -0,0 +1,115 @@
+"""
+Ordonnanceur d'étapes: dépendances, exclusions mutuelles et pool de threads borné.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .tracing import span
+
+
+@dataclass
+class Step:
+    """Une étape d'optimisation: `depends_on` doit être terminé avant, `conflicts_with` jamais en même temps."""
+
+    name: str
+    func: Callable[[], Any]
+    depends_on: Tuple[str, ...] = ()
+    conflicts_with: Tuple[str, ...] = ()
+
+
+@dataclass
+class StepResult:
+    name: str
+    value: Any = None
+    duration: float = 0.0
+    error: Optional[BaseException] = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def message(self) -> str:
+        if self.error is not None:
+            return f"{self.name}: échec ({self.error})"
+        return str(self.value)
+
+
+class StepScheduler:
+    """
+    Exécute les étapes prêtes en parallèle et rend les résultats dans l'ordre de déclaration.
+
+    Une étape en échec n'interrompt pas les autres: son exception est capturée dans son
+    StepResult et ses dépendantes s'exécutent quand même, comme dans une boucle try/except.
+    """
+
+    def __init__(self, steps: Sequence[Step], *, max_workers: int = 4) -> None:
+        self.steps = list(steps)
+        self.max_workers = max(max_workers, 1)
+        self._validate()
+
+    def _validate(self) -> None:
+        names = [step.name for step in self.steps]
+        if len(set(names)) != len(names):
+            raise ValueError("Noms d'étapes dupliqués")
+        known = set(names)
+        for step in self.steps:
+            unknown = set(step.depends_on) - known
+            if unknown:
+                raise ValueError(f"{step.name}: dépendances inconnues {sorted(unknown)}")
+        # Détection de cycle (parcours en profondeur)
+        state: Dict[str, int] = {}
+        graph = {step.name: step.depends_on for step in self.steps}
+
+        def visit(name: str) -> None:
+            if state.get(name) == 1:
+                raise ValueError(f"Cycle de dépendances autour de {name}")
+            if state.get(name) == 2:
+                return
+            state[name] = 1
+            for dep in graph[name]:
+                visit(dep)
+            state[name] = 2
+
+        for name in graph:
+            visit(name)
+
+    def _conflicts(self, step: Step, running: Sequence[Step]) -> bool:
+        return any(
+            other.name in step.conflicts_with or step.name in other.conflicts_with for other in running
+        )
+
+    @staticmethod
+    def _execute(step: Step) -> StepResult:
+        start = time.perf_counter()
+        try:
+            with span(step.name, "step"):
+                value = step.func()
+        except Exception as exc:  # capture pour continuer les autres étapes
+            return StepResult(step.name, duration=time.perf_counter() - start, error=exc)
+        return StepResult(step.name, value=value, duration=time.perf_counter() - start)
+
+    def run(self) -> List[StepResult]:
+        results: Dict[str, StepResult] = {}
+        pending = list(self.steps)
+        running: Dict[Future, Step] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for step in list(pending):
+                    if len(running) >= self.max_workers:
+                        break
+                    if any(dep not in results for dep in step.depends_on):
+                        continue
+                    if self._conflicts(step, list(running.values())):
+                        continue
+                    pending.remove(step)
+                    running[pool.submit(self._execute, step)] = step
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    results[step.name] = future.result()
+        return [results[step.name] for step in self.steps]
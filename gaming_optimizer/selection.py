@@ -0,0 +1,189 @@
+"""
+Sélection des serveurs: catalogue de cibles et modèle de latence EWMA par tranche horaire.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .config import (
+    LATENCY_MODEL_ALPHA,
+    LATENCY_MODEL_BUCKET_HOURS,
+    LATENCY_MODEL_FILE,
+    PING_TARGETS,
+    SERVER_CATALOG_FILE,
+)
+from .utils import load_json, save_json
+
+# Coût d'une perte totale, en ms équivalentes (1 % de pertes ≈ +10 ms)
+LOSS_PENALTY_MS = 1000.0
+ALL_DAY = "all"
+
+
+@dataclass
+class CatalogEntry:
+    name: str
+    host: str
+    region: str = ""
+
+
+def load_catalog(path: Path = SERVER_CATALOG_FILE) -> Dict[str, CatalogEntry]:
+    """Catalogue de serveurs; PING_TARGETS si le fichier est absent ou illisible."""
+    try:
+        raw = load_json(path)
+    except (OSError, json.JSONDecodeError):
+        raw = {}
+    entries: Dict[str, CatalogEntry] = {}
+    for name, value in (raw or PING_TARGETS).items():
+        if isinstance(value, str):
+            entries[name] = CatalogEntry(name, value)
+        elif isinstance(value, dict) and value.get("host"):
+            entries[name] = CatalogEntry(name, value["host"], value.get("region", ""))
+    return entries
+
+
+@dataclass
+class EwmaStats:
+    """
+    Moyenne et variance exponentiellement pondérées de la latence, plus taux de pertes.
+
+    `count` compte les séries observées, `samples` celles qui ont mesuré une latence: la
+    moyenne n'a de sens (et n'est initialisée) qu'à partir de la première d'entre elles.
+    """
+
+    mean: float = 0.0
+    variance: float = 0.0
+    loss: float = 0.0
+    count: int = 0
+    updated: str = ""
+    samples: int = 0
+
+    @property
+    def has_latency(self) -> bool:
+        return self.samples > 0
+
+    def update(self, latency: Optional[float], loss: float, alpha: float, when: dt.datetime) -> None:
+        if latency is not None:
+            if self.samples == 0:
+                self.mean, self.variance = latency, 0.0
+            else:
+                diff = latency - self.mean
+                increment = alpha * diff
+                self.mean += increment
+                self.variance = (1 - alpha) * (self.variance + diff * increment)
+            self.samples += 1
+        self.loss = loss if self.count == 0 else (1 - alpha) * self.loss + alpha * loss
+        self.count += 1
+        self.updated = when.isoformat()
+
+    def cost(self, spread: float = 1.0) -> float:
+        """Qualité attendue (ms, plus bas = mieux): moyenne + écart-type + pénalité de pertes."""
+        return self.mean + spread * math.sqrt(self.variance) + LOSS_PENALTY_MS * self.loss
+
+
+class LatencyModel:
+    """
+    Un EwmaStats par cible et tranche horaire (`bucket_hours`), plus un agrégat toutes heures.
+
+    La tranche horaire n'est utilisée qu'à partir de `min_bucket_samples` observations;
+    avant, l'agrégat sert d'estimation. Le modèle est persisté dans `LATENCY_MODEL_FILE`.
+    """
+
+    def __init__(
+        self,
+        path: Path = LATENCY_MODEL_FILE,
+        *,
+        alpha: float = LATENCY_MODEL_ALPHA,
+        bucket_hours: int = LATENCY_MODEL_BUCKET_HOURS,
+        min_bucket_samples: int = 3,
+    ) -> None:
+        self.path = path
+        self.alpha = alpha
+        self.bucket_hours = bucket_hours
+        self.min_bucket_samples = min_bucket_samples
+        self.targets: Dict[str, Dict[str, EwmaStats]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            raw = load_json(self.path)
+        except (OSError, json.JSONDecodeError):
+            raw = {}
+        for name, buckets in (raw.get("targets") or {}).items():
+            for stats in buckets.values():
+                # Fichier antérieur à `samples`: une moyenne nulle n'a jamais été mesurée.
+                stats.setdefault("samples", stats.get("count", 0) if stats.get("mean") else 0)
+            self.targets[name] = {bucket: EwmaStats(**stats) for bucket, stats in buckets.items()}
+
+    def save(self) -> None:
+        payload = {
+            "alpha": self.alpha,
+            "bucket_hours": self.bucket_hours,
+            "targets": {
+                name: {bucket: stats.__dict__ for bucket, stats in buckets.items()}
+                for name, buckets in self.targets.items()
+            },
+        }
+        save_json(self.path, payload)
+
+    def bucket(self, when: dt.datetime) -> str:
+        start = when.hour - when.hour % self.bucket_hours
+        return f"{start:02d}h"
+
+    def observe(self, name: str, latency: Optional[float], loss: float, when: Optional[dt.datetime] = None) -> None:
+        """Intègre le résultat d'une série (latence moyenne en ms, pertes en fraction 0..1)."""
+        when = when or dt.datetime.now()
+        buckets = self.targets.setdefault(name, {})
+        for key in (ALL_DAY, self.bucket(when)):
+            buckets.setdefault(key, EwmaStats()).update(latency, loss, self.alpha, when)
+
+    def estimate(self, name: str, when: Optional[dt.datetime] = None) -> Optional[EwmaStats]:
+        buckets = self.targets.get(name)
+        if not buckets:
+            return None
+        local = buckets.get(self.bucket(when or dt.datetime.now()))
+        if local is not None and local.samples >= self.min_bucket_samples:
+            return local
+        return buckets.get(ALL_DAY)
+
+    def rank(self, names: List[str], when: Optional[dt.datetime] = None) -> List[Tuple[str, float]]:
+        """Cibles ayant déjà répondu, triées par coût attendu croissant."""
+        scored = []
+        for name in names:
+            stats = self.estimate(name, when)
+            if stats is not None and stats.has_latency:
+                scored.append((name, stats.cost()))
+        return sorted(scored, key=lambda item: item[1])
+
+    def rank_regions(self, catalog: Mapping[str, CatalogEntry], when: Optional[dt.datetime] = None) -> List[Tuple[str, str, float]]:
+        """(région, meilleure cible, coût) par région du catalogue."""
+        best: Dict[str, Tuple[str, float]] = {}
+        for name, cost in self.rank(list(catalog), when):
+            region = catalog[name].region or name
+            if region not in best:
+                best[region] = (name, cost)
+        return sorted(((region, name, cost) for region, (name, cost) in best.items()), key=lambda item: item[2])
+
+    def select(self, names: List[str], top_k: int, explore: int, when: Optional[dt.datetime] = None) -> List[str]:
+        """
+        Les `top_k` meilleures cibles connues plus `explore` cibles d'exploration.
+
+        L'exploration va d'abord aux cibles jamais mesurées, puis aux estimations les plus
+        anciennes: tout le catalogue finit par être revisité sans être sondé à chaque série.
+        Tant que moins de `top_k` cibles ont un classement (modèle froid), l'exploration
+        complète la sélection jusqu'à `top_k + explore` cibles.
+        """
+        chosen = [name for name, _ in self.rank(names, when)[:top_k]]
+        remaining = [name for name in names if name not in chosen]
+
+        def staleness(name: str) -> Tuple[int, str]:
+            stats = self.estimate(name, when)
+            return (1, stats.updated) if stats is not None else (0, "")
+
+        chosen += sorted(remaining, key=staleness)[: top_k + explore - len(chosen)]
+        return chosen
+
@@ -0,0 +1,278 @@
+"""
+Sessions shell persistantes: un seul processus PowerShell (ou sh) réutilisé pour N commandes.
+
+Chaque commande est encadrée par un marqueur unique sur stdout et stderr, ce qui permet de
+récupérer sa sortie, ses erreurs et son code retour sans relancer d'interpréteur.
+"""
+from __future__ import annotations
+
+import base64
+import contextlib
+import itertools
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .utils import CommandError
+
+
+class ShellUnavailable(RuntimeError):
+    """Le shell ne peut pas être lancé: l'appelant doit repasser en un processus par commande."""
+
+
+class ShellTimeout(CommandError):
+    """La commande n'a pas rendu la main dans le délai imparti (la session est détruite)."""
+
+
+TIMEOUT_RETURNCODE = 124  # code de `timeout` (coreutils): commande expirée avec check=False
+
+
+class ShellDialect:
+    """Décrit comment lancer un shell lisant stdin et comment encadrer une commande."""
+
+    name = "shell"
+
+    def argv(self) -> List[str]:
+        raise NotImplementedError
+
+    def prelude(self) -> str:
+        return ""
+
+    def frame(self, script: str, token: str) -> str:
+        raise NotImplementedError
+
+
+class PowerShellDialect(ShellDialect):
+    name = "powershell"
+
+    def __init__(self, executable: str = "powershell") -> None:
+        self.executable = executable
+
+    def argv(self) -> List[str]:
+        return [self.executable, "-NoLogo", "-NoProfile", "-NonInteractive", "-Command", "-"]
+
+    def prelude(self) -> str:
+        return "[Console]::OutputEncoding = [Text.Encoding]::UTF8; $ProgressPreference = 'SilentlyContinue'\n"
+
+    def frame(self, script: str, token: str) -> str:
+        # Script transmis en base64: ni guillemets ni retours à la ligne à échapper.
+        encoded = base64.b64encode(script.encode("utf-8")).decode("ascii")
+        return (
+            "$global:LASTEXITCODE = 0; $__ok = $true; "
+            "try { Invoke-Expression ([Text.Encoding]::UTF8.GetString([Convert]::FromBase64String("
+            f"'{encoded}'))) 2>&1 | ForEach-Object {{ "
+            "if ($_ -is [System.Management.Automation.ErrorRecord]) { "
+            "[Console]::Error.WriteLine($_.ToString()); "
+            "if ($_.FullyQualifiedErrorId -notlike 'NativeCommandError*') { $__ok = $false } } "
+            "else { $_ | Out-String -Stream | ForEach-Object { [Console]::Out.WriteLine($_) } } } } "
+            "catch { [Console]::Error.WriteLine($_.ToString()); $__ok = $false }; "
+            "$__rc = if ($LASTEXITCODE) { $LASTEXITCODE } elseif ($__ok) { 0 } else { 1 }; "
+            f"[Console]::Out.WriteLine(''); [Console]::Out.WriteLine('{token} ' + $__rc); "
+            f"[Console]::Error.WriteLine(''); [Console]::Error.WriteLine('{token}')\n"
+        )
+
+
+class PosixShellDialect(ShellDialect):
+    """sh/bash: sert de remplaçant à PowerShell pour tester les sessions sous Linux."""
+
+    name = "sh"
+
+    def __init__(self, executable: str = "sh") -> None:
+        self.executable = executable
+
+    def argv(self) -> List[str]:
+        return [self.executable, "-s"]
+
+    def frame(self, script: str, token: str) -> str:
+        return (
+            f"{{ {script}\n}} </dev/null\n"
+            "__rc=$?\n"
+            f"printf '\\n%s %d\\n' '{token}' \"$__rc\"\n"
+            f"printf '\\n%s\\n' '{token}' >&2\n"
+        )
+
+
+class ShellSession:
+    """Un interpréteur long-vivant qui exécute les commandes une par une via stdin."""
+
+    def __init__(self, dialect: ShellDialect, *, timeout: Optional[float] = 120.0) -> None:
+        self.dialect = dialect
+        self.timeout = timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._stdout: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._session_id = uuid.uuid4().hex
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> None:
+        if self.alive:
+            return
+        try:
+            self._proc = subprocess.Popen(
+                self.dialect.argv(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+            )
+        except OSError as exc:
+            raise ShellUnavailable(f"Impossible de lancer {self.dialect.name}: {exc}") from exc
+        self._stdout = queue.Queue()
+        self._stderr = queue.Queue()
+        for stream, sink in ((self._proc.stdout, self._stdout), (self._proc.stderr, self._stderr)):
+            threading.Thread(target=self._pump, args=(stream, sink), daemon=True).start()
+        prelude = self.dialect.prelude()
+        if prelude:
+            self._send(prelude)
+
+    @staticmethod
+    def _pump(stream, sink: "queue.Queue[Optional[str]]") -> None:
+        for line in iter(stream.readline, ""):
+            sink.put(line)
+        sink.put(None)  # EOF: le shell s'est terminé
+
+    def _send(self, text: str) -> None:
+        try:
+            self._proc.stdin.write(text)
+            self._proc.stdin.flush()
+        except (OSError, ValueError) as exc:
+            self.close()
+            raise ShellUnavailable(f"Session {self.dialect.name} interrompue: {exc}") from exc
+
+    def run(self, script: str, *, check: bool = True, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """
+        Avec check=False, un délai dépassé ne lève pas: échec (TIMEOUT_RETURNCODE, message dans
+        stderr) comme tout autre code non nul; la session est relancée à la commande suivante.
+        """
+        with self._lock:
+            self.start()
+            token = f"__GO_{self._session_id}_{next(self._counter)}__"
+            self._send(self.dialect.frame(script, token))
+            limit = timeout if timeout is not None else self.timeout
+            # Une seule échéance pour les deux flux: stderr n'obtient que le temps restant.
+            deadline = time.monotonic() + limit if limit is not None else None
+            try:
+                stdout, returncode = self._collect(self._stdout, token, limit, deadline)
+                stderr, _ = self._collect(self._stderr, token, limit, deadline)
+            except ShellTimeout as exc:
+                if check:
+                    raise
+                return subprocess.CompletedProcess(script, TIMEOUT_RETURNCODE, "", str(exc))
+            if returncode is None:
+                # Le shell est mort pendant la commande (exit, erreur fatale...).
+                returncode = self._proc.wait() if self._proc else 1
+                self.close()
+        process = subprocess.CompletedProcess(script, returncode, stdout, stderr)
+        if check and returncode != 0:
+            raise CommandError(f"Commande {script} échouée: {stderr.strip()}")
+        return process
+
+    def _collect(
+        self,
+        source: "queue.Queue[Optional[str]]",
+        token: str,
+        timeout: Optional[float],
+        deadline: Optional[float],
+    ) -> Tuple[str, Optional[int]]:
+        """Lit jusqu'au marqueur avant `deadline`; code None si le shell s'est terminé avant de l'écrire."""
+        marker = re.compile(rf"^{re.escape(token)}(?: (-?\d+))?\r?\n?$")
+        lines: List[str] = []
+        while True:
+            try:
+                remaining = max(deadline - time.monotonic(), 0.0) if deadline is not None else None
+                line = source.get(timeout=remaining)
+            except queue.Empty:
+                self.close()
+                raise ShellTimeout(f"Session {self.dialect.name}: délai dépassé ({timeout}s)")
+            if line is None:
+                source.put(None)  # garde l'EOF visible pour la lecture suivante
+                return "".join(lines), None
+            match = marker.match(line)
+            if match:
+                text = "".join(lines)
+                # Retire le saut de ligne ajouté avant le marqueur.
+                if text.endswith("\r\n"):
+                    text = text[:-2]
+                elif text.endswith("\n"):
+                    text = text[:-1]
+                return text, int(match.group(1)) if match.group(1) is not None else 0
+            lines.append(line)
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        with contextlib.suppress(OSError, ValueError):
+            proc.stdin.close()
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def __enter__(self) -> "ShellSession":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SessionPool:
+    """Jeu borné de sessions réutilisables, une par commande en cours (sûr entre threads)."""
+
+    def __init__(self, dialect: ShellDialect, *, size: int = 4, timeout: Optional[float] = 120.0) -> None:
+        self.dialect = dialect
+        self.size = max(size, 1)
+        self.timeout = timeout
+        self._idle: List[ShellSession] = []
+        self._created = 0
+        self._cond = threading.Condition()
+
+    @contextlib.contextmanager
+    def acquire(self) -> Iterator[ShellSession]:
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                self._cond.wait()
+            if self._idle:
+                session = self._idle.pop()
+            else:
+                session = ShellSession(self.dialect, timeout=self.timeout)
+                self._created += 1
+        try:
+            yield session
+        finally:
+            with self._cond:
+                self._idle.append(session)
+                self._cond.notify()
+
+    def run(self, script: str, *, check: bool = True, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        with self.acquire() as session:
+            return session.run(script, check=check, timeout=timeout)
+
+    def close(self) -> None:
+        with self._cond:
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            session.close()
+
+
+def find_executable(candidates: Sequence[str]) -> Optional[str]:
+    for name in candidates:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
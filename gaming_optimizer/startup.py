@@ -0,0 +1,164 @@
+"""
+Benchmark du démarrage de la CLI: temps d'import et délai avant la première sortie.
+
+    python -m gaming_optimizer.startup [--runs 5]
+
+Chaque mesure est faite dans un interpréteur neuf, sur des chemins qui produisent une vraie
+sortie: `monitor --replay` d'un enregistrement généré et `network-test` sur le réseau simulé.
+Code de retour 1 si une médiane dépasse STARTUP_BUDGET_MS ou si `import gaming_optimizer.cli`
+charge un module de STARTUP_LAZY_MODULES.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from .config import STARTUP_BUDGET_MS, STARTUP_LAZY_MODULES
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import gaming_optimizer.cli
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({"ms": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+# `network-test` complet, mais sondes simulées (instantanées) et état écrit dans un dossier jetable.
+_SIMULATED_NETWORK_TEST = """
+import sys
+from pathlib import Path
+from gaming_optimizer import cli, main
+from gaming_optimizer.admin import AdminManager
+from gaming_optimizer.history import HistoryStore
+from gaming_optimizer.network import NetworkAnalyzer
+from gaming_optimizer.probes import SimulatedBackend
+from gaming_optimizer.selection import LatencyModel
+from gaming_optimizer.storage import StorageManager
+
+work = Path(sys.argv[1])
+AdminManager.verified = True
+storage = StorageManager(work / "backup.json", HistoryStore(work / "history", legacy_path=None))
+main.GamingOptimizer.network = NetworkAnalyzer(
+    storage=storage, backend=SimulatedBackend(seed=1), model=LatencyModel(work / "model.json")
+)
+cli.main(["--local", "network-test"])
+"""
+
+
+@dataclass
+class StartupResult:
+    name: str
+    budget: float  # ms
+    samples: List[float] = field(default_factory=list)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples) if self.samples else float("inf")
+
+    @property
+    def ok(self) -> bool:
+        return self.median <= self.budget
+
+
+def measure_import(runs: int = 5) -> Tuple[StartupResult, List[str]]:
+    """Durée de `import gaming_optimizer.cli` et modules paresseux chargés malgré tout."""
+    result = StartupResult("import gaming_optimizer.cli", STARTUP_BUDGET_MS["import"])
+    loaded: List[str] = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE % (tuple(STARTUP_LAZY_MODULES),)],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        payload = json.loads(output.strip().splitlines()[-1])
+        result.samples.append(payload["ms"])
+        loaded = payload["loaded"]
+    return result, loaded
+
+
+def time_to_first_output(argv: Sequence[str], runs: int = 5, *, name: Optional[str] = None) -> StartupResult:
+    """
+    Lancement jusqu'au premier octet écrit: `python -m gaming_optimizer ARGV`, ou ARGV tel quel
+    (après l'interpréteur) lorsqu'il commence par une option comme `-c`.
+    """
+    command = list(argv) if argv and argv[0] == "-c" else ["-m", "gaming_optimizer", *argv]
+    result = StartupResult(name or " ".join(argv), STARTUP_BUDGET_MS["first_output"])
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, *command],
+            cwd=PROJECT_ROOT,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        try:
+            first = proc.stdout.read(1)  # type: ignore[union-attr]
+            elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            proc.kill()
+            proc.wait()
+        if first:
+            result.samples.append(elapsed)
+    return result
+
+
+def write_replay_fixture(path: Path, *, samples: int = 600) -> Path:
+    """Enregistrement monitor de `samples` secondes (ping, CPU, RAM, GPU et deux cœurs)."""
+    from .recorder import RingRecorder
+
+    origin = time.time() - samples
+    with RingRecorder(path, cores=2, size_mb=1) as recorder:
+        for i in range(samples):
+            ping = None if i % 50 == 0 else 20.0 + i % 7
+            recorder.append(origin + i, {"ping": ping, "cpu": 30 + i % 20, "ram": 55, "gpu": 60}, [25.0, 35.0])
+    return path
+
+
+def default_commands(workdir: Path) -> List[Tuple[str, List[str]]]:
+    """(libellé, argv) des chemins mesurés; les fichiers nécessaires sont créés dans `workdir`."""
+    commands = [("--help", ["--help"])]
+    try:
+        import numpy  # noqa: F401  (relecture d'un enregistrement)
+    except ImportError:
+        pass
+    else:
+        fixture = write_replay_fixture(workdir / "monitor.ring")
+        commands.append(("monitor --replay", ["--local", "monitor", "--replay", str(fixture)]))
+    commands.append(("network-test (simulé)", ["-c", _SIMULATED_NETWORK_TEST, str(workdir)]))
+    return commands
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m gaming_optimizer.startup", description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="Mesures par commande (médiane).")
+    args = parser.parse_args(argv)
+
+    imported, loaded = measure_import(args.runs)
+    with tempfile.TemporaryDirectory(prefix="go-startup-") as workdir:
+        results = [imported] + [
+            time_to_first_output(argv, args.runs, name=name) for name, argv in default_commands(Path(workdir))
+        ]
+    print("[DÉMARRAGE CLI]")
+    for result in results:
+        status = "OK" if result.ok else "DÉPASSÉ"
+        print(f"{result.name:<32} {result.median:7.1f} ms (budget {result.budget:.0f} ms) {status}")
+    if loaded:
+        print(f"⚠ Modules chargés dès l'import de la CLI: {', '.join(loaded)}")
+    return 0 if all(result.ok for result in results) and not loaded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
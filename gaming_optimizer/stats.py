@@ -0,0 +1,218 @@
+"""
+Statistiques en flux: moyenne/variance de Welford et quantiles P² en mémoire bornée.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+Z95 = 1.96
+
+
+def exact_quantile(sorted_values: Sequence[float], p: float) -> float:
+    """Quantile par interpolation linéaire sur une séquence déjà triée."""
+    if not sorted_values:
+        raise ValueError("séquence vide")
+    pos = (len(sorted_values) - 1) * p
+    lower = int(math.floor(pos))
+    upper = min(lower + 1, len(sorted_values) - 1)
+    frac = pos - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * frac
+
+
+# Quantiles bilatéraux à 95 % de la loi de Student, ddl 1..30
+_T95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+def t_critical(dof: int) -> float:
+    if dof < 1:
+        return math.inf
+    return _T95[dof - 1] if dof <= len(_T95) else Z95
+
+
+def wilson_interval(events: int, trials: int, z: float = Z95) -> Tuple[float, float]:
+    """Intervalle de Wilson d'une proportion: reste informatif à 0 % ou 100 % et sur peu d'essais."""
+    if trials <= 0:
+        return 0.0, 1.0
+    p = events / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(center - half, 0.0), min(center + half, 1.0)
+
+
+class RunningStats:
+    """Moyenne, variance, min et max en O(1) par échantillon (algorithme de Welford)."""
+
+    __slots__ = ("count", "mean", "_m2", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, count: int, mean: float, m2: float, minimum: float, maximum: float) -> None:
+        """Fusionne les moments d'un lot déjà agrégé (formule de Chan et al.)."""
+        if not count:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.minimum = min(self.minimum, minimum)
+        self.maximum = max(self.maximum, maximum)
+
+    @property
+    def variance(self) -> float:
+        """Variance de population (équivalent de statistics.pvariance)."""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def sample_variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Estimateur P² (Jain & Chlamtac) d'un quantile: cinq marqueurs, O(1) mémoire et temps.
+
+    Les `exact_limit` premiers échantillons sont gardés tels quels (quantile exact), puis
+    servent à initialiser les marqueurs.
+    """
+
+    __slots__ = ("p", "exact_limit", "_initial", "_heights", "_positions", "_desired", "_increments")
+
+    def __init__(self, p: float, *, exact_limit: int = 128) -> None:
+        if not 0.0 < p < 1.0:
+            raise ValueError("p doit être dans ]0, 1[")
+        self.p = p
+        self.exact_limit = max(exact_limit, 5)
+        self._initial: List[float] = []
+        self._heights: Optional[List[float]] = None
+        self._positions: List[int] = []
+        self._desired: List[float] = []
+        self._increments: List[float] = []
+
+    def _start_markers(self) -> None:
+        values = sorted(self._initial)
+        last = len(values) - 1
+        p = self.p
+        ranks = [0.0, last * p / 2, last * p, last * (1 + p) / 2, float(last)]
+        positions = [int(round(r)) for r in ranks]
+        for i in (1, 2, 3):
+            # Marqueurs strictement croissants, exigé par les formules d'ajustement.
+            positions[i] = min(max(positions[i], positions[i - 1] + 1), last - (4 - i))
+        self._heights = [values[i] for i in positions]
+        self._positions = positions
+        self._desired = ranks
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+        self._initial = []
+
+    def add(self, value: float) -> None:
+        heights = self._heights
+        if heights is None:
+            self._initial.append(value)
+            if len(self._initial) >= self.exact_limit:
+                self._start_markers()
+            return
+        positions = self._positions
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        desired = self._desired
+        for i in range(5):
+            desired[i] += self._increments[i]
+        for i in (1, 2, 3):
+            offset = desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or (
+                offset <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if offset > 0 else -1
+                candidate = self._parabolic(i, step)
+                if heights[i - 1] < candidate < heights[i + 1]:
+                    heights[i] = candidate
+                else:
+                    heights[i] += step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if self._heights is not None:
+            return self._heights[2]
+        if not self._initial:
+            return None
+        return exact_quantile(sorted(self._initial), self.p)
+
+
+class LatencyAccumulator:
+    """
+    Agrège des latences en flux: Welford + sketchs P² pour p50/p95/p99.
+
+    keep_samples conserve en plus les valeurs brutes dans un array('d') compact.
+    """
+
+    __slots__ = ("stats", "_sketches", "samples")
+
+    def __init__(self, *, quantiles: Iterable[float] = DEFAULT_QUANTILES, keep_samples: bool = False) -> None:
+        self.stats = RunningStats()
+        self._sketches: Dict[float, P2Quantile] = {q: P2Quantile(q) for q in quantiles}
+        self.samples: Optional[array] = array("d") if keep_samples else None
+
+    def add(self, value: float) -> None:
+        self.stats.add(value)
+        for sketch in self._sketches.values():
+            sketch.add(value)
+        if self.samples is not None:
+            self.samples.append(value)
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    @property
+    def count(self) -> int:
+        return self.stats.count
+
+    def quantile(self, p: float) -> Optional[float]:
+        sketch = self._sketches.get(p)
+        if sketch is None:
+            raise KeyError(f"quantile {p} non suivi")
+        return sketch.value()
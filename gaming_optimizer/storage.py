@@ -3,43 +3,180 @@ Gestion des sauvegardes et rapports.
 """
 from __future__ import annotations
 
+import contextlib
 import datetime as dt
+import json
+import os
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import IO, Any, Dict, Iterator, Optional
 
-from .config import BACKUP_FILE, NETWORK_LOG, REPORT_DIR
-from .utils import load_json, save_json
+from .config import BACKUP_FILE, REPORT_DIR
+from .history import HistoryStore
+from .tracing import span
+from .utils import load_json, open_append, save_json
 
 
 class StorageManager:
-    """Centralise la persistence des données."""
+    """
+    Centralise la persistence des données.
 
-    def __init__(self, backup_path: Path = BACKUP_FILE) -> None:
+    Chaque snapshot est ajouté à un journal (`system_backup.journal`) synchronisé sur disque;
+    le fichier de sauvegarde complet n'est réécrit (atomiquement) qu'au compactage. L'état
+    lu au démarrage est toujours: sauvegarde + rejeu du journal, une ligne tronquée étant ignorée.
+    """
+
+    def __init__(
+        self,
+        backup_path: Path = BACKUP_FILE,
+        history: HistoryStore | None = None,
+        *,
+        compact_after: int = 32,
+    ) -> None:
         self.backup_path = backup_path
-        self.data = load_json(backup_path)
+        self.journal_path = backup_path.with_suffix(".journal")
+        self.compact_after = compact_after
+        self.history = history or HistoryStore()
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._journal: Optional[IO[str]] = None
+        self._journal_entries = 0
+        self.data = self._load()
+        self._seen = self._signature()
+
+    # ---------- Chargement ----------
+    def _load(self) -> Dict[str, Any]:
+        try:
+            data = load_json(self.backup_path)
+        except json.JSONDecodeError:
+            data = {}  # ancienne écriture non atomique interrompue
+        for record in self._read_journal():
+            self._apply(data, record)
+            self._journal_entries += 1
+        return data
+
+    def _signature(self) -> tuple:
+        """(mtime, taille) de la sauvegarde et du journal: détecte les écritures d'autres processus."""
+        stats = []
+        for path in (self.backup_path, self.journal_path):
+            try:
+                stat = path.stat()
+            except OSError:
+                stats.append(None)
+            else:
+                stats.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stats)
+
+    def refresh(self) -> bool:
+        """
+        Relit l'état si un autre processus l'a modifié depuis la dernière lecture/écriture.
+
+        Pour un processus résident (agent) qui partage `storage/` avec des commandes locales.
+        """
+        with self._lock:
+            if self._journal is not None or self._batch_depth:
+                return False
+            signature = self._signature()
+            if signature == self._seen:
+                return False
+            self._journal_entries = 0
+            self.data = self._load()
+            self._seen = signature
+            return True
+
+    def _read_journal(self) -> Iterator[Dict[str, Any]]:
+        if not self.journal_path.exists():
+            return
+        with open(self.journal_path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # dernière ligne tronquée par un crash
+                if isinstance(record, dict) and "key" in record:
+                    yield record
+
+    @staticmethod
+    def _apply(data: Dict[str, Any], record: Dict[str, Any]) -> None:
+        data.setdefault("snapshots", {})
+        data["snapshots"][record["key"]] = record.get("payload", {})
 
+    # ---------- Snapshots ----------
     def snapshot(self, key: str, payload: Dict[str, Any]) -> None:
-        self.data.setdefault("snapshots", {})
-        self.data["snapshots"][key] = payload
-        save_json(self.backup_path, self.data)
+        record = {"key": key, "payload": payload}
+        with self._lock:
+            self._apply(self.data, record)
+            self._write_journal(record)
+            if not self._batch_depth:
+                self.flush()
 
     def get_snapshot(self, key: str) -> Dict[str, Any]:
-        return self.data.get("snapshots", {}).get(key, {})
+        with self._lock:
+            return self.data.get("snapshots", {}).get(key, {})
 
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["StorageManager"]:
+        """
+        Regroupe les snapshots du bloc: un seul fsync (et compactage éventuel) à la sortie.
+
+        Chaque entrée est tout de même transmise à l'OS dès l'appel, donc un crash du
+        processus en plein bloc ne perd pas l'état d'origine nécessaire à `restore`.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self.flush()
+
+    def _write_journal(self, record: Dict[str, Any]) -> None:
+        if self._journal is None:
+            self._journal = open_append(self.journal_path)
+        with span("storage.journal", "storage", key=record.get("key")):
+            self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._journal.flush()
+        self._journal_entries += 1
+
+    def flush(self) -> None:
+        """Synchronise le journal sur disque, puis compacte s'il a trop grossi."""
+        with self._lock:
+            if self._journal is None:
+                return
+            with span("storage.fsync", "storage"):
+                os.fsync(self._journal.fileno())
+            self._journal.close()
+            self._journal = None
+            if self._journal_entries >= self.compact_after:
+                self.compact()
+            self._seen = self._signature()
+
+    def compact(self) -> None:
+        """Réécrit la sauvegarde complète (temporaire + renommage) puis vide le journal."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            save_json(self.backup_path, self.data)
+            # Un crash avant cette ligne ne fait que rejouer des entrées déjà intégrées.
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self._journal_entries = 0
+            self._seen = self._signature()
+
+    # ---------- Historique / rapports ----------
     def append_network_report(self, report: Dict[str, Any]) -> None:
-        payload = load_json(NETWORK_LOG)
-        payload.setdefault("reports", [])
-        payload["reports"].append(
-            {
-                "timestamp": dt.datetime.utcnow().isoformat(),
-                **report,
-            }
-        )
-        save_json(NETWORK_LOG, payload)
+        self.history.append(report)
+
+    def iter_network_reports(
+        self, start: Optional[dt.datetime] = None, end: Optional[dt.datetime] = None
+    ) -> Iterator[Dict[str, Any]]:
+        return self.history.iter_reports(start, end)
 
     def export_report_text(self, name: str, content: str) -> Path:
         REPORT_DIR.mkdir(parents=True, exist_ok=True)
         path = REPORT_DIR / f"{name}_{dt.datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.txt"
         path.write_text(content, encoding="utf-8")
         return path
-
@@ -3,34 +3,64 @@ Optimisations TCP/IP, alimentation, services, DNS et fonctionnalités Windows.
 """
 from __future__ import annotations
 
+import json
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
 import psutil
 
-from .config import BACKGROUND_SERVICES, DNS_SERVERS, GAME_PROCESS_NAMES
+from .config import BACKGROUND_SERVICES, DNS_BENCH_FILE, DNS_BENCH_MAX_AGE, DNS_SERVERS, GAME_PROCESS_NAMES, TCP_GLOBALS
+from .dnsbench import DnsBenchmark, parse_server
+from .plan import DNS_ADAPTERS_QUERY, OptimizationPlan, SystemStateProbe, compute_plan
 from .storage import StorageManager
-from .utils import powershell, run_command
+from .utils import load_json, powershell, run_command, save_json
 
 
 class SystemOptimizer:
     """Regroupe les différents leviers système."""
 
-    def __init__(self, storage: StorageManager | None = None) -> None:
+    def __init__(self, storage: StorageManager | None = None, *, dns_bench_path: Path = DNS_BENCH_FILE) -> None:
         self.storage = storage or StorageManager()
+        self.dns_bench_path = dns_bench_path
         self.current_state: dict = {}
+        self.plan: Optional[OptimizationPlan] = None
+        # (paire DNS, note) choisie par probe_state: le plan et optimize_dns visent la même cible
+        self.dns_choice: Optional[Tuple[Tuple[str, str], str]] = None
+
+    # ---------- Plan ----------
+    def probe_state(self) -> OptimizationPlan:
+        """Lit l'état courant en une passe; les étapes suivantes n'appliquent que le diff."""
+        self.dns_choice = self.select_dns_servers()
+        self.plan = compute_plan(SystemStateProbe().read(), dns_servers=self.dns_choice[0])
+        return self.plan
+
+    def clear_plan(self) -> None:
+        """Oublie le plan et la paire DNS retenue: la prochaine passe relit tout."""
+        self.plan = None
+        self.dns_choice = None
+
+    def _needs(self, category: str, key: str) -> bool:
+        return self.plan is None or self.plan.needs(category, key)
 
     # ---------- TCP/IP ----------
     def snapshot_tcp(self) -> None:
-        output = run_command(["netsh", "int", "tcp", "show", "global"], check=False).stdout
+        if self.plan is not None:
+            output = self.plan.state.tcp_raw
+        else:
+            output = run_command(["netsh", "int", "tcp", "show", "global"], check=False).stdout
         self.current_state["tcp"] = output
         self.storage.snapshot("tcp", {"raw": output})
 
     def optimize_tcp(self) -> str:
-        self.snapshot_tcp()
         commands = [
-            ["netsh", "int", "tcp", "set", "global", "autotuninglevel=normal"],
-            ["netsh", "int", "tcp", "set", "global", "ecncapability=enabled"],
-            ["netsh", "int", "tcp", "set", "global", "dca=enabled"],
-            ["netsh", "int", "tcp", "set", "global", "chimney=enabled"],
+            ["netsh", "int", "tcp", "set", "global", f"{key}={value}"]
+            for key, value in TCP_GLOBALS.items()
+            if self._needs("tcp", key)
         ]
+        if not commands:
+            return "Paramètres TCP déjà optimisés"
+        self.snapshot_tcp()
         for cmd in commands:
             run_command(cmd)
         return "Paramètres TCP optimisés"
@@ -44,11 +74,16 @@ class SystemOptimizer:
 
     # ---------- Énergie ----------
     def snapshot_power_plan(self) -> None:
-        output = run_command(["powercfg", "/GETACTIVESCHEME"], check=False).stdout.strip()
+        if self.plan is not None:
+            output = self.plan.state.power_raw.strip()
+        else:
+            output = run_command(["powercfg", "/GETACTIVESCHEME"], check=False).stdout.strip()
         self.current_state["power_plan"] = output
         self.storage.snapshot("power_plan", {"scheme": output})
 
     def optimize_power_plan(self) -> str:
+        if not self._needs("power", "scheme"):
+            return "Plan d'énergie déjà sur Performance maximale"
         self.snapshot_power_plan()
         run_command(["powercfg", "/SETACTIVE", "SCHEME_MIN"])
         return "Plan d'énergie réglé sur Performance maximale"
@@ -65,22 +100,61 @@ class SystemOptimizer:
 
     # ---------- Services ----------
     def disable_background_services(self) -> str:
+        services = [svc for svc in BACKGROUND_SERVICES if self._needs("service", svc)]
+        if not services:
+            return "Services d'arrière-plan déjà inactifs"
         count = 0
-        for svc in BACKGROUND_SERVICES:
+        for svc in services:
             powershell(f"Stop-Service -Name {svc} -Force -ErrorAction SilentlyContinue", check=False)
             powershell(
                 f"Set-Service -Name {svc} -StartupType Manual -ErrorAction SilentlyContinue", check=False
             )
             count += 1
-        self.storage.snapshot("services", {"disabled": BACKGROUND_SERVICES})
+        self.storage.snapshot("services", {"disabled": services})
         return f"Services inactifs: {count}/{len(BACKGROUND_SERVICES)}"
 
     # ---------- DNS ----------
-    def optimize_dns(self, servers: tuple[str, str] = DNS_SERVERS) -> str:
-        adapters = powershell(
-            "Get-DnsClientServerAddress -AddressFamily IPv4 | Select-Object -ExpandProperty InterfaceAlias",
-            check=False,
-        ).stdout.splitlines()
+    def select_dns_servers(self, *, max_age: float = DNS_BENCH_MAX_AGE) -> tuple[tuple[str, str], str]:
+        """
+        Meilleure paire du benchmark DNS (repli: DNS_SERVERS) et une note pour le rapport.
+
+        Une paire mesurée il y a moins de `max_age` secondes est réutilisée: un optimize
+        répété ne relance pas le benchmark. La mesure est gardée dans `dns_bench_path`, hors du
+        journal de sauvegarde (ce n'est pas un état système à restaurer).
+        """
+        try:
+            cached = load_json(self.dns_bench_path)
+        except (OSError, json.JSONDecodeError):
+            cached = {}
+        if cached and 0 <= time.time() - cached.get("measured", 0) < max_age:
+            return tuple(cached["servers"]), f"{cached['note']}, mesure réutilisée"  # type: ignore[return-value]
+        try:
+            ranking = DnsBenchmark().run()
+        except OSError as exc:
+            return DNS_SERVERS, f"benchmark impossible ({exc}), valeurs par défaut"
+        pair = DnsBenchmark.best_pair(ranking)
+        if pair is None:
+            return DNS_SERVERS, "aucun résolveur n'a répondu, valeurs par défaut"
+        best = ranking[0]
+        servers = (parse_server(pair[0])[0], parse_server(pair[1])[0])
+        note = f"médiane {best.median:.1f} ms, p95 {best.p95:.1f} ms"
+        save_json(self.dns_bench_path, {"servers": list(servers), "note": note, "measured": time.time()})
+        return servers, note
+
+    def optimize_dns(self, servers: tuple[str, str] | None = None) -> str:
+        note = ""
+        if servers is None:
+            servers, note = self.dns_choice or self.select_dns_servers()
+            note = f" [benchmark: {note}]"
+        if self.plan is not None:
+            adapters = [alias for alias, current in self.plan.state.dns.items() if tuple(current) != tuple(servers)]
+            if not adapters:
+                return f"DNS déjà configurés ({servers[0]}, {servers[1]}){note}"
+        else:
+            adapters = powershell(
+                f"{DNS_ADAPTERS_QUERY} | Select-Object -ExpandProperty InterfaceAlias",
+                check=False,
+            ).stdout.splitlines()
         updated = 0
         for adapter in adapters:
             alias = adapter.strip()
@@ -93,7 +167,7 @@ class SystemOptimizer:
             )
             updated += 1
         self.storage.snapshot("dns", {"servers": servers})
-        return f"DNS configurés ({servers[0]}, {servers[1]}) sur {updated} interface(s)"
+        return f"DNS configurés ({servers[0]}, {servers[1]}) sur {updated} interface(s){note}"
 
     # ---------- Mode Jeu / DVR ----------
     def toggle_windows_game_features(self, enable: bool) -> None:
@@ -110,6 +184,8 @@ class SystemOptimizer:
         )
 
     def optimize_windows_gaming(self) -> str:
+        if self.plan is not None and not self.plan.pending("game"):
+            return "Mode Jeu/DVR déjà configurés"
         self.toggle_windows_game_features(True)
         self.storage.snapshot("game_features", {"enabled": True})
         return "Mode Jeu activé, DVR désactivé"
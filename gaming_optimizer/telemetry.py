@@ -0,0 +1,206 @@
+"""
+Sources de télémétrie GPU: connexion WMI unique, capteurs résolus une fois, reconnexion avec backoff.
+"""
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import wmi  # type: ignore
+except ImportError:
+    wmi = None
+
+from .tracing import span
+
+OHM_NAMESPACE = "root\\OpenHardwareMonitor"
+
+# Champ de GPUReading -> (SensorType, mots-clés du nom) dans OpenHardwareMonitor, par ordre de préférence
+_SENSOR_MATCHES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "temp": ("Temperature", ("GPU Core", "GPU")),
+    "load": ("Load", ("GPU Core",)),
+    "clock": ("Clock", ("GPU Core",)),
+    "vram": ("SmallData", ("GPU Memory Used",)),
+}
+_NO_SENSOR = "aucun capteur GPU"
+
+
+@dataclass(frozen=True)
+class GPUReading:
+    temp: Optional[float] = None  # °C
+    load: Optional[float] = None  # %
+    clock: Optional[float] = None  # MHz
+    vram: Optional[float] = None  # Mo utilisés
+    error: Optional[str] = None
+
+    @property
+    def has_data(self) -> bool:
+        return any(value is not None for value in (self.temp, self.load, self.clock, self.vram))
+
+    def __str__(self) -> str:
+        if self.error:
+            return self.error
+        if not self.has_data:
+            return "N/A"
+        parts = []
+        if self.temp is not None:
+            parts.append(f"{self.temp:.0f}°C")
+        if self.load is not None:
+            parts.append(f"{self.load:.0f}%")
+        if self.clock is not None:
+            parts.append(f"{self.clock:.0f} MHz")
+        if self.vram is not None:
+            parts.append(f"{self.vram:.0f} Mo")
+        return " ".join(parts)
+
+
+class TelemetrySource:
+    """Interface: `read()` ne lève jamais, les erreurs sont rapportées dans GPUReading.error."""
+
+    def read(self) -> GPUReading:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class WmiTelemetrySource(TelemetrySource):
+    """
+    Interroge OpenHardwareMonitor via WMI.
+
+    La connexion et la recherche des capteurs GPU (énumération complète) ne sont faites
+    qu'une fois; chaque lecture est ensuite une seule requête WQL limitée aux identifiants
+    retenus. En cas d'échec, la connexion est abandonnée et retentée après un délai qui
+    double à chaque échec (`backoff` → `max_backoff`).
+    """
+
+    def __init__(
+        self,
+        namespace: str = OHM_NAMESPACE,
+        *,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        connect: Optional[Callable[[], object]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.namespace = namespace
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._connect = connect or self._wmi_connect
+        self._clock = clock
+        self._connection: Optional[object] = None
+        self._sensors: Dict[str, str] = {}  # identifiant WMI -> champ de GPUReading
+        self._query = ""
+        self._delay = backoff
+        self._retry_at = 0.0
+        self._last_error = ""
+
+    def _wmi_connect(self) -> object:
+        try:
+            import pythoncom  # type: ignore
+
+            pythoncom.CoInitialize()  # COM par thread: la lecture tourne dans le thread du capteur
+        except ImportError:
+            pass
+        return wmi.WMI(namespace=self.namespace)
+
+    def _resolve(self, connection: object) -> Dict[str, str]:
+        sensors = list(connection.Sensor())  # type: ignore[attr-defined]
+        chosen: Dict[str, str] = {}
+        for field_name, (sensor_type, keywords) in _SENSOR_MATCHES.items():
+            for keyword in keywords:
+                match = next((s for s in sensors if s.SensorType == sensor_type and keyword in s.Name), None)
+                if match is not None:
+                    chosen[match.Identifier] = field_name
+                    break
+        return chosen
+
+    def _ensure_connected(self) -> bool:
+        if self._connection is not None:
+            return True
+        if self._clock() < self._retry_at:
+            return False
+        try:
+            with span("wmi.connect", "gpu", namespace=self.namespace):
+                connection = self._connect()
+                sensors = self._resolve(connection)
+        except Exception as exc:
+            self._fail(str(exc) or type(exc).__name__)
+            return False
+        if not sensors:
+            self._fail(_NO_SENSOR)
+            return False
+        self._connection = connection
+        self._sensors = sensors
+        ids = " OR ".join(f"Identifier='{ident}'" for ident in sensors)
+        self._query = f"SELECT Identifier, Value FROM Sensor WHERE {ids}"
+        return True
+
+    def _fail(self, message: str) -> None:
+        self._connection = None
+        self._last_error = message
+        self._retry_at = self._clock() + self._delay
+        self._delay = min(self._delay * 2, self.max_backoff)
+
+    def read(self) -> GPUReading:
+        if wmi is None and self._connect == self._wmi_connect:
+            return GPUReading(error="WMI indisponible")
+        if not self._ensure_connected():
+            if self._last_error == _NO_SENSOR:
+                return GPUReading()  # OpenHardwareMonitor sans capteur GPU: N/A
+            return GPUReading(error=f"Lecture capteurs impossible ({self._last_error})")
+        try:
+            with span("wmi.query", "gpu"):
+                rows = self._connection.query(self._query)  # type: ignore[union-attr]
+        except Exception as exc:
+            self._fail(str(exc) or type(exc).__name__)
+            return GPUReading(error=f"Lecture capteurs impossible ({self._last_error})")
+        self._delay = self.backoff  # backoff remis à zéro seulement après une lecture réussie
+        values = {self._sensors[row.Identifier]: float(row.Value) for row in rows if row.Identifier in self._sensors}
+        return GPUReading(**values)
+
+    def close(self) -> None:
+        self._connection = None
+
+
+class FakeTelemetrySource(TelemetrySource):
+    """Source déterministe pour les tests hors Windows; `fail_every` simule des erreurs périodiques."""
+
+    def __init__(
+        self,
+        *,
+        temp: float = 60.0,
+        load: float = 45.0,
+        clock: float = 1800.0,
+        vram: float = 2048.0,
+        jitter: float = 0.05,
+        fail_every: int = 0,
+        seed: int = 0,
+    ) -> None:
+        self.base = GPUReading(temp, load, clock, vram)
+        self.jitter = jitter
+        self.fail_every = fail_every
+        self.reads = 0
+        self._rng = random.Random(seed)
+
+    def read(self) -> GPUReading:
+        self.reads += 1
+        if self.fail_every and self.reads % self.fail_every == 0:
+            return GPUReading(error="Lecture capteurs impossible (simulée)")
+
+        def vary(value: Optional[float]) -> Optional[float]:
+            return None if value is None else value * (1 + self._rng.uniform(-self.jitter, self.jitter))
+
+        return GPUReading(
+            temp=vary(self.base.temp),
+            load=min(vary(self.base.load) or 0.0, 100.0),
+            clock=vary(self.base.clock),
+            vram=vary(self.base.vram),
+        )
+
+
+def default_source() -> TelemetrySource:
+    return WmiTelemetrySource()
+
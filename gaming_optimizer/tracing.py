@@ -0,0 +1,175 @@
+"""
+Traces d'exécution: spans légers exportés au format Chrome Trace Event (chrome://tracing, Perfetto).
+
+Désactivé par défaut: `span()` renvoie alors un contexte vide partagé et `traced` appelle
+directement la fonction, sans horodatage ni allocation d'événement.
+"""
+from __future__ import annotations
+
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+_tracer: Optional["Tracer"] = None
+
+
+def _current_task() -> Optional[object]:
+    """Tâche asyncio courante, None hors boucle (asyncio n'est importé que s'il l'est déjà)."""
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is None:
+        return None
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+class Span:
+    __slots__ = ("tracer", "name", "category", "args", "start", "task")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+        self.task: Optional[object] = None
+
+    def __enter__(self) -> "Span":
+        self.task = _current_task()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = getattr(exc_type, "__name__", str(exc_type))
+        self.tracer.record(self, end)
+
+
+class Tracer:
+    """
+    Collecte les spans terminés. Les spans ouverts dans une tâche asyncio deviennent des
+    événements asynchrones (b/e): les sondes concurrentes se chevauchent sans s'imbriquer.
+    """
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.events: List[Dict[str, Any]] = []
+        self._ids = itertools.count(1)
+        self._threads: Dict[int, str] = {}
+
+    def span(self, name: str, category: str, args: Dict[str, Any]) -> Span:
+        return Span(self, name, category, args)
+
+    def _us(self, ns: int) -> float:
+        return (ns - self.origin) / 1000
+
+    def record(self, span: Span, end: int) -> None:
+        thread = threading.current_thread()
+        self._threads.setdefault(thread.ident or 0, thread.name)
+        base = {"name": span.name, "cat": span.category, "pid": self.pid, "tid": thread.ident or 0}
+        duration = (end - span.start) / 1000
+        if span.task is None:
+            event = dict(base, ph="X", ts=self._us(span.start), dur=duration, args=span.args)
+            self.events.append(event)  # list.append est atomique sous le GIL
+            return
+        async_id = next(self._ids)
+        self.events.append(dict(base, ph="b", id=async_id, ts=self._us(span.start), args=span.args))
+        self.events.append(dict(base, ph="e", id=async_id, ts=self._us(end), args={"dur": duration}))
+
+    def durations(self) -> Dict[str, List[float]]:
+        """Durées (ms) par nom de span."""
+        result: Dict[str, List[float]] = {}
+        for event in self.events:
+            if event["ph"] == "X":
+                result.setdefault(event["name"], []).append(event["dur"] / 1000)
+            elif event["ph"] == "e":
+                result.setdefault(event["name"], []).append(event["args"]["dur"] / 1000)
+        return result
+
+    def summary(self) -> str:
+        lines = ["[PROFIL]", f"{'Span':<32}{'Appels':>8}{'Total ms':>12}{'Moy. ms':>10}{'Max ms':>10}"]
+        rows = sorted(self.durations().items(), key=lambda item: sum(item[1]), reverse=True)
+        for name, values in rows:
+            total = sum(values)
+            lines.append(f"{name:<32}{len(values):>8}{total:>12.1f}{total / len(values):>10.2f}{max(values):>10.1f}")
+        if not rows:
+            lines.append("Aucun span enregistré.")
+        return "\n".join(lines)
+
+    def export(self, path: Path) -> Path:
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self._threads.items()
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}), encoding="utf-8"
+        )
+        return path
+
+
+def enable() -> Tracer:
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    """Arrête la collecte et renvoie le traceur (None s'il n'était pas actif)."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, category: str = "app", **args: Any) -> Any:
+    """`with span("nom", "catégorie", clé=valeur): ...`; contexte vide partagé si désactivé."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = "app") -> Callable[[F], F]:
+    """Décorateur: un span par appel (nom par défaut: Classe.méthode)."""
+
+    def decorate(func: F) -> F:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with tracer.span(label, category, {}):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
@@ -3,12 +3,17 @@ Fonctions utilitaires partagées.
 """
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import platform
 import subprocess
+import tempfile
+import threading
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import IO, Iterable, List, Optional
+
+from .tracing import span
 
 
 class CommandError(RuntimeError):
@@ -29,25 +34,73 @@ def run_command(cmd: Iterable[str], *, check: bool = True) -> subprocess.Complet
         cmd: commande à exécuter
         check: lève CommandError si le retour est non nul
     """
-    process = subprocess.run(
-        list(cmd),
-        capture_output=True,
-        text=True,
-        shell=False,
-    )
+    cmd = list(cmd)
+    with span("run_command", "subprocess", cmd=" ".join(cmd)):
+        process = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            shell=False,
+        )
     if check and process.returncode != 0:
         raise CommandError(f"Commande {' '.join(cmd)} échouée: {process.stderr.strip()}")
     return process
 
 
+_POWERSHELL_POOL = None
+_POWERSHELL_POOL_LOCK = threading.Lock()
+
+
+def _powershell_pool():
+    """Pool de sessions PowerShell persistantes, None si l'interpréteur est introuvable."""
+    global _POWERSHELL_POOL
+    with _POWERSHELL_POOL_LOCK:
+        if _POWERSHELL_POOL is None:
+            from .shell import PowerShellDialect, SessionPool, find_executable  # import local pour éviter cycle
+
+            executable = find_executable(["powershell", "pwsh"])
+            if executable is None:
+                _POWERSHELL_POOL = False
+            else:
+                _POWERSHELL_POOL = SessionPool(PowerShellDialect(executable))
+                atexit.register(_POWERSHELL_POOL.close)
+        return _POWERSHELL_POOL or None
+
+
 def powershell(script: str, *, check: bool = True) -> subprocess.CompletedProcess:
-    """Raccourci pour exécuter des commandes PowerShell."""
+    """
+    Raccourci pour exécuter des commandes PowerShell.
+
+    Passe par une session persistante; si elle ne peut pas démarrer, repli sur un processus
+    `powershell -NoProfile` par commande.
+    """
+    from .shell import ShellUnavailable
+
+    pool = _powershell_pool()
+    if pool is not None:
+        try:
+            with span("powershell", "subprocess", script=script[:120]):
+                return pool.run(script, check=check)
+        except ShellUnavailable:
+            pass
     return run_command(["powershell", "-NoProfile", "-Command", script], check=check)
 
 
 def save_json(path: Path, payload: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    """Écriture atomique: fichier temporaire synchronisé puis renommage sur la cible."""
+    with span("save_json", "storage", path=path.name):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps(payload, indent=2))
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
 
 
 def load_json(path: Path) -> dict:
@@ -55,3 +108,16 @@ def load_json(path: Path) -> dict:
         return {}
     return json.loads(path.read_text(encoding="utf-8"))
 
+
+def open_append(path: Path) -> IO[str]:
+    """Ouvre un fichier JSON Lines en ajout en isolant une dernière ligne tronquée par un crash."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    torn = False
+    if path.exists() and path.stat().st_size:
+        with open(path, "rb") as raw:
+            raw.seek(-1, os.SEEK_END)
+            torn = raw.read(1) != b"\n"
+    handle = open(path, "a", encoding="utf-8")
+    if torn:
+        handle.write("\n")
+    return handle
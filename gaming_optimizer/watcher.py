@@ -0,0 +1,164 @@
+"""
+Surveillance des lancements de jeux: diff incrémental des PID et priorité appliquée à la volée.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import psutil
+
+from .config import GAME_NICE, GAME_PROCESS_NAMES, WATCHER_DENIED_RETRY, WATCHER_INTERVAL, WATCHER_MAX_OVERHEAD
+from .storage import StorageManager
+
+SNAPSHOT_KEY = "watcher_boosts"
+
+
+def game_priority() -> int:
+    """HIGH_PRIORITY_CLASS sous Windows, valeur nice équivalente ailleurs."""
+    return getattr(psutil, "HIGH_PRIORITY_CLASS", GAME_NICE)
+
+
+class GameProcessWatcher:
+    """
+    Suit la liste des PID et booste les jeux dès leur lancement.
+
+    Chaque passage ne fait qu'un `psutil.pids()`: le nom n'est lu que pour les PID apparus
+    depuis le passage précédent, et un PID boosté n'est plus jamais retouché. Le temps CPU
+    du thread de surveillance est mesuré; s'il dépasse `target_overhead` (% d'un cœur),
+    l'intervalle est allongé (jusqu'à `max_interval`), puis raccourci quand la charge retombe.
+    Un PID dont l'accès est refusé est réessayé après `denied_retry` secondes.
+    """
+
+    def __init__(
+        self,
+        storage: Optional[StorageManager] = None,
+        *,
+        processes: Optional[Sequence[str]] = None,
+        interval: float = WATCHER_INTERVAL,
+        max_interval: Optional[float] = None,
+        target_overhead: float = WATCHER_MAX_OVERHEAD,
+        priority: Optional[int] = None,
+        on_boost: Optional[Callable[[int, str], None]] = None,
+        denied_retry: float = WATCHER_DENIED_RETRY,
+    ) -> None:
+        self.storage = storage or StorageManager()
+        self.targets = {name.lower() for name in (processes or GAME_PROCESS_NAMES)}
+        self.base_interval = interval
+        self.interval = interval
+        self.max_interval = max_interval or interval * 10
+        self.target_overhead = target_overhead
+        self.priority = game_priority() if priority is None else priority
+        self.on_boost = on_boost
+        self.denied_retry = denied_retry
+        self.known: Set[int] = set()
+        self.denied: Dict[int, float] = {}  # PID -> instant monotone du prochain essai
+        self.boosted: Dict[int, Dict[str, Any]] = {}
+        self.scans = 0
+        self.lookups = 0
+        self.cpu_time = 0.0
+        self.wall_time = 0.0
+        self._stop = threading.Event()
+
+    @property
+    def overhead(self) -> float:
+        """CPU consommé par la surveillance, en % d'un cœur depuis le démarrage."""
+        return 100 * self.cpu_time / self.wall_time if self.wall_time else 0.0
+
+    def scan(self) -> List[Tuple[int, str]]:
+        """Un passage: diff des PID, lecture du nom des nouveaux seulement. Renvoie les jeux boostés."""
+        start = time.thread_time()
+        now = time.monotonic()
+        current = set(psutil.pids())
+        for pid in self.known - current:
+            self.boosted.pop(pid, None)  # PID libéré: il pourra être réattribué à un autre processus
+            self.denied.pop(pid, None)
+        fresh = current - self.known
+        fresh.update(pid for pid, retry_at in self.denied.items() if retry_at <= now)
+        self.known = current
+        boosted: List[Tuple[int, str]] = []
+        for pid in fresh:
+            self.denied.pop(pid, None)
+            try:
+                proc = psutil.Process(pid)
+                name = proc.name()
+                self.lookups += 1
+                if name.lower() in self.targets and pid not in self.boosted and self._boost(proc, name):
+                    boosted.append((pid, name))
+            except psutil.NoSuchProcess:
+                continue
+            except psutil.AccessDenied:
+                self.denied[pid] = now + self.denied_retry
+        self.scans += 1
+        self.cpu_time += time.thread_time() - start
+        return boosted
+
+    def _boost(self, proc: psutil.Process, name: str) -> bool:
+        """AccessDenied remonte à `scan`, qui réessaiera ce PID plus tard."""
+        try:
+            original = proc.nice()
+            proc.nice(self.priority)
+            created = proc.create_time()
+        except psutil.NoSuchProcess:
+            return False
+        saved = dict(self.storage.get_snapshot(SNAPSHOT_KEY))
+        previous = saved.get(str(proc.pid))
+        if previous and abs(previous.get("created", 0) - created) <= 1e-3:
+            original = previous["nice"]  # déjà boosté par une session précédente: garder la vraie valeur d'origine
+        self.boosted[proc.pid] = {"name": name, "nice": original, "created": created}
+        saved[str(proc.pid)] = self.boosted[proc.pid]
+        self.storage.snapshot(SNAPSHOT_KEY, saved)
+        if self.on_boost:
+            self.on_boost(proc.pid, name)
+        return True
+
+    def _adapt(self, cpu_spent: float, elapsed: float) -> None:
+        load = 100 * cpu_spent / elapsed if elapsed else 0.0
+        if load > self.target_overhead:
+            self.interval = min(self.interval * 2, self.max_interval)
+        elif load < self.target_overhead / 4 and self.interval > self.base_interval:
+            self.interval = max(self.interval / 2, self.base_interval)
+
+    def run(self, duration: Optional[float] = None) -> None:
+        """Boucle jusqu'à `stop()` (ou pendant `duration` secondes)."""
+        self._stop.clear()
+        end = time.monotonic() + duration if duration is not None else None
+        while not self._stop.is_set():
+            tick = time.monotonic()
+            before = self.cpu_time
+            self.scan()
+            deadline = tick + self.interval
+            if end is not None:
+                deadline = min(deadline, end)
+            self._stop.wait(max(deadline - time.monotonic(), 0.0))
+            elapsed = time.monotonic() - tick
+            self.wall_time += elapsed
+            self._adapt(self.cpu_time - before, elapsed)
+            if end is not None and time.monotonic() >= end:
+                break
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def summary(self) -> str:
+        return (
+            f"{self.scans} passages, {self.lookups} noms lus, {len(self.boosted)} jeux boostés, "
+            f"surcoût {self.overhead:.3f}% CPU (cible {self.target_overhead}%), intervalle {self.interval:.1f}s"
+        )
+
+    @staticmethod
+    def restore(storage: StorageManager) -> str:
+        """Rend leur priorité d'origine aux jeux boostés encore en cours d'exécution."""
+        restored = 0
+        for pid, info in storage.get_snapshot(SNAPSHOT_KEY).items():
+            try:
+                proc = psutil.Process(int(pid))
+                if abs(proc.create_time() - info["created"]) > 1e-3:
+                    continue  # PID réutilisé par un autre processus
+                proc.nice(info["nice"])
+                restored += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied, KeyError, ValueError):
+                continue
+        storage.snapshot(SNAPSHOT_KEY, {})
+        return f"Priorité d'origine rétablie pour {restored} processus de jeu"
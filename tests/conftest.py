@@ -0,0 +1,10 @@
+import pytest
+
+from gaming_optimizer.history import HistoryStore
+from gaming_optimizer.storage import StorageManager
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """StorageManager isolé (sauvegarde, journal et historique sous tmp_path)."""
+    return StorageManager(tmp_path / "backup.json", HistoryStore(tmp_path / "history", legacy_path=None))
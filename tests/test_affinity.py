@@ -0,0 +1,125 @@
+import struct
+
+import pytest
+
+from gaming_optimizer.affinity import CpuTopology, parse_processor_cores
+
+
+def make_sysfs(root, siblings, capacity=None):
+    """siblings: CPU -> « 0,8 »; capacity: CPU -> cpu_capacity (facultatif)."""
+    for cpu, text in siblings.items():
+        topology = root / f"cpu{cpu}" / "topology"
+        topology.mkdir(parents=True)
+        (topology / "thread_siblings_list").write_text(text + "\n")
+        if capacity is not None:
+            (root / f"cpu{cpu}" / "cpu_capacity").write_text(f"{capacity[cpu]}\n")
+    (root / "cpufreq").mkdir()  # entrées non numérotées ignorées
+    return root
+
+
+def assert_partition(topology, games, others):
+    assert not set(games) & set(others)
+    assert sorted(games + others) == topology.logical
+
+
+def test_from_sysfs_groups_smt_siblings(tmp_path):
+    siblings = {cpu: f"{cpu % 4},{cpu % 4 + 4}" for cpu in range(8)}
+    topology = CpuTopology.from_sysfs(make_sysfs(tmp_path, siblings))
+
+    assert topology.cores == ((0, 4), (1, 5), (2, 6), (3, 7))
+    assert topology.performance == ()
+    assert topology.logical == list(range(8))
+
+
+def test_from_sysfs_reads_ranges_and_performance(tmp_path):
+    # 2 cœurs rapides avec SMT (0-1, 2-3) puis 4 cœurs efficaces.
+    siblings = {0: "0-1", 1: "0-1", 2: "2-3", 3: "2-3", 4: "4", 5: "5", 6: "6", 7: "7"}
+    capacity = {cpu: 1024 if cpu < 4 else 512 for cpu in range(8)}
+    topology = CpuTopology.from_sysfs(make_sysfs(tmp_path, siblings, capacity))
+
+    assert topology.cores == ((0, 1), (2, 3), (4,), (5,), (6,), (7,))
+    assert topology.performance == (1024, 1024, 512, 512, 512, 512)
+    assert topology.hybrid
+
+
+def test_from_sysfs_without_topology_returns_none(tmp_path):
+    assert CpuTopology.from_sysfs(tmp_path) is None
+
+
+def test_split_uniform_reserves_trailing_half():
+    topology = CpuTopology(((0, 4), (1, 5), (2, 6), (3, 7)))
+    games, others = topology.split()
+
+    assert games == [2, 3, 6, 7]
+    assert others == [0, 1, 4, 5]
+    assert_partition(topology, games, others)
+
+
+@pytest.mark.parametrize("reserved, expected", [(0, 1), (1, 1), (3, 3), (10, 3)])
+def test_split_keeps_at_least_one_core_on_each_side(reserved, expected):
+    topology = CpuTopology(((0,), (1,), (2,), (3,)))
+    games, others = topology.split(reserved)
+
+    assert len(games) == expected
+    assert_partition(topology, games, others)
+
+
+def test_split_single_core_reserves_nothing():
+    assert CpuTopology(((0, 1),)).split() == ([], [0, 1])
+
+
+def test_split_hybrid_reserves_performance_cores():
+    # Cœurs efficaces en fin de numérotation, comme sur les Intel hybrides.
+    cores = tuple((2 * i, 2 * i + 1) for i in range(6)) + tuple((12 + i,) for i in range(8))
+    topology = CpuTopology(cores, (1,) * 6 + (0,) * 8)
+
+    games, others = topology.split()
+    assert games == list(range(12))
+    assert others == list(range(12, 20))
+
+    games, others = topology.split(2)
+    assert games == [8, 9, 10, 11]
+    assert_partition(topology, games, others)
+
+    games, others = topology.split(8)
+    assert set(range(12)) <= set(games)
+    assert_partition(topology, games, others)
+
+
+def test_from_counts_covers_every_cpu_on_non_uniform_parts():
+    topology = CpuTopology.from_counts(20, 14)
+
+    assert topology.logical == list(range(20))
+    assert topology.physical_count == 14
+    assert topology.cores[:6] == tuple((2 * i, 2 * i + 1) for i in range(6))
+    games, others = topology.split()
+    assert games == list(range(12))
+    assert_partition(topology, games, others)
+
+
+def test_from_counts_uniform_smt():
+    topology = CpuTopology.from_counts(16, 8)
+
+    assert topology.cores[0] == (0, 1)
+    assert topology.performance == ()
+    assert topology.logical == list(range(16))
+
+
+def processor_core(cpus, efficiency, group=0):
+    """Entrée RelationProcessorCore (x64) de GetLogicalProcessorInformationEx."""
+    mask = sum(1 << cpu for cpu in cpus)
+    body = struct.pack("<BB20sH", 0, efficiency, bytes(20), 1)
+    body += struct.pack("<QH6x", mask, group)
+    return struct.pack("<II", 0, 8 + len(body)) + body
+
+
+def test_parse_processor_cores_reads_smt_groups_and_efficiency_class():
+    buffer = processor_core((0, 1), 1) + processor_core((2, 3), 1) + processor_core((4,), 0)
+    buffer += processor_core((1,), 0, group=1)
+
+    cores = parse_processor_cores(buffer)
+
+    assert cores == [((0, 1), 1), ((2, 3), 1), ((4,), 0), ((65,), 0)]
+    topology = CpuTopology._build(cores)
+    assert topology.performance == (1, 1, 0, 0)
+    assert topology.split() == ([0, 1, 2, 3], [4, 65])
@@ -0,0 +1,178 @@
+import argparse
+import io
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from gaming_optimizer import agent as agent_module
+from gaming_optimizer.admin import AdminManager
+from gaming_optimizer.agent import Agent, AgentClient, run_remote
+from gaming_optimizer.history import HistoryStore
+from gaming_optimizer.main import GamingOptimizer
+from gaming_optimizer.network import NetworkAnalyzer
+from gaming_optimizer.probes import SimulatedBackend
+from gaming_optimizer.selection import LatencyModel
+from gaming_optimizer.storage import StorageManager
+
+pytestmark = pytest.mark.skipif(not agent_module._use_unix_socket(), reason="socket Unix requis")
+
+
+class FakeOptimizer:
+    def __init__(self) -> None:
+        self.runs = 0
+
+    def network_test(self, **options):
+        self.runs += 1
+        print(f"série {self.runs} {sorted(options)}")
+
+    def restore(self):
+        raise SystemExit("Privilèges administrateur requis.")
+
+    def analyze(self, frametime_log=None):
+        raise SystemExit(2)
+
+    def optimize(self, **options):
+        raise PermissionError("refusé")
+
+    def stop_live_monitor(self):
+        pass
+
+
+class ChattyOptimizer(FakeOptimizer):
+    """network_test écrit longtemps après le départ éventuel du client."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.finished = threading.Event()
+
+    def network_test(self, **options):
+        for index in range(50):
+            print(f"ligne {index}")
+            time.sleep(0.005)
+        self.finished.set()
+
+
+@pytest.fixture
+def start_agent(tmp_path, monkeypatch):
+    """Démarre un agent sur un socket temporaire; privileged simule un agent Windows élevé."""
+    monkeypatch.setattr(agent_module, "AGENT_SOCKET", tmp_path / "agent.sock")
+    monkeypatch.setattr(agent_module, "AGENT_INFO_FILE", tmp_path / "agent.json")
+    threads = []
+
+    def start(optimizer, *, privileged=True):
+        monkeypatch.setattr(AdminManager, "verified", privileged)
+        agent = Agent(optimizer)
+        thread = threading.Thread(target=agent.serve, daemon=True)
+        thread.start()
+        threads.append(thread)
+        deadline = time.monotonic() + 5
+        while AgentClient.connect() is None:
+            assert time.monotonic() < deadline, "agent non démarré"
+            time.sleep(0.02)
+        return agent
+
+    yield start
+    client = AgentClient.connect()
+    if client is not None:
+        client.request("shutdown")
+    for thread in threads:
+        thread.join(5)
+
+
+@pytest.fixture
+def running_agent(start_agent, tmp_path):
+    return start_agent(FakeOptimizer()), tmp_path / "agent.sock"
+
+
+def request(command, args=None):
+    out = io.StringIO()
+    response = AgentClient.connect().request(command, args, out=out)
+    return response, out.getvalue()
+
+
+def test_socket_is_private_from_creation(running_agent):
+    _agent, path = running_agent
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_output_is_streamed_and_state_kept_warm(running_agent):
+    agent, _path = running_agent
+    first, out1 = request("network-test", {"top_k": 3})
+    second, out2 = request("network-test", {})
+
+    assert first["ok"] and second["ok"]
+    assert out1 == "série 1 ['top_k']\n"
+    assert out2 == "série 2 []\n"
+    assert agent.optimizer.runs == 2
+
+
+@pytest.mark.parametrize(
+    "command, error",
+    [
+        ("restore", "Privilèges administrateur requis."),
+        ("analyze", "Commande interrompue (code 2)."),
+        ("optimize", "refusé"),
+        ("inconnue", "Commande inconnue: inconnue"),
+    ],
+)
+def test_failures_are_reported_and_agent_survives(running_agent, command, error):
+    response, _out = request(command, {})
+    assert response == {"done": True, "ok": False, "error": error}
+
+    status, _out = request("status")
+    assert status["ok"] and status["result"]["pid"] == os.getpid()
+
+
+def test_shutdown_removes_socket(running_agent, tmp_path):
+    _agent, path = running_agent
+    response, _out = request("shutdown")
+    assert response["ok"]
+    deadline = time.monotonic() + 5
+    while path.exists() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert not path.exists()
+    assert AgentClient.connect() is None
+
+
+def test_client_disconnect_does_not_abort_the_command(start_agent):
+    agent = start_agent(ChattyOptimizer())
+    client = AgentClient.connect()
+    client.sock.sendall(b'{"command": "network-test", "args": {}, "token": null}\n')
+    assert client.sock.recv(64)  # première sortie reçue, puis le client s'en va
+    client.sock.close()
+
+    assert agent.optimizer.finished.wait(5)
+    status, _out = request("status")
+    assert status["ok"] and status["result"]["served"] == 1
+
+
+def test_unprivileged_agent_sends_commands_back_to_the_client(start_agent):
+    agent = start_agent(FakeOptimizer(), privileged=False)
+    assert agent.unavailable  # hors Windows: « Cet outil fonctionne uniquement sous Windows »
+
+    response, out = request("network-test", {})
+    assert response["local"] and not response["ok"] and out == ""
+    assert agent.optimizer.runs == 0
+    assert request("status")[0]["ok"]
+
+    args = argparse.Namespace(command="network-test", top_k=None, explore=None, adaptive=False)
+    assert run_remote(args) is None  # le CLI exécute alors la commande localement
+
+
+def test_real_network_test_is_relayed(start_agent, tmp_path):
+    optimizer = GamingOptimizer()
+    storage = StorageManager(tmp_path / "backup.json", HistoryStore(tmp_path / "history", legacy_path=None))
+    optimizer.network = NetworkAnalyzer(
+        storage=storage, backend=SimulatedBackend(seed=3), model=LatencyModel(tmp_path / "model.json")
+    )
+    start_agent(optimizer)
+
+    response, out = request("network-test", {"top_k": 2, "explore": 1})
+
+    assert response["ok"], response
+    assert "[ANALYSE RÉSEAU]" in out
+    assert "Sélection: 3/" in out
+    assert len(list(storage.iter_network_reports())) == 1
@@ -0,0 +1,47 @@
+import math
+
+import pytest
+
+from gaming_optimizer.benchmark import BenchmarkResult, BenchmarkSuite, confidence_interval, integer_kernel
+
+
+def test_confidence_interval_uses_student_t():
+    # écart-type √10, n = 5, t(4) = 2,776
+    assert confidence_interval([10.0, 12.0, 14.0, 16.0, 18.0]) == pytest.approx(2.776 * math.sqrt(10) / math.sqrt(5))
+    assert confidence_interval([3.0, 3.0, 3.0]) == 0.0
+    assert confidence_interval([7.0]) == 0.0
+
+
+def test_confidence_interval_shrinks_with_more_trials():
+    few = [10.0, 14.0] * 2
+    many = [10.0, 14.0] * 10
+    assert confidence_interval(many) < confidence_interval(few)
+
+
+def test_result_summary():
+    result = BenchmarkResult("timer_jitter", "ms", [1.0, 2.0, 3.0], higher_is_better=False)
+    data = result.as_dict()
+    assert data["mean"] == 2.0
+    assert data["ci"] == pytest.approx(4.303 / math.sqrt(3), abs=1e-4)
+    assert data["higher_is_better"] is False
+
+
+def test_suite_warms_up_then_runs_the_requested_trials():
+    suite = BenchmarkSuite(trials=3, warmup=2, cpu_iterations=1000)
+    calls = []
+    samples = suite._repeat(lambda: calls.append(1) or float(len(calls)))
+
+    assert len(calls) == 5
+    assert samples == [3.0, 4.0, 5.0]
+    assert BenchmarkSuite(trials=1).trials == 2  # un IC demande au moins deux essais
+
+
+def test_small_cpu_and_timer_benchmarks_produce_positive_samples():
+    suite = BenchmarkSuite(trials=2, warmup=0, cpu_iterations=2000)
+    integer = suite.cpu_integer()
+    resolution = suite.timer_resolution(reads=1000)
+
+    assert integer.unit == "Mops/s" and len(integer.samples) == 2
+    assert all(sample > 0 for sample in integer.samples)
+    assert 0 < resolution.mean < 1e6
+    assert integer_kernel(1000) == integer_kernel(1000)
@@ -0,0 +1,67 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from gaming_optimizer.compare import Comparison, bootstrap_delta, compare_metrics, compare_samples, describe, mann_whitney
+
+
+def test_mann_whitney_matches_hand_computed_p_values():
+    # U = 0, σ² = 5·5·11/12, z = (12,5 - 0,5)/σ: p = erfc(z/√2)
+    assert mann_whitney([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]) == pytest.approx(0.012186, abs=1e-6)
+    # Ex aequo: rangs moyens 1,5 / 4,5 / 7,5, U = 2, correction Σ(t³ - t) = 72
+    assert mann_whitney([1, 1, 2, 2], [2, 2, 3, 3]) == pytest.approx(0.086359, abs=1e-6)
+    assert mann_whitney([3, 3, 3], [3, 3, 3]) == 1.0
+    assert mann_whitney([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]) == mann_whitney([6, 7, 8, 9, 10], [1, 2, 3, 4, 5])
+
+
+def test_bootstrap_interval_brackets_a_known_shift():
+    rng = np.random.default_rng(0)
+    before = rng.normal(100.0, 5.0, 200)
+    after = before + 10.0
+
+    low, high = bootstrap_delta(before, after, draws=2000, rng=np.random.default_rng(1))
+    assert low < 10.0 < high
+    assert high - low < 3.0  # ≈ 2 × 1,96 × 5·√(2/200)
+
+
+def test_bootstrap_of_constant_samples_is_exact():
+    assert bootstrap_delta([4.0, 4.0, 4.0], [6.0, 6.0], draws=100, rng=np.random.default_rng(0)) == (2.0, 2.0)
+
+
+def test_same_distribution_is_not_significant():
+    rng = np.random.default_rng(2)
+    result = compare_samples("cpu_int", rng.normal(50, 2, 100), rng.normal(50, 2, 100), rng=np.random.default_rng(3))
+    assert result.low < 0 < result.high
+    assert not result.significant
+    assert "aucun changement mesurable" in describe(result, "Mops/s")
+
+
+def test_latency_drop_is_reported_as_improvement():
+    before = {"latency_samples": {"eu": [30.0, 31.0, 29.0, 30.5, 29.5] * 4, "gone": [90.0, 95.0]}}
+    after = {"latency_samples": {"eu": [20.0, 21.0, 19.0, 20.5, 19.5] * 4, "new": [5.0, 6.0]}}
+    latency = compare_metrics(before, after, rng=np.random.default_rng(0))["latency"]
+
+    assert latency.before == pytest.approx(30.0) and latency.after == pytest.approx(20.0)
+    assert latency.significant and latency.improved
+    assert latency.p_value < 0.001
+    assert describe(latency, "ms").endswith("p<0.001, mieux)")
+
+
+def test_benchmarks_need_two_samples_on_each_side():
+    before = {"benchmarks": {"cpu_int": {"samples": [10.0]}, "timer_jitter": {"samples": [2.0, 2.1, 1.9]}}}
+    after = {
+        "benchmarks": {
+            "cpu_int": {"samples": [11.0, 12.0]},
+            "timer_jitter": {"samples": [1.0, 1.1, 0.9], "higher_is_better": False},
+        }
+    }
+    comparisons = compare_metrics(before, after, rng=np.random.default_rng(0))
+    assert set(comparisons) == {"timer_jitter"}
+    assert comparisons["timer_jitter"].improved
+
+
+def test_percentages_are_relative_to_before():
+    comparison = Comparison("cpu_int", before=10.0, after=11.0, low=0.5, high=1.5, p_value=0.01)
+    assert comparison.pct == pytest.approx(10.0)
+    assert (comparison.pct_low, comparison.pct_high) == pytest.approx((5.0, 15.0))
+    assert describe(comparison, "Mops/s") == "10.00 → 11.00 Mops/s (+10.0 %, IC95 [+5.0 %; +15.0 %], p=0.010, mieux)"
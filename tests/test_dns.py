@@ -0,0 +1,133 @@
+import asyncio
+import json
+
+from gaming_optimizer import system as system_module
+from gaming_optimizer.dnsbench import DnsBenchmark, RCODE_NXDOMAIN, RCODE_SERVFAIL, ResolverResult, StubDnsServer
+from gaming_optimizer.history import HistoryStore
+from gaming_optimizer.plan import SystemState
+from gaming_optimizer.storage import StorageManager
+from gaming_optimizer.system import SystemOptimizer
+
+HOSTNAMES = ("game.test", "auth.test")
+
+
+def run_benchmark(specs, *, rounds=2, timeout=0.3):
+    """specs: {étiquette: kwargs de StubDnsServer}; renvoie (classement, serveurs, étiquette par adresse)."""
+
+    async def scenario():
+        servers = {label: await StubDnsServer.start(**kwargs) for label, kwargs in specs.items()}
+        try:
+            bench = DnsBenchmark([s.address for s in servers.values()], HOSTNAMES, rounds=rounds, timeout=timeout)
+            ranking = await bench.run_async()
+        finally:
+            for server in servers.values():
+                server.close()
+        return ranking, servers
+
+    ranking, servers = asyncio.run(scenario())
+    labels = {server.address: label for label, server in servers.items()}
+    return ranking, servers, labels
+
+
+def test_benchmark_ranks_loopback_resolvers():
+    ranking, servers, labels = run_benchmark(
+        {
+            "fast": {},
+            "slow": {"delay": lambda name: 0.05},
+            # Répond vite en cache mais lentement pour les sous-domaines aléatoires.
+            "recursive": {"delay": lambda name: 0.0 if name in HOSTNAMES else 0.12},
+            "dead": {"delay": lambda name: None},
+        }
+    )
+
+    assert [labels[result.server] for result in ranking] == ["fast", "slow", "recursive", "dead"]
+    dead = ranking[-1]
+    assert dead.failure_rate == 1.0 and not dead.latencies
+    fast = ranking[0]
+    assert fast.sent == 2 * 2 * len(HOSTNAMES)
+    assert len(fast.cached) == len(fast.uncached) == 2 * len(HOSTNAMES)
+    recursive = ranking[2]
+    assert recursive.uncached_median > 100 > recursive.cached_median
+    # Chauffe + un envoi par round pour chaque nom « en cache », sous-domaines tous distincts.
+    queries = servers["fast"].queries
+    assert all(queries[name] == 3 for name in HOSTNAMES)
+    assert sum(count for name, count in queries.items() if name not in HOSTNAMES) == 2 * len(HOSTNAMES)
+    assert DnsBenchmark.best_pair(ranking) == (ranking[0].server, ranking[1].server)
+
+
+def test_error_rcodes_count_as_failures_but_nxdomain_does_not():
+    ranking, _servers, labels = run_benchmark(
+        {"nxdomain": {"rcode": RCODE_NXDOMAIN}, "servfail": {"rcode": RCODE_SERVFAIL}}, rounds=1
+    )
+
+    by_label = {labels[result.server]: result for result in ranking}
+    assert by_label["nxdomain"].failure_rate == 0.0
+    assert by_label["servfail"].failure_rate == 1.0
+    assert DnsBenchmark.best_pair(ranking) is None
+
+
+def make_optimizer(tmp_path, monkeypatch, state):
+    runs = []
+    ranking = [ResolverResult("9.9.9.9", cached=[4.0]), ResolverResult("149.112.112.112", cached=[5.0])]
+    monkeypatch.setattr(system_module.DnsBenchmark, "run", lambda self: runs.append(1) or ranking)
+    monkeypatch.setattr(system_module.SystemStateProbe, "read", lambda self: state)
+    commands = []
+    monkeypatch.setattr(system_module, "powershell", lambda script, check=True: commands.append(script))
+    storage = StorageManager(tmp_path / "backup.json", HistoryStore(tmp_path / "history"))
+    return SystemOptimizer(storage, dns_bench_path=tmp_path / "dns_benchmark.json"), runs, commands
+
+
+def test_plan_and_apply_target_the_benchmarked_pair(tmp_path, monkeypatch):
+    state = SystemState(dns={"Ethernet": ("1.1.1.1", "1.0.0.1"), "Wi-Fi": ("9.9.9.9", "149.112.112.112")})
+    optimizer, runs, commands = make_optimizer(tmp_path, monkeypatch, state)
+
+    plan = optimizer.probe_state()
+    dns_changes = plan.pending("dns")
+    assert [(change.key, change.target) for change in dns_changes] == [("Ethernet", "9.9.9.9,149.112.112.112")]
+
+    message = optimizer.optimize_dns()
+    assert runs == [1]  # benchmark lancé une seule fois pour le plan et l'application
+    assert len(commands) == 1 and '"Ethernet"' in commands[0] and "9.9.9.9,149.112.112.112" in commands[0]
+    assert "sur 1 interface(s)" in message
+
+
+def test_recent_benchmark_is_reused_between_runs(tmp_path, monkeypatch):
+    state = SystemState(dns={"Ethernet": ("9.9.9.9", "149.112.112.112")})
+    optimizer, runs, commands = make_optimizer(tmp_path, monkeypatch, state)
+
+    assert not optimizer.probe_state().pending("dns")
+    assert optimizer.optimize_dns().startswith("DNS déjà configurés")
+    assert not optimizer.probe_state().pending("dns")
+    assert runs == [1]
+    assert commands == []
+
+    optimizer.select_dns_servers(max_age=0)
+    assert runs == [1, 1]
+
+
+def test_benchmark_cache_lives_in_its_own_file(tmp_path, monkeypatch):
+    optimizer, runs, commands = make_optimizer(tmp_path, monkeypatch, SystemState())
+
+    assert optimizer.select_dns_servers()[0] == ("9.9.9.9", "149.112.112.112")
+    cached = json.loads((tmp_path / "dns_benchmark.json").read_text())
+    assert cached["servers"] == ["9.9.9.9", "149.112.112.112"]
+    assert optimizer.storage.get_snapshot("dns_benchmark") == {}
+
+    # Un second processus (nouvel optimiseur) relit la mesure sans relancer le benchmark.
+    again, again_runs, _ = make_optimizer(tmp_path, monkeypatch, SystemState())
+    assert again.select_dns_servers()[1].endswith("mesure réutilisée")
+    assert again_runs == []
+
+    (tmp_path / "dns_benchmark.json").write_text("{tronqué")
+    assert not again.select_dns_servers()[1].endswith("mesure réutilisée")
+    assert again_runs == [1]
+    assert again.select_dns_servers()[1].endswith("mesure réutilisée")
+
+
+def test_clear_plan_forgets_the_dns_choice(tmp_path, monkeypatch):
+    state = SystemState(dns={"Ethernet": ("1.1.1.1", "1.0.0.1")})
+    optimizer, runs, commands = make_optimizer(tmp_path, monkeypatch, state)
+
+    optimizer.probe_state()
+    optimizer.clear_plan()
+    assert optimizer.plan is None and optimizer.dns_choice is None
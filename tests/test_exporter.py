@@ -0,0 +1,82 @@
+import itertools
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from gaming_optimizer.exporter import CONTENT_TYPE, LatencyHistogram, MetricsServer, MonitorMetrics
+from gaming_optimizer.sampling import SamplingPipeline, Sensor
+
+
+class CountingSensor:
+    def __init__(self, values):
+        self.values = itertools.cycle(values)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return next(self.values)
+
+
+@pytest.fixture
+def served():
+    ping = CountingSensor([12.0, None, 40.0, 250.0])
+    cpu = CountingSensor([35.0])
+    pipeline = SamplingPipeline([Sensor("ping", ping, 200.0), Sensor("cpu", cpu, 200.0)])
+    metrics = MonitorMetrics(pipeline, 'eu "1"', buckets_ms=(20.0, 50.0, 100.0))
+    with pipeline:
+        assert pipeline.wait_ready(2.0)
+        while ping.calls < 8:
+            time.sleep(0.01)
+    server = MetricsServer(metrics, 0).start()
+    yield server, metrics, ping, cpu
+    server.close()
+
+
+def scrape(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.headers["Content-Type"], response.read().decode("utf-8")
+
+
+def test_scrape_returns_openmetrics_without_sampling(served):
+    server, metrics, ping, cpu = served
+    calls = (ping.calls, cpu.calls)
+
+    content_type, body = scrape(server.url)
+    _, again = scrape(server.url)
+
+    assert content_type == CONTENT_TYPE
+    assert (ping.calls, cpu.calls) == calls  # un scrape ne relance aucun capteur
+    assert body.endswith("# EOF\n")
+    lines = body.splitlines()
+    host = 'host="eu \\"1\\""'
+    answered = metrics.latency.probes - metrics.latency.lost
+    assert metrics.latency.probes == ping.calls
+    assert f'gaming_ping_latency_seconds_bucket{{{host},le="+Inf"}} {answered}' in lines
+    assert f"gaming_ping_latency_seconds_count{{{host}}} {answered}" in lines
+    assert any(line.startswith(f"gaming_ping_latency_seconds_sum{{{host}}} ") for line in lines)
+    assert f"gaming_ping_probes_total{{{host}}} {ping.calls}" in lines
+    assert f"gaming_ping_lost_total{{{host}}} {metrics.latency.lost}" in lines
+    assert "gaming_cpu_percent 35.0" in lines
+    assert 'gaming_sensor_age_seconds{sensor="ping"}' in again
+
+
+def test_unknown_path_is_404(served):
+    server = served[0]
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(server.url.replace("/metrics", "/other"), timeout=5)
+    assert error.value.code == 404
+
+
+def test_histogram_buckets_are_cumulative_seconds():
+    histogram = LatencyHistogram((20.0, 50.0), loss_window=4)
+    for value in (10.0, 20.0, 30.0, 80.0, None):
+        histogram.observe(value)
+
+    lines = histogram.render("lat", 'host="h"')
+    assert 'lat_bucket{host="h",le="0.02"} 2' in lines
+    assert 'lat_bucket{host="h",le="0.05"} 3' in lines
+    assert 'lat_bucket{host="h",le="+Inf"} 4' in lines
+    assert 'lat_sum{host="h"} 0.14' in lines
+    assert histogram.loss_ratio() == 0.25  # fenêtre des 4 derniers: 20, 30, 80, perdu
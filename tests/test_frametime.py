@@ -0,0 +1,65 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from gaming_optimizer.frametime import FrameTimeAnalyzer
+
+
+def write_log(path, frames, column="MsBetweenPresents"):
+    lines = ["// capture PresentMon", f"Application,{column}"]
+    lines += [f"game.exe,{value}" for value in frames]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def steady_with_spikes(count, spikes, base=10.0, spike=40.0):
+    frames = [base] * count
+    for index in spikes:
+        frames[index] = spike
+    return frames
+
+
+@pytest.mark.parametrize("chunk_rows", [1000, 64, 7])
+def test_stutters_are_counted_once_whatever_the_chunking(tmp_path, chunk_rows):
+    frames = steady_with_spikes(300, spikes=[10, 64, 65, 150, 299])
+    log = write_log(tmp_path / "frames.csv", frames)
+
+    summary = FrameTimeAnalyzer(chunk_rows=chunk_rows).analyze(log)
+
+    # La frame 10 n'a pas encore 30 prédécesseurs: elle n'est pas jugée.
+    assert summary.stutters == 4
+    assert summary.frames == 300
+    assert summary.max_ms == 40.0
+
+
+def test_slow_frames_below_the_floor_are_not_stutters(tmp_path):
+    frames = steady_with_spikes(200, spikes=[100, 150], base=2.0, spike=6.0)
+    summary = FrameTimeAnalyzer().analyze(write_log(tmp_path / "fast.csv", frames))
+    assert summary.stutters == 0
+
+
+def test_gradual_slowdown_is_not_a_stutter(tmp_path):
+    frames = [10.0 + index * 0.05 for index in range(400)]
+    summary = FrameTimeAnalyzer().analyze(write_log(tmp_path / "ramp.csv", frames))
+    assert summary.stutters == 0
+
+
+def test_summary_figures(tmp_path):
+    frames = [10.0] * 990 + [20.0] * 10
+    log = write_log(tmp_path / "frames.csv", frames + ["", "n/a"], column="FrameTime")
+    summary = FrameTimeAnalyzer(chunk_rows=128).analyze(log)
+
+    assert summary.frames == 1000
+    assert summary.duration_s == pytest.approx(10.1)
+    assert summary.avg_fps == pytest.approx(1000 / 10.1)
+    assert summary.p50_ms == pytest.approx(10.0, abs=0.01)
+    assert summary.p99_ms == pytest.approx(10.0, abs=0.01)
+    assert summary.low_01pct_fps == pytest.approx(50.0, rel=0.01)
+    assert summary.buckets == [0, 990, 10, 0, 0]
+
+
+def test_missing_column_is_reported(tmp_path):
+    log = tmp_path / "bad.csv"
+    log.write_text("Application,Fps\ngame.exe,60\n")
+    with pytest.raises(ValueError, match="introuvable"):
+        FrameTimeAnalyzer().analyze(log)
@@ -0,0 +1,73 @@
+import datetime as dt
+import json
+
+from gaming_optimizer.history import HistoryStore
+
+T0 = dt.datetime(2024, 5, 1, 12, 0)
+
+
+def store(tmp_path, **kwargs):
+    return HistoryStore(tmp_path / "history", legacy_path=None, **kwargs)
+
+
+def report(value):
+    return {"eu": {"average": value}}
+
+
+def test_segments_rotate_by_age_and_seal_an_index(tmp_path):
+    history = store(tmp_path, max_segment_age=dt.timedelta(hours=1))
+    for minutes in (0, 30, 61, 90):
+        history.append(report(minutes), timestamp=T0 + dt.timedelta(minutes=minutes))
+
+    first, second = history.segments()
+    index = json.loads(history._index_path(first).read_text())
+    assert index["count"] == 2
+    assert index["start"] == T0.isoformat()
+    assert index["targets"] == ["eu"]
+    assert not history._index_path(second).exists()  # segment actif, pas encore scellé
+
+
+def test_segments_rotate_by_size(tmp_path):
+    history = store(tmp_path, max_segment_bytes=100)
+    for minutes in range(6):
+        history.append(report(minutes), timestamp=T0 + dt.timedelta(minutes=minutes))
+
+    assert len(history.segments()) > 1
+    assert [r["eu"]["average"] for r in history.iter_reports()] == list(range(6))
+
+
+def test_range_and_target_filters(tmp_path):
+    history = store(tmp_path, max_segment_age=dt.timedelta(hours=1))
+    for hours in range(4):
+        history.append({"eu" if hours % 2 else "us": {"average": hours}}, timestamp=T0 + dt.timedelta(hours=hours))
+
+    window = history.iter_reports(T0 + dt.timedelta(hours=1), T0 + dt.timedelta(hours=2))
+    assert [r["timestamp"] for r in window] == [(T0 + dt.timedelta(hours=h)).isoformat() for h in (1, 2)]
+    assert [r["eu"]["average"] for r in history.iter_reports(targets=["eu"])] == [1, 3]
+
+
+def test_torn_line_is_skipped_and_writing_resumes(tmp_path):
+    history = store(tmp_path)
+    history.append(report(1), timestamp=T0)
+    segment = history.segments()[-1]
+    with open(segment, "a", encoding="utf-8") as handle:
+        handle.write('{"timestamp": "2024-05-01T12:05:00", "eu": {"aver')
+
+    reopened = store(tmp_path)
+    assert [r["eu"]["average"] for r in reopened.iter_reports()] == [1]
+    reopened.append(report(2), timestamp=T0 + dt.timedelta(minutes=10))
+    assert reopened.segments() == [segment]
+    assert [r["eu"]["average"] for r in store(tmp_path).iter_reports()] == [1, 2]
+
+
+def test_legacy_log_is_migrated_once(tmp_path):
+    legacy = tmp_path / "network_reports.json"
+    legacy.write_text(json.dumps({"reports": [
+        {"timestamp": (T0 + dt.timedelta(minutes=5)).isoformat(), "eu": {"average": 2}},
+        {"timestamp": T0.isoformat(), "eu": {"average": 1}},
+    ]}))
+    history = HistoryStore(tmp_path / "history", legacy_path=legacy)
+
+    assert [r["eu"]["average"] for r in history.iter_reports()] == [1, 2]
+    assert not legacy.exists()
+    assert legacy.with_name("network_reports.json.migrated").exists()
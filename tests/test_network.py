@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from gaming_optimizer.network import NetworkAnalyzer, StoppingRule
+from gaming_optimizer.probes import ProbeBackend, SimulatedBackend, SimulatedTarget
+from gaming_optimizer.selection import LatencyModel
+from gaming_optimizer.stats import LatencyAccumulator
+
+
+def analyzer(tmp_path, storage, backend, targets, **kwargs):
+    return NetworkAnalyzer(targets, storage, backend, model=LatencyModel(tmp_path / "model.json"), **kwargs)
+
+
+class ConcurrencyProbe(ProbeBackend):
+    """Compte les sondes en vol simultanément; latence fixe par hôte, None = timeout."""
+
+    def __init__(self, latencies) -> None:
+        self.latencies = latencies
+        self.in_flight = 0
+        self.peak = 0
+        self.sent = []
+        self.opened = self.closed = 0
+
+    async def open(self) -> None:
+        self.opened += 1
+
+    async def close(self) -> None:
+        self.closed += 1
+
+    async def probe(self, host, timeout):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        self.sent.append(host)
+        try:
+            await asyncio.sleep(0.01)
+            return self.latencies[host]
+        finally:
+            self.in_flight -= 1
+
+    async def sleep(self, delay):
+        await asyncio.sleep(0)
+
+
+def test_targets_are_probed_concurrently_over_one_backend_session(tmp_path, storage):
+    targets = {f"srv{index}": f"10.0.0.{index}" for index in range(5)}
+    backend = ConcurrencyProbe({host: 10.0 + index for index, host in enumerate(targets.values())})
+
+    results = analyzer(tmp_path, storage, backend, targets).run_tests(attempts=4, delay=0.0)
+
+    assert backend.peak == len(targets)
+    assert (backend.opened, backend.closed) == (1, 1)
+    assert len(backend.sent) == 4 * len(targets)
+    assert [results[name].average for name in targets] == pytest.approx([10.0, 11.0, 12.0, 13.0, 14.0])
+    assert all(result.attempts == 4 and result.packet_loss == 0 for result in results.values())
+
+
+def test_timeouts_are_counted_as_loss_and_reported(tmp_path, storage):
+    backend = ConcurrencyProbe({"10.0.0.1": 20.0, "10.0.0.2": None})
+    targets = {"ok": "10.0.0.1", "down": "10.0.0.2"}
+
+    results = analyzer(tmp_path, storage, backend, targets).run_tests(attempts=3, delay=0.0)
+
+    assert results["down"].packet_loss == 100.0 and results["down"].timeouts == 3
+    assert not results["down"].has_data
+    assert results["ok"].packet_loss == 0.0
+    history = list(storage.iter_network_reports())
+    assert len(history) == 1
+    assert history[0]["down"]["avg"] is None and history[0]["ok"]["avg"] == 20.0
+
+
+SIMULATED = {
+    "stable": SimulatedTarget(latency=20.0, jitter=0.5),
+    "noisy": SimulatedTarget(latency=40.0, jitter=15.0, loss=0.3),
+    "dead": SimulatedTarget(loss=1.0),
+}
+
+
+def simulated(tmp_path, storage, seed=7):
+    backend = SimulatedBackend(SIMULATED, seed=seed)
+    return analyzer(tmp_path, storage, backend, {name: name for name in SIMULATED})
+
+
+def test_simulated_network_is_deterministic_with_fixed_attempts(tmp_path, storage):
+    first = simulated(tmp_path, storage).run_tests(attempts=10, delay=0.0)
+    second = simulated(tmp_path, storage).run_tests(attempts=10, delay=0.0)
+
+    assert {name: res.as_dict() for name, res in first.items()} == {name: res.as_dict() for name, res in second.items()}
+    assert all(res.attempts == 10 for res in first.values())
+    assert first["stable"].average == pytest.approx(20.0, abs=1.0)
+    assert first["dead"].packet_loss == 100.0
+    assert 0 < first["noisy"].packet_loss < 100
+
+
+def test_adaptive_stopping_spends_probes_where_uncertain(tmp_path, storage):
+    rule = StoppingRule()
+    results = simulated(tmp_path, storage).run_tests(delay=0.0, stopping=rule)
+
+    assert results["dead"].attempts == rule.dead_after
+    assert rule.min_attempts <= results["stable"].attempts < 10
+    assert results["noisy"].attempts == rule.max_attempts
+    assert results["stable"].attempts < results["noisy"].attempts
+
+
+def test_top_k_probes_best_known_targets_plus_exploration(tmp_path, storage):
+    targets = {name: name for name in ("a", "b", "c", "d", "e")}
+    profiles = {name: SimulatedTarget(latency=10.0 * (index + 1), jitter=0.0) for index, name in enumerate(targets)}
+    backend = SimulatedBackend(profiles)
+    network = analyzer(tmp_path, storage, backend, targets)
+    network.model.observe("e", 5.0, 0.0)
+    network.model.observe("d", 8.0, 0.0)
+    network.model.observe("a", 50.0, 0.0)
+
+    results = network.run_tests(attempts=3, delay=0.0, top_k=2, explore=1)
+
+    # Les deux meilleures estimations (e, d) puis une cible jamais mesurée (b).
+    assert list(results) == ["e", "d", "b"]
+    assert network.model.estimate("b").mean == pytest.approx(20.0)
+    assert network.model.estimate("c") is None
+
+
+def accumulator(values):
+    acc = LatencyAccumulator()
+    acc.extend(values)
+    return acc
+
+
+def test_stopping_rule_abandons_silent_targets_only():
+    rule = StoppingRule(dead_after=2)
+    assert not rule.should_stop(1, 1, accumulator([]))
+    assert rule.should_stop(2, 2, accumulator([]))
+    # Une seule réponse suffit à ne plus traiter la cible comme morte.
+    assert not rule.should_stop(6, 5, accumulator([30.0]))
+
+
+def test_stopping_rule_waits_for_both_intervals():
+    rule = StoppingRule(latency_tolerance=2.0, loss_tolerance=0.15, min_attempts=5, max_attempts=30)
+    steady = [20.0, 20.5, 19.5, 20.2, 19.8, 20.1, 19.9, 20.3, 19.7]
+
+    assert not rule.should_stop(4, 0, accumulator(steady[:4]))  # sous min_attempts
+    # Latence déjà précise, mais sans perte sur 8 essais l'intervalle de Wilson reste > 15 %.
+    assert not rule.should_stop(8, 0, accumulator(steady[:8]))
+    assert rule.should_stop(9, 0, accumulator(steady))
+
+    noisy = [5.0, 60.0, 12.0, 45.0, 8.0, 70.0, 15.0, 50.0, 10.0]
+    assert not rule.should_stop(9, 0, accumulator(noisy))
+    assert rule.should_stop(30, 0, accumulator(noisy))  # max_attempts l'emporte toujours
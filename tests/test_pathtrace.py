@@ -0,0 +1,34 @@
+import pytest
+
+from gaming_optimizer.network import NetworkResult
+from gaming_optimizer.pathtrace import PathReport
+
+
+def report(losses, reached=True):
+    path = PathReport("cible", "192.0.2.1", reached=reached)
+    for index, loss in enumerate(losses, start=1):
+        hop = NetworkResult(f"{index}", f"10.0.0.{index}")
+        hop.attempts = 10
+        hop.packet_loss = loss
+        path.hops.append(hop)
+    return path
+
+
+@pytest.mark.parametrize(
+    "losses, origin",
+    [
+        ([0, 0, 0, 0], None),
+        ([0, 30, 0, 0], None),  # routeur qui limite ses réponses ICMP, chemin sain
+        ([0, 0, 10, 10], 2),
+        ([0, 20, 20, 20], 1),
+        ([0, 10, 20, 20], 2),  # limitation ICMP juste avant le segment qui perd vraiment
+        ([0, 20, 25, 20], 1),  # écart dans la tolérance
+        ([10, 0, 20, 20], 2),
+    ],
+)
+def test_loss_origin(losses, origin):
+    assert report(losses).loss_origin == origin
+
+
+def test_loss_origin_needs_destination():
+    assert report([0, 20, 20], reached=False).loss_origin is None
@@ -0,0 +1,70 @@
+import json
+
+from gaming_optimizer import plan as plan_module
+from gaming_optimizer.config import HIGH_PERFORMANCE_SCHEME
+from gaming_optimizer.plan import SystemState, SystemStateProbe, compute_plan
+
+TCP_FR = """
+Paramètres TCP globaux
+----------------------------------------------
+Niveau de paramétrage automatique de la fenêtre de réception : désactivé
+Capacité ECN                                : désactivé
+"""
+
+PAYLOAD = {
+    "tcp": TCP_FR,
+    "power": "GUID du mode de gestion de l'alimentation : 381b4222-f694-41f0-9685-ff5bb260df2e  (Utilisation normale)",
+    "services": [
+        {"name": "DiagTrack", "status": "Running", "start": "Automatic"},
+        {"name": "SysMain", "status": "Stopped", "start": "Disabled"},
+    ],
+    # ConvertTo-Json aplatit un tableau à un élément; une interface sans serveur est ignorée.
+    "dns": [
+        {"alias": "Ethernet", "servers": ["1.1.1.1", "1.0.0.1"]},
+        {"alias": "Wi-Fi", "servers": "192.168.1.254"},
+        {"alias": "vEthernet (WSL)", "servers": []},
+    ],
+    "game": {"AllowAutoGameMode": 1, "GameDVR_Enabled": None},
+}
+
+
+def test_canned_probe_payload_yields_the_expected_diff(monkeypatch):
+    scripts = []
+
+    class Output:
+        stdout = json.dumps(PAYLOAD)
+
+    monkeypatch.setattr(plan_module, "powershell", lambda script: scripts.append(script) or Output())
+    state = SystemStateProbe(["DiagTrack", "SysMain", "WSearch"]).read()
+
+    assert "'DiagTrack', 'SysMain', 'WSearch'" in scripts[0]
+    assert "Get-NetAdapter" in scripts[0]
+    assert state.dns == {"Ethernet": ("1.1.1.1", "1.0.0.1"), "Wi-Fi": ("192.168.1.254",)}
+    assert state.tcp == {"autotuninglevel": "disabled", "ecncapability": "disabled", "dca": None, "chimney": None}
+
+    plan = compute_plan(state, dns_servers=("1.1.1.1", "1.0.0.1"), services=["DiagTrack", "SysMain", "WSearch"])
+    changes = {(c.category, c.key): (c.current, c.target) for c in plan.changes}
+    assert changes == {
+        ("tcp", "autotuninglevel"): ("disabled", "normal"),
+        ("tcp", "ecncapability"): ("disabled", "enabled"),
+        ("power", "scheme"): ("381b4222-f694-41f0-9685-ff5bb260df2e", HIGH_PERFORMANCE_SCHEME),
+        ("service", "DiagTrack"): ("Running/Automatic", "Stopped/Manual"),
+        ("dns", "Wi-Fi"): ("192.168.1.254", "1.1.1.1,1.0.0.1"),
+        ("game", "GameDVR_Enabled"): (None, 1),
+    }
+    assert plan.needs("dns", "Wi-Fi") and not plan.needs("dns", "Ethernet")
+    assert "dns/Wi-Fi: 192.168.1.254 → 1.1.1.1,1.0.0.1" in plan.format()
+
+
+def test_optimized_state_has_an_empty_plan():
+    state = SystemState(
+        tcp_raw="Receive Window Auto-Tuning Level : normal\nECN Capability : enabled",
+        power_raw=f"Power Scheme GUID: {HIGH_PERFORMANCE_SCHEME}  (High performance)",
+        services={"DiagTrack": {"name": "DiagTrack", "status": "Stopped", "start": "Manual"}},
+        dns={"Ethernet": ("1.1.1.1", "1.0.0.1")},
+        game={"AllowAutoGameMode": 1, "GameDVR_Enabled": 1},
+    )
+    plan = compute_plan(state, dns_servers=("1.1.1.1", "1.0.0.1"), services=["DiagTrack"])
+
+    assert plan.changes == []
+    assert "déjà optimisé" in plan.format()
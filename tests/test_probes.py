@@ -0,0 +1,174 @@
+import asyncio
+import socket
+import threading
+
+import pytest
+
+from gaming_optimizer import probes as probes_module
+from gaming_optimizer.probes import (
+    PAYLOAD,
+    IcmpBackend,
+    ProbeBackend,
+    ProbeTarget,
+    ProtocolRouter,
+    SimulatedBackend,
+    SimulatedTarget,
+    TcpConnectBackend,
+    UdpEchoBackend,
+    parse_target,
+)
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("1.1.1.1", ProbeTarget("icmp", "1.1.1.1")),
+        ("tcp://game.test", ProbeTarget("tcp", "game.test", 443)),
+        ("tcp://game.test:7777?refused=1", ProbeTarget("tcp", "game.test", 7777, refused=True)),
+        ("udp://game.test:27015?payload=ffff", ProbeTarget("udp", "game.test", 27015, b"\xff\xff")),
+        ("icmp://game.test", ProbeTarget("icmp", "game.test")),
+    ],
+)
+def test_parse_target(spec, expected):
+    assert parse_target(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["udp://game.test", "ftp://game.test", "tcp://game.test:99999", "tcp://"])
+def test_parse_target_rejects_invalid_entries(spec):
+    with pytest.raises(ValueError):
+        parse_target(spec)
+
+
+@pytest.fixture
+def tcp_listener():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    yield server.getsockname()[1]
+    server.close()
+
+
+@pytest.fixture
+def udp_echo():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    received = []
+
+    def serve():
+        while True:
+            try:
+                data, addr = sock.recvfrom(2048)
+            except OSError:
+                return
+            received.append(data)
+            sock.sendto(data, addr)
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield sock.getsockname()[1], received
+    sock.close()
+
+
+@pytest.fixture
+def closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def probe(backend, spec, timeout=0.5):
+    async def run():
+        async with backend:
+            return await backend.probe(spec, timeout)
+
+    return asyncio.run(run())
+
+
+def test_tcp_connect_time(tcp_listener):
+    latency = probe(TcpConnectBackend(), f"tcp://127.0.0.1:{tcp_listener}")
+    assert latency is not None and 0 < latency < 500
+
+
+def test_tcp_refusal_is_loss_unless_allowed(closed_port):
+    assert probe(TcpConnectBackend(), f"tcp://127.0.0.1:{closed_port}") is None
+    assert probe(TcpConnectBackend(), f"tcp://127.0.0.1:{closed_port}?refused=1") is not None
+
+
+def test_udp_round_trip_sends_target_payload(udp_echo):
+    port, received = udp_echo
+    assert probe(UdpEchoBackend(), f"udp://127.0.0.1:{port}") is not None
+    assert probe(UdpEchoBackend(), f"udp://127.0.0.1:{port}?payload=ffffffff54") is not None
+    assert received == [PAYLOAD, b"\xff\xff\xff\xffT"]
+
+
+def test_udp_port_unreachable_is_loss_unless_allowed(closed_port):
+    assert probe(UdpEchoBackend(), f"udp://127.0.0.1:{closed_port}") is None
+    assert probe(UdpEchoBackend(), f"udp://127.0.0.1:{closed_port}?refused=1") is not None
+
+
+def test_router_routes_by_scheme(tcp_listener):
+    icmp = SimulatedBackend({"game.test": SimulatedTarget(latency=42.0, jitter=0.0)})
+    router = ProtocolRouter({"icmp": icmp})
+
+    assert probe(router, "game.test") == pytest.approx(42.0)
+    assert probe(router, f"tcp://127.0.0.1:{tcp_listener}") < 42.0
+
+    async def trace():
+        async with router:
+            return await router.probe_ttl("tcp://game.test:443", 5, 0.5)
+
+    # Découverte de chemin toujours en ICMP vers l'hôte nu.
+    assert asyncio.run(trace()).address == "game.test"
+
+
+class RecordingFallback(ProbeBackend):
+    def __init__(self):
+        self.calls = []
+        self.opened = False
+
+    async def open(self):
+        self.opened = True
+
+    async def probe(self, host, timeout):
+        self.calls.append(host)
+        return 42.0
+
+
+class SilentPinger:
+    """Socket ICMP ouvert, mais aucun echo ne revient."""
+
+    def open(self):
+        pass
+
+    async def ping(self, address, timeout):
+        return None
+
+    async def close(self):
+        pass
+
+
+class DeniedPinger(SilentPinger):
+    def open(self):
+        raise PermissionError("socket ICMP refusé")
+
+
+async def icmp_probe(fallback):
+    async with IcmpBackend(fallback=fallback) as backend:
+        return await backend.probe("127.0.0.1", 0.1)
+
+
+def test_icmp_timeout_on_open_socket_is_a_loss_without_fallback(monkeypatch):
+    monkeypatch.setattr(probes_module, "AsyncPinger", SilentPinger)
+    fallback = RecordingFallback()
+
+    assert asyncio.run(icmp_probe(fallback)) is None
+    assert fallback.calls == [] and not fallback.opened
+
+
+def test_icmp_falls_back_only_without_socket(monkeypatch):
+    monkeypatch.setattr(probes_module, "AsyncPinger", DeniedPinger)
+    fallback = RecordingFallback()
+
+    assert asyncio.run(icmp_probe(fallback)) == 42.0
+    assert fallback.calls == ["127.0.0.1"] and fallback.opened
@@ -0,0 +1,75 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from gaming_optimizer.recorder import HEADER_SIZE, RingReader, RingRecorder, as_float, record_struct
+
+CORES = 2
+
+
+def ring_mb(capacity, cores=CORES):
+    return (HEADER_SIZE + capacity * record_struct(cores).size) / (1024 * 1024)
+
+
+def record(recorder, count, start=0):
+    for i in range(start, start + count):
+        ping = None if i % 5 == 0 else 10.0 + i
+        recorder.append(1000.0 + i, {"ping": ping, "cpu": i, "ram": 50, "gpu": f"{40 + i}°C"}, [i, i + 0.5])
+
+
+def test_ring_wraps_around_and_reads_oldest_first(tmp_path):
+    path = tmp_path / "session.ring"
+    with RingRecorder(path, cores=CORES, size_mb=ring_mb(10)) as recorder:
+        assert recorder.capacity == 10
+        record(recorder, 23)
+
+    reader = RingReader(path)
+    data = reader.records()
+    assert reader.written == 23
+    assert data.size == 10
+    assert list(data["ts"]) == [1000.0 + i for i in range(13, 23)]
+    assert list(data["cpu"]) == list(range(13, 23))
+    assert data["cores"][-1].tolist() == [22.0, 22.5]
+    assert math.isnan(data["ping"][2])  # échantillon 15: timeout
+    assert data["gpu"][0] == 53.0
+
+
+def test_partial_ring_and_exact_fill(tmp_path):
+    path = tmp_path / "session.ring"
+    with RingRecorder(path, cores=CORES, size_mb=ring_mb(10)) as recorder:
+        record(recorder, 4)
+        assert list(RingReader(path).records()["cpu"]) == [0, 1, 2, 3]
+        record(recorder, 6, start=4)
+        assert list(RingReader(path).records()["cpu"]) == list(range(10))
+
+
+def test_query_and_summary_after_wrap(tmp_path):
+    path = tmp_path / "session.ring"
+    with RingRecorder(path, cores=CORES, size_mb=ring_mb(10)) as recorder:
+        record(recorder, 25)
+
+    reader = RingReader(path)
+    window = reader.query(1017.0, 1019.0)
+    assert list(window["cpu"]) == [17, 18, 19]
+
+    summary = reader.summary(reader.records())
+    assert summary["samples"] == 10
+    assert summary["duration_s"] == 9.0
+    assert summary["ping_timeouts"] == 2  # 15 et 20
+    assert summary["cpu_max"] == 24
+
+
+def test_reader_rejects_foreign_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"NOTARING" + bytes(100))
+    with pytest.raises(ValueError, match="invalide"):
+        RingReader(path)
+
+
+def test_as_float_parses_telemetry_text():
+    assert as_float("55,5°C") == 55.5
+    assert as_float(3) == 3.0
+    assert math.isnan(as_float(None))
+    assert math.isnan(as_float("n/a"))
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from gaming_optimizer.monitor import RealTimeMonitor
+from gaming_optimizer.probes import BlockingProber, SimulatedBackend, SimulatedTarget
+from gaming_optimizer.sampling import SamplingPipeline, Sensor, next_deadline
+
+
+class CountingBackend(SimulatedBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened = self.closed = 0
+        self.threads = set()
+
+    async def open(self):
+        self.opened += 1
+        await super().open()
+
+    async def close(self):
+        self.closed += 1
+        await super().close()
+
+    async def probe(self, host, timeout):
+        self.threads.add(threading.get_ident())
+        return await super().probe(host, timeout)
+
+
+def test_next_deadline_skips_missed_ticks():
+    assert next_deadline(0.0, 0.5, 0.2) == 0.5
+    assert next_deadline(0.0, 0.5, 0.5) == 1.0
+    assert next_deadline(0.0, 0.5, 1.7) == 2.0
+
+
+def test_blocking_prober_keeps_one_backend_across_ticks():
+    backend = CountingBackend({"host": SimulatedTarget(latency=5.0, jitter=0.0)})
+    prober = BlockingProber(backend)
+
+    assert [prober.probe("host", 0.1) for _ in range(5)] == [5.0] * 5
+    assert backend.opened == 1 and backend.closed == 0
+    prober.close()
+    prober.close()
+    assert backend.closed == 1
+
+
+def test_sensor_resources_are_released_in_the_sensor_thread():
+    backend = CountingBackend({"host": SimulatedTarget(latency=5.0, jitter=0.0)})
+    prober = BlockingProber(backend)
+    closed_in = []
+
+    def close():
+        closed_in.append(threading.get_ident())
+        prober.close()
+
+    pipeline = SamplingPipeline([Sensor("ping", lambda: prober.probe("host", 0.05), 50.0, close=close)])
+    with pipeline:
+        assert pipeline.wait_ready(2.0)
+        time.sleep(0.1)
+
+    assert pipeline.latest()["ping"].value == 5.0
+    assert backend.opened == 1 and backend.closed == 1
+    assert closed_in == list(backend.threads)
+
+
+def test_monitor_ping_timeout_stays_below_its_period(monkeypatch):
+    timeouts = []
+    monkeypatch.setattr(BlockingProber, "probe", lambda self, host, timeout: timeouts.append(timeout))
+
+    class NoGpu:
+        def telemetry(self):
+            return None
+
+    for rate in (0.5, 2.0, 10.0):
+        monitor = RealTimeMonitor(NoGpu(), rates={"ping": rate})
+        ping = next(sensor for sensor in monitor.sensors() if sensor.name == "ping")
+        ping.read()
+        assert timeouts[-1] < ping.period
+        assert ping.close is not None
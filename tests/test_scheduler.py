@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from gaming_optimizer.scheduler import Step, StepScheduler
+
+
+class Tracker:
+    """Journal des débuts/fins d'étapes et du nombre d'étapes simultanées."""
+
+    def __init__(self):
+        self.events = []
+        self.active = set()
+        self.overlaps = []
+        self._lock = threading.Lock()
+
+    def step(self, name, duration=0.05, fail=False):
+        def run():
+            with self._lock:
+                self.events.append(("start", name))
+                self.overlaps.append((name, frozenset(self.active)))
+                self.active.add(name)
+            time.sleep(duration)
+            with self._lock:
+                self.active.discard(name)
+                self.events.append(("end", name))
+            if fail:
+                raise RuntimeError(f"{name} cassé")
+            return name
+
+        return run
+
+    def index(self, kind, name):
+        return self.events.index((kind, name))
+
+
+def test_dependencies_run_first_and_results_keep_declaration_order():
+    track = Tracker()
+    steps = [
+        Step("report", track.step("report"), depends_on=("tcp", "dns")),
+        Step("tcp", track.step("tcp")),
+        Step("dns", track.step("dns")),
+    ]
+    results = StepScheduler(steps, max_workers=4).run()
+
+    assert [r.name for r in results] == ["report", "tcp", "dns"]
+    assert all(r.ok for r in results)
+    assert track.index("start", "report") > track.index("end", "tcp")
+    assert track.index("start", "report") > track.index("end", "dns")
+    # tcp et dns sont indépendants: ils se chevauchent.
+    assert any(overlap for name, overlap in track.overlaps if name in {"tcp", "dns"})
+
+
+def test_conflicting_steps_never_overlap():
+    track = Tracker()
+    steps = [
+        Step("power", track.step("power"), conflicts_with=("services",)),
+        Step("services", track.step("services")),
+        Step("dns", track.step("dns")),
+    ]
+    StepScheduler(steps, max_workers=3).run()
+
+    overlaps = dict(track.overlaps)
+    assert "services" not in overlaps["power"]
+    assert "power" not in overlaps["services"]
+
+
+def test_failure_is_captured_and_dependants_still_run():
+    track = Tracker()
+    steps = [Step("tcp", track.step("tcp", fail=True)), Step("report", track.step("report"), depends_on=("tcp",))]
+    tcp, report = StepScheduler(steps).run()
+
+    assert not tcp.ok
+    assert "tcp cassé" in tcp.message
+    assert report.ok and report.value == "report"
+
+
+def test_max_workers_bounds_parallelism():
+    track = Tracker()
+    steps = [Step(f"s{i}", track.step(f"s{i}")) for i in range(6)]
+    StepScheduler(steps, max_workers=2).run()
+    assert max(len(overlap) for _, overlap in track.overlaps) <= 1
+
+
+@pytest.mark.parametrize(
+    "steps, message",
+    [
+        ([Step("a", lambda: None, depends_on=("b",)), Step("b", lambda: None, depends_on=("a",))], "Cycle"),
+        ([Step("a", lambda: None, depends_on=("a",))], "Cycle"),
+        ([Step("a", lambda: None, depends_on=("missing",))], "inconnues"),
+        ([Step("a", lambda: None), Step("a", lambda: None)], "dupliqués"),
+    ],
+)
+def test_invalid_graphs_are_rejected(steps, message):
+    with pytest.raises(ValueError, match=message):
+        StepScheduler(steps)
@@ -0,0 +1,91 @@
+import datetime as dt
+import json
+
+import pytest
+
+from gaming_optimizer.selection import ALL_DAY, EwmaStats, LatencyModel
+
+NOON = dt.datetime(2024, 5, 1, 12, 0)
+
+
+def model(tmp_path, **kwargs):
+    return LatencyModel(tmp_path / "model.json", alpha=0.5, **kwargs)
+
+
+def test_mean_is_seeded_by_first_latency_after_timeouts():
+    stats = EwmaStats()
+    stats.update(None, 1.0, 0.5, NOON)
+    stats.update(None, 1.0, 0.5, NOON)
+    stats.update(40.0, 0.0, 0.5, NOON)
+
+    assert stats.count == 3
+    assert stats.samples == 1
+    assert stats.mean == 40.0
+    assert stats.variance == 0.0
+    assert stats.loss == pytest.approx(0.5)
+
+    stats.update(60.0, 0.0, 0.5, NOON)
+    assert stats.mean == pytest.approx(50.0)
+
+
+def test_rank_skips_targets_without_latency(tmp_path):
+    latency = model(tmp_path)
+    latency.observe("dead", None, 1.0, NOON)
+    latency.observe("slow", 1500.0, 0.0, NOON)
+    latency.observe("fast", 20.0, 0.0, NOON)
+
+    assert [name for name, _ in latency.rank(["dead", "slow", "fast"], NOON)] == ["fast", "slow"]
+
+
+def test_hour_bucket_needs_latency_samples(tmp_path):
+    latency = model(tmp_path, min_bucket_samples=2)
+    night = NOON.replace(hour=2)
+    latency.observe("a", 80.0, 0.0, night)
+    latency.observe("a", None, 1.0, NOON)
+    latency.observe("a", None, 1.0, NOON)
+
+    # La tranche de midi n'a aucune latence: l'agrégat sert d'estimation.
+    assert latency.estimate("a", NOON) is latency.targets["a"][ALL_DAY]
+    latency.observe("a", 30.0, 0.0, NOON)
+    latency.observe("a", 30.0, 0.0, NOON)
+    assert latency.estimate("a", NOON).mean == 30.0
+
+
+def test_cold_model_selects_top_k_plus_explore(tmp_path):
+    names = [f"srv{index}" for index in range(20)]
+    latency = model(tmp_path)
+
+    assert latency.select(names, 10, 2, NOON) == names[:12]
+
+
+def test_warm_model_selects_best_then_stalest(tmp_path):
+    names = ["a", "b", "c", "d", "e"]
+    latency = model(tmp_path)
+    latency.observe("c", 10.0, 0.0, NOON - dt.timedelta(days=2))
+    latency.observe("a", 30.0, 0.0, NOON)
+    latency.observe("b", 20.0, 0.0, NOON)
+    latency.observe("d", None, 1.0, NOON)
+
+    # Top 2 classés, puis « e » jamais mesurée, puis « a » (mesure la plus ancienne restante).
+    assert latency.select(names, 2, 2, NOON) == ["c", "b", "e", "a"]
+    # Une seule cible classée pour un top 3: complétée jusqu'à 3 + 1.
+    assert latency.select(["c", "d", "e", "f"], 3, 1, NOON) == ["c", "e", "f", "d"]
+
+
+def test_model_round_trip_and_legacy_files(tmp_path):
+    latency = model(tmp_path)
+    latency.observe("a", 25.0, 0.1, NOON)
+    latency.save()
+    reloaded = model(tmp_path)
+    assert reloaded.targets["a"][ALL_DAY] == latency.targets["a"][ALL_DAY]
+
+    legacy = {
+        "targets": {
+            "old": {ALL_DAY: {"mean": 33.0, "variance": 1.0, "loss": 0.0, "count": 4, "updated": ""}},
+            "dead": {ALL_DAY: {"mean": 0.0, "variance": 0.0, "loss": 1.0, "count": 2, "updated": ""}},
+        }
+    }
+    (tmp_path / "model.json").write_text(json.dumps(legacy))
+    loaded = model(tmp_path)
+    assert loaded.targets["old"][ALL_DAY].samples == 4
+    assert [name for name, _ in loaded.rank(["old", "dead"])] == ["old"]
@@ -0,0 +1,111 @@
+import os
+import threading
+
+import pytest
+
+from gaming_optimizer.shell import (
+    TIMEOUT_RETURNCODE,
+    PosixShellDialect,
+    SessionPool,
+    ShellSession,
+    ShellTimeout,
+)
+from gaming_optimizer.utils import CommandError
+
+pytestmark = pytest.mark.skipif(not os.path.exists("/bin/sh"), reason="/bin/sh requis")
+
+
+class SlowStderrDialect(PosixShellDialect):
+    """Écrit le marqueur de stderr 0,8 s après celui de stdout."""
+
+    def frame(self, script, token):
+        framed = super().frame(script, token)
+        head, _, tail = framed.rpartition("printf '\\n%s\\n'")
+        return f"{head}sleep 0.8\nprintf '\\n%s\\n'{tail}"
+
+
+@pytest.fixture
+def session():
+    with ShellSession(PosixShellDialect("/bin/sh"), timeout=5.0) as shell:
+        yield shell
+
+
+def test_framing_keeps_output_and_splits_streams(session):
+    result = session.run("echo one; echo two; echo oops >&2; printf 'no newline'")
+
+    assert result.returncode == 0
+    assert result.stdout == "one\ntwo\nno newline"
+    assert result.stderr == "oops\n"
+
+
+def test_output_resembling_a_marker_is_not_a_marker(session):
+    result = session.run("echo __GO_fake_1__ 3")
+    assert result.stdout == "__GO_fake_1__ 3\n"
+    assert result.returncode == 0
+
+
+def test_nonzero_returncode(session):
+    result = session.run("echo bad >&2; false", check=False)
+    assert result.returncode == 1
+    assert result.stderr == "bad\n"
+    with pytest.raises(CommandError, match="bad"):
+        session.run("echo bad >&2; false")
+
+
+def test_timeout_returns_124_without_check_and_session_recovers(session):
+    result = session.run("sleep 5", check=False, timeout=0.3)
+    assert result.returncode == TIMEOUT_RETURNCODE
+    assert "délai" in result.stderr
+    assert not session.alive
+
+    with pytest.raises(ShellTimeout):
+        session.run("sleep 5", timeout=0.3)
+    assert session.run("echo back").stdout == "back\n"
+
+
+def test_stdout_and_stderr_share_one_deadline():
+    with ShellSession(SlowStderrDialect("/bin/sh"), timeout=5.0) as shell:
+        # stdout à ~0,6 s, stderr à ~1,4 s: dans le délai de chaque lecture, pas du total.
+        result = shell.run("sleep 0.6; echo slow", check=False, timeout=1.0)
+
+    assert result.returncode == TIMEOUT_RETURNCODE
+
+
+def test_exit_restarts_the_shell(session):
+    first_pid = session._proc.pid
+    result = session.run("exit 3", check=False)
+    assert result.returncode == 3
+    assert not session.alive
+
+    assert session.run("echo again").stdout == "again\n"
+    assert session._proc.pid != first_pid
+
+
+def test_state_persists_within_a_session(session):
+    session.run("GREETING=salut")
+    assert session.run('echo "$GREETING"').stdout == "salut\n"
+
+
+def test_pool_reuses_sessions_and_bounds_their_number():
+    pool = SessionPool(PosixShellDialect("/bin/sh"), size=2, timeout=5.0)
+    try:
+        pids = {pool.run("echo $$").stdout for _ in range(5)}
+        assert len(pids) == 1
+
+        seen = set()
+        lock = threading.Lock()
+
+        def work():
+            pid = pool.run("sleep 0.2; echo $$").stdout
+            with lock:
+                seen.add(pid)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert 1 <= len(seen) <= 2
+        assert pool._created == 2
+    finally:
+        pool.close()
@@ -0,0 +1,64 @@
+import random
+import statistics
+
+import pytest
+
+from gaming_optimizer.stats import LatencyAccumulator, P2Quantile, RunningStats, exact_quantile
+
+
+def test_exact_quantile_interpolates():
+    values = [10.0, 20.0, 30.0, 40.0]
+    assert exact_quantile(values, 0.5) == pytest.approx(25.0)
+    assert exact_quantile(values, 0.0) == 10.0
+    assert exact_quantile(values, 1.0) == 40.0
+    with pytest.raises(ValueError):
+        exact_quantile([], 0.5)
+
+
+def test_p2_is_exact_below_limit():
+    sketch = P2Quantile(0.95, exact_limit=64)
+    values = [float(v) for v in range(50)]
+    random.Random(1).shuffle(values)
+    for value in values:
+        sketch.add(value)
+    assert sketch.value() == exact_quantile(sorted(values), 0.95)
+
+
+@pytest.mark.parametrize("p", [0.5, 0.95, 0.99])
+def test_p2_tracks_exact_quantiles_on_skewed_latencies(p):
+    rng = random.Random(42)
+    values = [20.0 + rng.expovariate(1 / 8.0) for _ in range(20000)]
+    sketch = P2Quantile(p)
+    for value in values:
+        sketch.add(value)
+
+    exact = exact_quantile(sorted(values), p)
+    assert sketch.value() == pytest.approx(exact, rel=0.03)
+
+
+def test_accumulator_matches_batch_statistics():
+    rng = random.Random(3)
+    values = [rng.gauss(30.0, 5.0) for _ in range(5000)]
+    acc = LatencyAccumulator(keep_samples=True)
+    acc.extend(values)
+
+    assert acc.count == len(values)
+    assert acc.stats.mean == pytest.approx(statistics.fmean(values))
+    assert acc.stats.stdev == pytest.approx(statistics.pstdev(values))
+    assert list(acc.samples) == values
+    assert acc.quantile(0.5) == pytest.approx(statistics.median(values), rel=0.02)
+    with pytest.raises(KeyError):
+        acc.quantile(0.9)
+
+
+def test_running_stats_merge_matches_single_pass():
+    left = RunningStats()
+    for value in (1.0, 2.0, 3.0):
+        left.add(value)
+    # Résumé de [10, 20]: n=2, moyenne 15, somme des carrés des écarts 50.
+    left.merge(2, 15.0, 50.0, 10.0, 20.0)
+
+    assert left.count == 5
+    assert left.mean == pytest.approx(7.2)
+    assert left.sample_variance == pytest.approx(statistics.variance([1.0, 2.0, 3.0, 10.0, 20.0]))
+    assert (left.minimum, left.maximum) == (1.0, 20.0)
@@ -0,0 +1,55 @@
+import json
+
+from gaming_optimizer.history import HistoryStore
+from gaming_optimizer.storage import StorageManager
+
+
+def reopen(tmp_path, **kwargs):
+    return StorageManager(tmp_path / "backup.json", HistoryStore(tmp_path / "history", legacy_path=None), **kwargs)
+
+
+def test_journal_replay_ignores_torn_last_line(tmp_path, storage):
+    storage.snapshot("tcp", {"autotuning": "normal"})
+    storage.snapshot("power", {"scheme": "balanced"})
+    with open(storage.journal_path, "a", encoding="utf-8") as handle:
+        handle.write('{"key": "dns", "payload": {"Eth')
+
+    restored = reopen(tmp_path)
+    assert restored.get_snapshot("tcp") == {"autotuning": "normal"}
+    assert restored.get_snapshot("power") == {"scheme": "balanced"}
+    assert restored.get_snapshot("dns") == {}
+
+    # L'écriture suivante ne doit pas se coller à la ligne tronquée.
+    restored.snapshot("dns", {"Ethernet": ["1.1.1.1"]})
+    assert reopen(tmp_path).get_snapshot("dns") == {"Ethernet": ["1.1.1.1"]}
+
+
+def test_later_snapshot_wins_on_replay(tmp_path, storage):
+    storage.snapshot("tcp", {"autotuning": "normal"})
+    storage.snapshot("tcp", {"autotuning": "disabled"})
+    assert reopen(tmp_path).get_snapshot("tcp") == {"autotuning": "disabled"}
+
+
+def test_batch_writes_everything_and_compacts(tmp_path):
+    manager = reopen(tmp_path, compact_after=3)
+    with manager.batch():
+        for index in range(4):
+            manager.snapshot(f"key{index}", {"value": index})
+        assert manager.journal_path.exists()
+        assert not manager.backup_path.exists()
+
+    assert not manager.journal_path.exists()
+    saved = json.loads(manager.backup_path.read_text())
+    assert saved["snapshots"]["key3"] == {"value": 3}
+    assert reopen(tmp_path).get_snapshot("key0") == {"value": 0}
+
+
+def test_refresh_picks_up_writes_from_another_process(tmp_path, storage):
+    storage.snapshot("tcp", {"autotuning": "normal"})
+    assert storage.refresh() is False
+
+    other = reopen(tmp_path)
+    other.snapshot("tcp", {"autotuning": "disabled"})
+
+    assert storage.refresh() is True
+    assert storage.get_snapshot("tcp") == {"autotuning": "disabled"}
@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+
+from gaming_optimizer.telemetry import FakeTelemetrySource, GPUReading, WmiTelemetrySource
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeConnection:
+    """Connexion WMI factice: énumération des capteurs et requêtes WQL comptées."""
+
+    def __init__(self, sensors, values) -> None:
+        self.sensors = sensors
+        self.values = values
+        self.enumerations = 0
+        self.queries = []
+        self.fail_query = False
+
+    def Sensor(self):  # noqa: N802 (nom de la classe WMI)
+        self.enumerations += 1
+        return self.sensors
+
+    def query(self, wql):
+        if self.fail_query:
+            raise OSError("RPC indisponible")
+        self.queries.append(wql)
+        return [SimpleNamespace(Identifier=ident, Value=value) for ident, value in self.values.items()]
+
+
+def sensor(identifier, sensor_type, name):
+    return SimpleNamespace(Identifier=identifier, SensorType=sensor_type, Name=name)
+
+
+GPU_SENSORS = [
+    sensor("/cpu/0/temperature/0", "Temperature", "CPU Package"),
+    sensor("/gpu/0/temperature/0", "Temperature", "GPU Core"),
+    sensor("/gpu/0/load/0", "Load", "GPU Core"),
+    sensor("/gpu/0/clock/0", "Clock", "GPU Core"),
+    sensor("/gpu/0/smalldata/1", "SmallData", "GPU Memory Used"),
+]
+GPU_VALUES = {
+    "/gpu/0/temperature/0": 64.0,
+    "/gpu/0/load/0": 87.0,
+    "/gpu/0/clock/0": 1905.0,
+    "/gpu/0/smalldata/1": 3120.0,
+}
+
+
+class Connector:
+    def __init__(self, connection=None, error=None) -> None:
+        self.connection = connection
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.connection
+
+
+def test_connects_and_resolves_sensors_once():
+    connection = FakeConnection(GPU_SENSORS, GPU_VALUES)
+    connect = Connector(connection)
+    source = WmiTelemetrySource(connect=connect, clock=FakeClock())
+
+    readings = [source.read() for _ in range(3)]
+
+    assert connect.calls == 1
+    assert connection.enumerations == 1
+    assert len(connection.queries) == 3
+    assert "/cpu/0/temperature/0" not in connection.queries[0]
+    assert readings[-1] == GPUReading(temp=64.0, load=87.0, clock=1905.0, vram=3120.0)
+    assert str(readings[-1]) == "64°C 87% 1905 MHz 3120 Mo"
+
+
+def test_connect_failures_back_off_exponentially():
+    clock = FakeClock()
+    connect = Connector(error=OSError("namespace introuvable"))
+    source = WmiTelemetrySource(connect=connect, clock=clock, backoff=1.0, max_backoff=4.0)
+
+    attempts = []
+    for now in (0.0, 0.5, 1.0, 2.0, 3.0, 6.9, 7.0, 11.0):
+        clock.now = now
+        reading = source.read()
+        assert reading.error == "Lecture capteurs impossible (namespace introuvable)"
+        attempts.append(connect.calls)
+
+    # Échecs à 0 s, 1 s, 3 s puis 7 s: délais 1, 2, 4 puis plafonnés à 4.
+    assert attempts == [1, 1, 2, 2, 3, 3, 4, 5]
+
+
+def test_query_failure_reconnects_after_backoff_and_resets_delay():
+    clock = FakeClock()
+    connection = FakeConnection(GPU_SENSORS, GPU_VALUES)
+    connect = Connector(connection)
+    source = WmiTelemetrySource(connect=connect, clock=clock, backoff=1.0)
+
+    assert source.read().has_data
+    connection.fail_query = True
+    assert source.read().error == "Lecture capteurs impossible (RPC indisponible)"
+    connection.fail_query = False
+
+    clock.now = 0.5
+    assert source.read().error is not None  # encore dans le délai: pas de reconnexion
+    assert connect.calls == 1
+
+    clock.now = 1.0
+    assert source.read().temp == 64.0
+    assert connect.calls == 2
+    assert connection.enumerations == 2
+
+    # Lecture réussie: le prochain échec repart du délai initial.
+    connection.fail_query = True
+    source.read()
+    connection.fail_query = False
+    clock.now = 2.0
+    assert source.read().has_data
+
+
+def test_missing_gpu_sensor_reads_as_not_available():
+    clock = FakeClock()
+    connect = Connector(FakeConnection(GPU_SENSORS[:1], {}))
+    source = WmiTelemetrySource(connect=connect, clock=clock)
+
+    reading = source.read()
+
+    assert reading.error is None
+    assert not reading.has_data
+    assert str(reading) == "N/A"
+
+
+def test_fake_source_is_deterministic_and_fails_periodically():
+    first = FakeTelemetrySource(seed=3, fail_every=3)
+    second = FakeTelemetrySource(seed=3, fail_every=3)
+
+    readings = [first.read() for _ in range(6)]
+
+    assert readings == [second.read() for _ in range(6)]
+    assert [reading.error is not None for reading in readings] == [False, False, True, False, False, True]
+    for reading in readings:
+        if reading.error is None:
+            assert 57.0 <= reading.temp <= 63.0
+            assert reading.load <= 100.0
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from gaming_optimizer import tracing
+
+
+@pytest.fixture
+def tracer():
+    active = tracing.enable()
+    yield active
+    tracing.disable()
+
+
+def test_disabled_tracing_records_nothing():
+    assert not tracing.enabled()
+    assert tracing.span("a") is tracing.span("b")  # contexte vide partagé
+    calls = []
+
+    @tracing.traced()
+    def work():
+        calls.append(1)
+        return 42
+
+    assert work() == 42 and calls == [1]
+    assert tracing.disable() is None
+
+
+def test_spans_nest_and_record_errors(tracer):
+    with tracing.span("outer", "test", key="value"):
+        with tracing.span("inner", "test"):
+            pass
+    with pytest.raises(ValueError):
+        with tracing.span("broken", "test"):
+            raise ValueError("boom")
+
+    inner, outer, broken = tracer.events
+    assert [e["ph"] for e in tracer.events] == ["X", "X", "X"]
+    assert outer["args"] == {"key": "value"}
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert broken["args"]["error"] == "ValueError"
+
+
+def test_traced_names_spans_after_the_function(tracer):
+    class Probe:
+        @tracing.traced(category="net")
+        def run(self):
+            return "ok"
+
+    assert Probe().run() == "ok"
+    assert tracer.events[0]["name"].endswith("Probe.run")
+    assert tracer.events[0]["cat"] == "net"
+
+
+def test_async_spans_overlap_as_begin_end_pairs(tracer):
+    async def probe(index):
+        with tracing.span(f"probe{index}", "net"):
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        await asyncio.gather(*(probe(i) for i in range(3)))
+
+    asyncio.run(scenario())
+    begins = [e for e in tracer.events if e["ph"] == "b"]
+    ends = [e for e in tracer.events if e["ph"] == "e"]
+    assert len(begins) == len(ends) == 3
+    assert {e["id"] for e in begins} == {e["id"] for e in ends}
+    # Les trois sondes ont commencé avant la fin de la première.
+    assert max(e["ts"] for e in begins) < min(e["ts"] for e in ends)
+    assert len(tracer.durations()["probe0"]) == 1
+
+
+def test_export_is_a_chrome_trace_with_thread_names(tracer, tmp_path):
+    def worker():
+        with tracing.span("in-thread", "test"):
+            pass
+
+    thread = threading.Thread(target=worker, name="sensor-ping")
+    thread.start()
+    thread.join()
+    with tracing.span("main", "test"):
+        pass
+
+    path = tracer.export(tmp_path / "traces" / "trace.json")
+    trace = json.loads(path.read_text(encoding="utf-8"))
+    assert trace["displayTimeUnit"] == "ms"
+    names = {e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"}
+    assert "sensor-ping" in names
+    assert {e["name"] for e in trace["traceEvents"] if e["ph"] == "X"} == {"in-thread", "main"}
+    assert "in-thread" in tracer.summary() and "Appels" in tracer.summary()
@@ -0,0 +1,91 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import psutil
+import pytest
+
+from gaming_optimizer import watcher as watcher_module
+from gaming_optimizer.watcher import SNAPSHOT_KEY, GameProcessWatcher
+
+
+@pytest.fixture
+def fake_game(tmp_path):
+    """Copie de `sleep` sous un nom de jeu: seul ce processus correspond à la cible."""
+    sleep = shutil.which("sleep")
+    if sleep is None or sys.platform == "win32":
+        pytest.skip("`sleep` POSIX requis")
+    binary = tmp_path / "fakegame"
+    shutil.copy(sleep, binary)
+    proc = subprocess.Popen([str(binary), "30"])
+    yield proc
+    proc.kill()
+    proc.wait()
+
+
+def test_new_game_is_boosted_then_restored(storage, fake_game):
+    target = psutil.Process(fake_game.pid)
+    original = target.nice()
+    boosted = []
+    watcher = GameProcessWatcher(storage, processes=["fakegame"], priority=original + 5, on_boost=lambda *a: boosted.append(a))
+
+    watcher.known = set(psutil.pids()) - {fake_game.pid}  # seul le jeu est « nouveau »
+    assert watcher.scan() == [(fake_game.pid, "fakegame")]
+    assert boosted == [(fake_game.pid, "fakegame")]
+    assert target.nice() == original + 5
+    assert storage.get_snapshot(SNAPSHOT_KEY)[str(fake_game.pid)]["nice"] == original
+
+    assert watcher.scan() == []  # déjà connu: pas relu, pas reboosté
+    assert watcher.lookups == 1
+
+    if os.name == "posix" and os.geteuid() != 0:
+        pytest.skip("rétablir une priorité plus haute demande les droits root")
+    message = GameProcessWatcher.restore(storage)
+    assert "1 processus" in message
+    assert target.nice() == original
+    assert storage.get_snapshot(SNAPSHOT_KEY) == {}
+
+
+class DeniedOnce:
+    """Processus factice dont le nom n'est lisible qu'au deuxième essai."""
+
+    attempts = 0
+
+    def __init__(self, pid):
+        self.pid = pid
+
+    def name(self):
+        DeniedOnce.attempts += 1
+        if DeniedOnce.attempts == 1:
+            raise psutil.AccessDenied(self.pid)
+        return "fakegame"
+
+    def nice(self, value=None):
+        return 0
+
+    def create_time(self):
+        return 1.0
+
+
+def test_access_denied_pids_are_retried_after_a_delay(storage, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(watcher_module.psutil, "pids", lambda: [4242])
+    monkeypatch.setattr(watcher_module.psutil, "Process", DeniedOnce)
+    monkeypatch.setattr(watcher_module.time, "monotonic", lambda: clock[0])
+    watcher = GameProcessWatcher(storage, processes=["fakegame"], priority=5, denied_retry=30.0)
+
+    assert watcher.scan() == []
+    assert watcher.denied == {4242: 130.0}
+    clock[0] = 120.0
+    assert watcher.scan() == []
+    assert DeniedOnce.attempts == 1
+
+    clock[0] = 131.0
+    assert watcher.scan() == [(4242, "fakegame")]
+    assert watcher.denied == {}
+
+    monkeypatch.setattr(watcher_module.psutil, "pids", lambda: [])
+    watcher.denied[4242] = 0.0
+    watcher.scan()
+    assert watcher.denied == {} and watcher.boosted == {}